@@ -0,0 +1,4 @@
+from .converters import converter
+from .dimensions import DerivedQuantity, get_quantity_type
+from .parsing import parse
+from .serialization import from_bytes
@@ -0,0 +1,9 @@
+from .areaArray import AreaArray, MixedAreaArray
+from .electricCurrentArray import ElectricCurrentArray, MixedElectricCurrentArray
+from .lengthArray import LengthArray, MixedLengthArray
+from .massArray import MassArray, MixedMassArray
+from .timeArray import TimeArray, MixedTimeArray
+from .volumeArray import VolumeArray, MixedVolumeArray
+
+# Registers the arithmetic operators of the classes above.
+from . import operators  # noqa: F401
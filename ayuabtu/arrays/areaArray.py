@@ -0,0 +1,629 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import itertools
+
+import numpy
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split_format_spec, split_many
+from ..serialization import ARRAY_FLAG, ARRAY_HEADER_FORMAT, unpack_array_header
+from ..quantities import Area
+from ..units import AreaUnit
+
+
+class AreaArray:
+    type_code = Area.type_code
+    base_unit = Area.base_unit
+    conversion_factors = numpy.array(Area.conversion_factors)
+    # Like Area.units_by_factor, but with unit codes
+    units_by_factor = {
+        system: (numpy.array(factors, dtype=numpy.float64),
+                 numpy.array([unit.code for unit in units], dtype=numpy.uint8))
+        for system, (factors, units) in Area.units_by_factor.items()}
+
+    # Let numpy defer to the reflected operators of this class.
+    __array_ufunc__ = None
+
+    def __init__(self, values, unit: 'AreaUnit') -> None:
+        if type(unit) is not AreaUnit:
+            raise TypeError('{0} is not a AreaUnit.'.format(unit))
+
+        self._values = numpy.asarray(values, dtype=numpy.float64)
+        self._unit = unit
+
+    def __str__(self):
+        return "{values} {unit}".format(
+            values=str(self._values),
+            unit=Area.abbreviations[self._unit])
+
+    def __repr__(self):
+        return str(self)
+
+    def __reduce__(self):
+        # Pickles all values as a single buffer.
+        return _from_bytes, (self.to_bytes(),)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        values = self._values[index]
+
+        if numpy.ndim(values) == 0:
+            return Area(float(values), self._unit)
+
+        return AreaArray(values, self._unit)
+
+    def __iter__(self):
+        for value in self._values.tolist():
+            yield Area(value, self._unit)
+
+    # Unary operators
+    def __neg__(self):
+        return AreaArray(-self._values, self._unit)
+
+    # Arithmetic operators
+    def __add__(self, other):
+        if type(other) in (AreaArray, MixedAreaArray, Area):
+            return AreaArray(
+                self._values + other.as_unit(self._unit), self._unit)
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
+    def __sub__(self, other):
+        if type(other) in (AreaArray, MixedAreaArray, Area):
+            return AreaArray(
+                self._values - other.as_unit(self._unit), self._unit)
+
+        self._raise_type_error_for_undefined_operator(other, '-')
+
+    def __mul__(self, other):
+        return dispatch(self, '*', other)
+
+    def __rmul__(self, other):
+        return dispatch(other, '*', self)
+
+    def __truediv__(self, other):
+        return dispatch(self, '/', other)
+
+    def __pow__(self, other):
+        return power(self, other)
+
+    def _raise_type_error_for_undefined_operator(
+            self, other, operator: str) -> None:
+        raise TypeError(
+            'unsupported operand type(s) for {0}: \'{1}\' and \'{2}\''
+            .format(operator, type(self).__name__, type(other).__name__))
+
+    @staticmethod
+    def zeros(size: int) -> 'AreaArray':
+        return AreaArray(numpy.zeros(size), AreaArray.base_unit)
+
+    @staticmethod
+    def parse_many(
+            texts,
+            unit: AreaUnit = None,
+            chunk_size: int = 65536) -> 'AreaArray':
+        """Parses an iterable of strings like "12.5 km" into one array.
+
+        The texts are consumed in chunks of chunk_size, so only one chunk of
+        strings is held in memory at a time. Values are converted to unit,
+        which defaults to the unit of the first text.
+        """
+        chunks = list(AreaArray.parse_chunks(texts, unit, chunk_size))
+        if not chunks:
+            return AreaArray(numpy.zeros(0), unit or AreaArray.base_unit)
+
+        return AreaArray(
+            numpy.concatenate([chunk._values for chunk in chunks]),
+            chunks[0]._unit)
+
+    @staticmethod
+    def parse_chunks(
+            texts,
+            unit: AreaUnit = None,
+            chunk_size: int = 65536):
+        """Like parse_many, but yields one array per chunk of texts."""
+        texts = iter(texts)
+        chunk = list(itertools.islice(texts, chunk_size))
+        while chunk:
+            array = AreaArray._parse_chunk(chunk, unit)
+            unit = array._unit
+            yield array
+            chunk = list(itertools.islice(texts, chunk_size))
+
+    @staticmethod
+    def parse_column(column, unit: AreaUnit = None) -> 'AreaArray':
+        """Parses a list or an ndarray of strings in a single chunk."""
+        if isinstance(column, numpy.ndarray):
+            column = column.tolist()
+
+        return AreaArray._parse_chunk(list(column), unit)
+
+    @staticmethod
+    def from_bytes(data) -> 'AreaArray':
+        """Decodes an array encoded with to_bytes.
+
+        data is any object supporting the buffer protocol. The values are a
+        view into data, so they are not copied.
+        """
+        unit, size = unpack_array_header(
+            data, AreaArray.type_code, Area.units_by_code)
+        values = numpy.frombuffer(
+            data, dtype='<f8', count=size, offset=ARRAY_HEADER_FORMAT.size)
+
+        return AreaArray(values, unit)
+
+    @staticmethod
+    def from_quantities(quantities, unit: AreaUnit = None) -> 'AreaArray':
+        if unit is None:
+            unit = AreaArray.base_unit
+
+        return AreaArray(
+            [quantity.as_unit(unit) for quantity in quantities], unit)
+
+    @property
+    def unit(self) -> AreaUnit:
+        return self._unit
+
+    @property
+    def values(self) -> numpy.ndarray:
+        return self._values
+
+    def as_unit(self, unit: AreaUnit) -> numpy.ndarray:
+        if unit is self._unit:
+            return self._values
+
+        return self._get_values_as(unit)
+
+    def to_unit(self, unit: AreaUnit) -> 'AreaArray':
+        converted_values = self._get_values_as(unit)
+
+        return AreaArray(converted_values, unit)
+
+    def to_quantities(self) -> list:
+        return list(self)
+
+    def to_bytes(self) -> bytes:
+        header = ARRAY_HEADER_FORMAT.pack(
+            AreaArray.type_code | ARRAY_FLAG,
+            self._unit.code,
+            len(self._values))
+        values = numpy.ascontiguousarray(self._values, dtype='<f8')
+
+        return b''.join((header, values.data))
+
+    def format_many(
+            self,
+            format_spec: str = '',
+            separator: str = '\n') -> str:
+        """Formats all elements like format() into a single string.
+
+        The elements are joined by separator. A spec like ".3f~km" formats
+        the values with ".3f" after converting them to kilometers.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = AreaArray._get_unit(symbol)
+
+        # Render everything with one format call on a template holding a
+        # replacement field per element.
+        element_template = '{:' + value_spec + '} ' + _escape_braces(
+            Area.abbreviations[unit])
+        template = _escape_braces(separator).join(
+            itertools.repeat(element_template, len(self._values)))
+
+        return template.format(*self.as_unit(unit).tolist())
+
+    def humanize(self, system: str = None) -> 'MixedAreaArray':
+        """Elementwise Area.humanize.
+
+        Elements which are zero or not finite keep the unit of this array.
+        """
+        try:
+            factors, unit_codes = AreaArray.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+        values = numpy.abs(self._get_values_in_base_unit())
+        codes = numpy.full(len(self._values), self._unit.code, dtype=numpy.uint8)
+        if len(unit_codes):
+            indices = numpy.searchsorted(factors, values, side='right') - 1
+            readable = (values != 0) & numpy.isfinite(values)
+            codes[readable] = unit_codes[numpy.maximum(indices[readable], 0)]
+
+        factors = AreaArray.conversion_factors[self._unit.code, codes]
+
+        return MixedAreaArray(self._values * factors, codes)
+
+    def isclose(
+            self,
+            other,
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> numpy.ndarray:
+        """Elementwise math.isclose against a AreaArray or a Area.
+
+        abs_tol is either a Area or a float in the base unit. Returns a
+        boolean mask.
+        """
+        if type(other) not in (AreaArray, Area):
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Area:
+            abs_tol = abs_tol.as_unit(self.base_unit)
+
+        values = self._get_values_in_base_unit()
+        other_values = other.as_unit(self.base_unit)
+        tolerance = numpy.maximum(
+            rel_tol * numpy.maximum(numpy.abs(values), numpy.abs(other_values)),
+            abs_tol)
+
+        # The equality check catches infinities, whose difference is nan.
+        with numpy.errstate(invalid='ignore'):
+            return ((numpy.abs(values - other_values) <= tolerance)
+                    | (values == other_values))
+
+    def allclose(
+            self,
+            other,
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        return bool(numpy.all(self.isclose(other, rel_tol, abs_tol)))
+
+    # Reductions
+    def sum(self) -> Area:
+        return Area(float(numpy.sum(self._values)), self._unit)
+
+    def mean(self) -> Area:
+        if not len(self._values):
+            raise ValueError('mean() arg is an empty array')
+
+        return Area(float(numpy.mean(self._values)), self._unit)
+
+    def min(self) -> Area:
+        return Area(float(numpy.min(self._values)), self._unit)
+
+    def max(self) -> Area:
+        return Area(float(numpy.max(self._values)), self._unit)
+
+    def std(self, ddof: int = 0) -> Area:
+        if len(self._values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} values'.format(ddof))
+
+        return Area(float(numpy.std(self._values, ddof=ddof)), self._unit)
+
+    # Generation shorthands
+    @staticmethod
+    def from_squareKilometers(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREKILOMETER)
+
+    @staticmethod
+    def from_hectares(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.HECTARE)
+
+    @staticmethod
+    def from_squareMeters(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREMETER)
+
+    @staticmethod
+    def from_squareDecimeters(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREDECIMETER)
+
+    @staticmethod
+    def from_squareCentimeters(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUARECENTIMETER)
+
+    @staticmethod
+    def from_squareMillimeters(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREMILLIMETER)
+
+    @staticmethod
+    def from_squareMicrometers(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREMICROMETER)
+
+    @staticmethod
+    def from_squareInchs(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREINCH)
+
+    @staticmethod
+    def from_squareFoots(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREFOOT)
+
+    @staticmethod
+    def from_squareYards(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREYARD)
+
+    @staticmethod
+    def from_squareMiles(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.SQUAREMILE)
+
+    @staticmethod
+    def from_acres(values) -> 'AreaArray':
+        return AreaArray(values, AreaUnit.ACRE)
+
+    # Conversion shorthands
+    @property
+    def squareKilometers(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREKILOMETER)
+
+    @property
+    def hectares(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.HECTARE)
+
+    @property
+    def squareMeters(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREMETER)
+
+    @property
+    def squareDecimeters(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREDECIMETER)
+
+    @property
+    def squareCentimeters(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUARECENTIMETER)
+
+    @property
+    def squareMillimeters(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREMILLIMETER)
+
+    @property
+    def squareMicrometers(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREMICROMETER)
+
+    @property
+    def squareInchs(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREINCH)
+
+    @property
+    def squareFoots(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREFOOT)
+
+    @property
+    def squareYards(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREYARD)
+
+    @property
+    def squareMiles(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.SQUAREMILE)
+
+    @property
+    def acres(self) -> numpy.ndarray:
+        return self.as_unit(AreaUnit.ACRE)
+
+    @staticmethod
+    def _parse_chunk(texts: list, unit: AreaUnit) -> 'AreaArray':
+        values, unit_codes = AreaArray._parse_values_and_unit_codes(texts)
+        if not len(values):
+            return AreaArray(values, unit or AreaArray.base_unit)
+
+        if unit is None:
+            unit = Area.units_by_code[unit_codes[0]]
+
+        factors = AreaArray.conversion_factors[unit_codes, unit.code]
+
+        return AreaArray(values * factors, unit)
+
+    @staticmethod
+    def _parse_values_and_unit_codes(texts: list) -> tuple:
+        numbers, symbols = split_many(texts)
+        if not numbers:
+            return numpy.zeros(0), numpy.zeros(0, dtype=numpy.uint8)
+
+        # Look up every distinct symbol only once.
+        unique_symbols, symbol_indices = numpy.unique(
+            symbols, return_inverse=True)
+        unit_codes = numpy.array([
+            AreaArray._get_unit(symbol).code
+            for symbol in unique_symbols.tolist()], dtype=numpy.uint8)[symbol_indices]
+
+        return numpy.array(numbers, dtype=numpy.float64), unit_codes
+
+    @staticmethod
+    def _get_unit(symbol: str) -> AreaUnit:
+        unit = lookup_unit(
+            Area.units_by_symbol, Area.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Area unit "{0}".'.format(symbol))
+
+        return unit
+
+    def _with_values(self, values) -> 'AreaArray':
+        return AreaArray(values, self._unit)
+
+    def _get_values_in_base_unit(self) -> numpy.ndarray:
+        return self.as_unit(self.base_unit)
+
+    def _get_values_as(self, unit: AreaUnit) -> numpy.ndarray:
+        # Units of other quantities have codes as well.
+        if type(unit) is not AreaUnit:
+            raise NotImplementedError(
+                'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        return self._values * Area.conversion_factors[
+            self._unit.code][unit.code]
+
+
+class MixedAreaArray:
+    """Holds values given in different units.
+
+    Every value keeps the value of its unit in unit_codes. The values are
+    only converted to a common unit when an operation requires it.
+    """
+    base_unit = Area.base_unit
+    conversion_factors = AreaArray.conversion_factors
+
+    # Let numpy defer to the reflected operators of this class.
+    __array_ufunc__ = None
+
+    def __init__(self, values, unit_codes) -> None:
+        # Read-only views, so the values in _normalized can not become
+        # stale.
+        self._values = numpy.asarray(values, dtype=numpy.float64).view()
+        self._values.flags.writeable = False
+        self._unit_codes = numpy.asarray(unit_codes, dtype=numpy.uint8).view()
+        self._unit_codes.flags.writeable = False
+        if self._values.shape != self._unit_codes.shape:
+            raise ValueError('Every value needs exactly one unit code.')
+        # The values converted by the last operation which needed a
+        # common unit
+        self._normalized = None
+
+    def __str__(self):
+        quantities = [str(quantity) for quantity in self[:3]]
+        if len(self) > 6:
+            quantities.append('...')
+        quantities.extend(str(quantity) for quantity in self[max(3, len(self) - 3):])
+
+        return '[{0}]'.format(', '.join(quantities))
+
+    def __repr__(self):
+        return str(self)
+
+    def __reduce__(self):
+        # Leaves out the converted values in _normalized.
+        return MixedAreaArray, (self._values, self._unit_codes)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        values = self._values[index]
+
+        if numpy.ndim(values) == 0:
+            return Area(
+                float(values),
+                Area.units_by_code[self._unit_codes[index]])
+
+        return MixedAreaArray(values, self._unit_codes[index])
+
+    def __iter__(self):
+        units = Area.units_by_code
+        for value, unit_code in zip(
+                self._values.tolist(), self._unit_codes.tolist()):
+            yield Area(value, units[unit_code])
+
+    # Unary operators
+    def __neg__(self):
+        return MixedAreaArray(-self._values, self._unit_codes)
+
+    # Arithmetic operators
+    def __add__(self, other):
+        if type(other) in (MixedAreaArray, AreaArray, Area):
+            return self._normalize(self.base_unit) + other
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
+    def __sub__(self, other):
+        if type(other) in (MixedAreaArray, AreaArray, Area):
+            return self._normalize(self.base_unit) - other
+
+        self._raise_type_error_for_undefined_operator(other, '-')
+
+    def __mul__(self, other):
+        return dispatch(self, '*', other)
+
+    def __rmul__(self, other):
+        return dispatch(other, '*', self)
+
+    def __truediv__(self, other):
+        return dispatch(self, '/', other)
+
+    def __pow__(self, other):
+        return power(self, other)
+
+    def _raise_type_error_for_undefined_operator(
+            self, other, operator: str) -> None:
+        raise TypeError(
+            'unsupported operand type(s) for {0}: \'{1}\' and \'{2}\''
+            .format(operator, type(self).__name__, type(other).__name__))
+
+    @staticmethod
+    def from_quantities(quantities) -> 'MixedAreaArray':
+        quantities = list(quantities)
+
+        return MixedAreaArray(
+            [quantity.value for quantity in quantities],
+            [quantity.unit.code for quantity in quantities])
+
+    @staticmethod
+    def parse_many(texts) -> 'MixedAreaArray':
+        """Parses strings like "12.5 km" keeping the unit of every text."""
+        values, unit_codes = AreaArray._parse_values_and_unit_codes(
+            list(texts))
+
+        return MixedAreaArray(values, unit_codes)
+
+    @property
+    def values(self) -> numpy.ndarray:
+        return self._values
+
+    @property
+    def unit_codes(self) -> numpy.ndarray:
+        return self._unit_codes
+
+    def count_units(self) -> dict:
+        counts = numpy.bincount(
+            self._unit_codes, minlength=len(Area.units_by_code))
+
+        return {
+            unit: int(count)
+            for unit, count in zip(Area.units_by_code, counts.tolist())
+            if count}
+
+    def as_unit(self, unit: AreaUnit) -> numpy.ndarray:
+        return self._normalize(unit).values
+
+    def to_unit(self, unit: AreaUnit) -> AreaArray:
+        return self._normalize(unit)
+
+    def to_quantities(self) -> list:
+        return list(self)
+
+    # Reductions run on the values normalized to the base unit.
+    def sum(self) -> Area:
+        return self._normalize(Area.base_unit).sum()
+
+    def mean(self) -> Area:
+        return self._normalize(Area.base_unit).mean()
+
+    def min(self) -> Area:
+        return self._normalize(Area.base_unit).min()
+
+    def max(self) -> Area:
+        return self._normalize(Area.base_unit).max()
+
+    def std(self, ddof: int = 0) -> Area:
+        return self._normalize(Area.base_unit).std(ddof)
+
+    def _with_values(self, values) -> 'MixedAreaArray':
+        return MixedAreaArray(values, self._unit_codes)
+
+    def _normalize(self, unit: AreaUnit) -> AreaArray:
+        if self._normalized is None or self._normalized.unit is not unit:
+            # Gather the factor of every value from the factors to unit.
+            if type(unit) is not AreaUnit:
+                raise NotImplementedError(
+                    'Can not convert Area values to {0}.'.format(unit))
+
+            factors = MixedAreaArray.conversion_factors[:, unit.code]
+            values = self._values * factors[self._unit_codes]
+            # The cached values are returned to every caller, so they must
+            # not change.
+            values.flags.writeable = False
+            self._normalized = AreaArray(values, unit)
+
+        return self._normalized
+
+
+def _from_bytes(data: bytes) -> AreaArray:
+    # The values of a view into bytes would be read-only, unlike the values
+    # of the pickled array.
+    return AreaArray.from_bytes(bytearray(data))
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace('{', '{{').replace('}', '}}')
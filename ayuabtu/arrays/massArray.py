@@ -0,0 +1,733 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import itertools
+
+import numpy
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split_format_spec, split_many
+from ..serialization import ARRAY_FLAG, ARRAY_HEADER_FORMAT, unpack_array_header
+from ..quantities import Mass
+from ..units import MassUnit
+
+
+class MassArray:
+    type_code = Mass.type_code
+    base_unit = Mass.base_unit
+    conversion_factors = numpy.array(Mass.conversion_factors)
+    # Like Mass.units_by_factor, but with unit codes
+    units_by_factor = {
+        system: (numpy.array(factors, dtype=numpy.float64),
+                 numpy.array([unit.code for unit in units], dtype=numpy.uint8))
+        for system, (factors, units) in Mass.units_by_factor.items()}
+
+    # Let numpy defer to the reflected operators of this class.
+    __array_ufunc__ = None
+
+    def __init__(self, values, unit: 'MassUnit') -> None:
+        if type(unit) is not MassUnit:
+            raise TypeError('{0} is not a MassUnit.'.format(unit))
+
+        self._values = numpy.asarray(values, dtype=numpy.float64)
+        self._unit = unit
+
+    def __str__(self):
+        return "{values} {unit}".format(
+            values=str(self._values),
+            unit=Mass.abbreviations[self._unit])
+
+    def __repr__(self):
+        return str(self)
+
+    def __reduce__(self):
+        # Pickles all values as a single buffer.
+        return _from_bytes, (self.to_bytes(),)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        values = self._values[index]
+
+        if numpy.ndim(values) == 0:
+            return Mass(float(values), self._unit)
+
+        return MassArray(values, self._unit)
+
+    def __iter__(self):
+        for value in self._values.tolist():
+            yield Mass(value, self._unit)
+
+    # Unary operators
+    def __neg__(self):
+        return MassArray(-self._values, self._unit)
+
+    # Arithmetic operators
+    def __add__(self, other):
+        if type(other) in (MassArray, MixedMassArray, Mass):
+            return MassArray(
+                self._values + other.as_unit(self._unit), self._unit)
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
+    def __sub__(self, other):
+        if type(other) in (MassArray, MixedMassArray, Mass):
+            return MassArray(
+                self._values - other.as_unit(self._unit), self._unit)
+
+        self._raise_type_error_for_undefined_operator(other, '-')
+
+    def __mul__(self, other):
+        return dispatch(self, '*', other)
+
+    def __rmul__(self, other):
+        return dispatch(other, '*', self)
+
+    def __truediv__(self, other):
+        return dispatch(self, '/', other)
+
+    def __pow__(self, other):
+        return power(self, other)
+
+    def _raise_type_error_for_undefined_operator(
+            self, other, operator: str) -> None:
+        raise TypeError(
+            'unsupported operand type(s) for {0}: \'{1}\' and \'{2}\''
+            .format(operator, type(self).__name__, type(other).__name__))
+
+    @staticmethod
+    def zeros(size: int) -> 'MassArray':
+        return MassArray(numpy.zeros(size), MassArray.base_unit)
+
+    @staticmethod
+    def parse_many(
+            texts,
+            unit: MassUnit = None,
+            chunk_size: int = 65536) -> 'MassArray':
+        """Parses an iterable of strings like "12.5 km" into one array.
+
+        The texts are consumed in chunks of chunk_size, so only one chunk of
+        strings is held in memory at a time. Values are converted to unit,
+        which defaults to the unit of the first text.
+        """
+        chunks = list(MassArray.parse_chunks(texts, unit, chunk_size))
+        if not chunks:
+            return MassArray(numpy.zeros(0), unit or MassArray.base_unit)
+
+        return MassArray(
+            numpy.concatenate([chunk._values for chunk in chunks]),
+            chunks[0]._unit)
+
+    @staticmethod
+    def parse_chunks(
+            texts,
+            unit: MassUnit = None,
+            chunk_size: int = 65536):
+        """Like parse_many, but yields one array per chunk of texts."""
+        texts = iter(texts)
+        chunk = list(itertools.islice(texts, chunk_size))
+        while chunk:
+            array = MassArray._parse_chunk(chunk, unit)
+            unit = array._unit
+            yield array
+            chunk = list(itertools.islice(texts, chunk_size))
+
+    @staticmethod
+    def parse_column(column, unit: MassUnit = None) -> 'MassArray':
+        """Parses a list or an ndarray of strings in a single chunk."""
+        if isinstance(column, numpy.ndarray):
+            column = column.tolist()
+
+        return MassArray._parse_chunk(list(column), unit)
+
+    @staticmethod
+    def from_bytes(data) -> 'MassArray':
+        """Decodes an array encoded with to_bytes.
+
+        data is any object supporting the buffer protocol. The values are a
+        view into data, so they are not copied.
+        """
+        unit, size = unpack_array_header(
+            data, MassArray.type_code, Mass.units_by_code)
+        values = numpy.frombuffer(
+            data, dtype='<f8', count=size, offset=ARRAY_HEADER_FORMAT.size)
+
+        return MassArray(values, unit)
+
+    @staticmethod
+    def from_quantities(quantities, unit: MassUnit = None) -> 'MassArray':
+        if unit is None:
+            unit = MassArray.base_unit
+
+        return MassArray(
+            [quantity.as_unit(unit) for quantity in quantities], unit)
+
+    @property
+    def unit(self) -> MassUnit:
+        return self._unit
+
+    @property
+    def values(self) -> numpy.ndarray:
+        return self._values
+
+    def as_unit(self, unit: MassUnit) -> numpy.ndarray:
+        if unit is self._unit:
+            return self._values
+
+        return self._get_values_as(unit)
+
+    def to_unit(self, unit: MassUnit) -> 'MassArray':
+        converted_values = self._get_values_as(unit)
+
+        return MassArray(converted_values, unit)
+
+    def to_quantities(self) -> list:
+        return list(self)
+
+    def to_bytes(self) -> bytes:
+        header = ARRAY_HEADER_FORMAT.pack(
+            MassArray.type_code | ARRAY_FLAG,
+            self._unit.code,
+            len(self._values))
+        values = numpy.ascontiguousarray(self._values, dtype='<f8')
+
+        return b''.join((header, values.data))
+
+    def format_many(
+            self,
+            format_spec: str = '',
+            separator: str = '\n') -> str:
+        """Formats all elements like format() into a single string.
+
+        The elements are joined by separator. A spec like ".3f~km" formats
+        the values with ".3f" after converting them to kilometers.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = MassArray._get_unit(symbol)
+
+        # Render everything with one format call on a template holding a
+        # replacement field per element.
+        element_template = '{:' + value_spec + '} ' + _escape_braces(
+            Mass.abbreviations[unit])
+        template = _escape_braces(separator).join(
+            itertools.repeat(element_template, len(self._values)))
+
+        return template.format(*self.as_unit(unit).tolist())
+
+    def humanize(self, system: str = None) -> 'MixedMassArray':
+        """Elementwise Mass.humanize.
+
+        Elements which are zero or not finite keep the unit of this array.
+        """
+        try:
+            factors, unit_codes = MassArray.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+        values = numpy.abs(self._get_values_in_base_unit())
+        codes = numpy.full(len(self._values), self._unit.code, dtype=numpy.uint8)
+        if len(unit_codes):
+            indices = numpy.searchsorted(factors, values, side='right') - 1
+            readable = (values != 0) & numpy.isfinite(values)
+            codes[readable] = unit_codes[numpy.maximum(indices[readable], 0)]
+
+        factors = MassArray.conversion_factors[self._unit.code, codes]
+
+        return MixedMassArray(self._values * factors, codes)
+
+    def isclose(
+            self,
+            other,
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> numpy.ndarray:
+        """Elementwise math.isclose against a MassArray or a Mass.
+
+        abs_tol is either a Mass or a float in the base unit. Returns a
+        boolean mask.
+        """
+        if type(other) not in (MassArray, Mass):
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Mass:
+            abs_tol = abs_tol.as_unit(self.base_unit)
+
+        values = self._get_values_in_base_unit()
+        other_values = other.as_unit(self.base_unit)
+        tolerance = numpy.maximum(
+            rel_tol * numpy.maximum(numpy.abs(values), numpy.abs(other_values)),
+            abs_tol)
+
+        # The equality check catches infinities, whose difference is nan.
+        with numpy.errstate(invalid='ignore'):
+            return ((numpy.abs(values - other_values) <= tolerance)
+                    | (values == other_values))
+
+    def allclose(
+            self,
+            other,
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        return bool(numpy.all(self.isclose(other, rel_tol, abs_tol)))
+
+    # Reductions
+    def sum(self) -> Mass:
+        return Mass(float(numpy.sum(self._values)), self._unit)
+
+    def mean(self) -> Mass:
+        if not len(self._values):
+            raise ValueError('mean() arg is an empty array')
+
+        return Mass(float(numpy.mean(self._values)), self._unit)
+
+    def min(self) -> Mass:
+        return Mass(float(numpy.min(self._values)), self._unit)
+
+    def max(self) -> Mass:
+        return Mass(float(numpy.max(self._values)), self._unit)
+
+    def std(self, ddof: int = 0) -> Mass:
+        if len(self._values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} values'.format(ddof))
+
+        return Mass(float(numpy.std(self._values, ddof=ddof)), self._unit)
+
+    # Generation shorthands
+    @staticmethod
+    def from_gigatonnes(values) -> 'MassArray':
+        return MassArray(values, MassUnit.GIGATONNE)
+
+    @staticmethod
+    def from_megatonnes(values) -> 'MassArray':
+        return MassArray(values, MassUnit.MEGATONNE)
+
+    @staticmethod
+    def from_kilotonnes(values) -> 'MassArray':
+        return MassArray(values, MassUnit.KILOTONNE)
+
+    @staticmethod
+    def from_tonnes(values) -> 'MassArray':
+        return MassArray(values, MassUnit.TONNE)
+
+    @staticmethod
+    def from_kilograms(values) -> 'MassArray':
+        return MassArray(values, MassUnit.KILOGRAM)
+
+    @staticmethod
+    def from_hectograms(values) -> 'MassArray':
+        return MassArray(values, MassUnit.HECTOGRAM)
+
+    @staticmethod
+    def from_decagrams(values) -> 'MassArray':
+        return MassArray(values, MassUnit.DECAGRAM)
+
+    @staticmethod
+    def from_grams(values) -> 'MassArray':
+        return MassArray(values, MassUnit.GRAM)
+
+    @staticmethod
+    def from_decigrams(values) -> 'MassArray':
+        return MassArray(values, MassUnit.DECIGRAM)
+
+    @staticmethod
+    def from_centigrams(values) -> 'MassArray':
+        return MassArray(values, MassUnit.CENTIGRAM)
+
+    @staticmethod
+    def from_milligrams(values) -> 'MassArray':
+        return MassArray(values, MassUnit.MILLIGRAM)
+
+    @staticmethod
+    def from_micrograms(values) -> 'MassArray':
+        return MassArray(values, MassUnit.MICROGRAM)
+
+    @staticmethod
+    def from_nanograms(values) -> 'MassArray':
+        return MassArray(values, MassUnit.NANOGRAM)
+
+    @staticmethod
+    def from_megapounds(values) -> 'MassArray':
+        return MassArray(values, MassUnit.MEGAPOUND)
+
+    @staticmethod
+    def from_kilopounds(values) -> 'MassArray':
+        return MassArray(values, MassUnit.KILOPOUND)
+
+    @staticmethod
+    def from_pounds(values) -> 'MassArray':
+        return MassArray(values, MassUnit.POUND)
+
+    @staticmethod
+    def from_ounces(values) -> 'MassArray':
+        return MassArray(values, MassUnit.OUNCE)
+
+    @staticmethod
+    def from_grains(values) -> 'MassArray':
+        return MassArray(values, MassUnit.GRAIN)
+
+    @staticmethod
+    def from_shortHundredweights(values) -> 'MassArray':
+        return MassArray(values, MassUnit.SHORTHUNDREDWEIGHT)
+
+    @staticmethod
+    def from_shortTons(values) -> 'MassArray':
+        return MassArray(values, MassUnit.SHORTTON)
+
+    @staticmethod
+    def from_stones(values) -> 'MassArray':
+        return MassArray(values, MassUnit.STONE)
+
+    @staticmethod
+    def from_longHundredweights(values) -> 'MassArray':
+        return MassArray(values, MassUnit.LONGHUNDREDWEIGHT)
+
+    @staticmethod
+    def from_longTons(values) -> 'MassArray':
+        return MassArray(values, MassUnit.LONGTON)
+
+    @staticmethod
+    def from_earthMasses(values) -> 'MassArray':
+        return MassArray(values, MassUnit.EARTHMASS)
+
+    @staticmethod
+    def from_solarMasses(values) -> 'MassArray':
+        return MassArray(values, MassUnit.SOLARMASS)
+
+    # Conversion shorthands
+    @property
+    def gigatonnes(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.GIGATONNE)
+
+    @property
+    def megatonnes(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.MEGATONNE)
+
+    @property
+    def kilotonnes(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.KILOTONNE)
+
+    @property
+    def tonnes(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.TONNE)
+
+    @property
+    def kilograms(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.KILOGRAM)
+
+    @property
+    def hectograms(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.HECTOGRAM)
+
+    @property
+    def decagrams(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.DECAGRAM)
+
+    @property
+    def grams(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.GRAM)
+
+    @property
+    def decigrams(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.DECIGRAM)
+
+    @property
+    def centigrams(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.CENTIGRAM)
+
+    @property
+    def milligrams(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.MILLIGRAM)
+
+    @property
+    def micrograms(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.MICROGRAM)
+
+    @property
+    def nanograms(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.NANOGRAM)
+
+    @property
+    def megapounds(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.MEGAPOUND)
+
+    @property
+    def kilopounds(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.KILOPOUND)
+
+    @property
+    def pounds(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.POUND)
+
+    @property
+    def ounces(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.OUNCE)
+
+    @property
+    def grains(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.GRAIN)
+
+    @property
+    def shortHundredweights(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.SHORTHUNDREDWEIGHT)
+
+    @property
+    def shortTons(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.SHORTTON)
+
+    @property
+    def stones(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.STONE)
+
+    @property
+    def longHundredweights(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.LONGHUNDREDWEIGHT)
+
+    @property
+    def longTons(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.LONGTON)
+
+    @property
+    def earthMasses(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.EARTHMASS)
+
+    @property
+    def solarMasses(self) -> numpy.ndarray:
+        return self.as_unit(MassUnit.SOLARMASS)
+
+    @staticmethod
+    def _parse_chunk(texts: list, unit: MassUnit) -> 'MassArray':
+        values, unit_codes = MassArray._parse_values_and_unit_codes(texts)
+        if not len(values):
+            return MassArray(values, unit or MassArray.base_unit)
+
+        if unit is None:
+            unit = Mass.units_by_code[unit_codes[0]]
+
+        factors = MassArray.conversion_factors[unit_codes, unit.code]
+
+        return MassArray(values * factors, unit)
+
+    @staticmethod
+    def _parse_values_and_unit_codes(texts: list) -> tuple:
+        numbers, symbols = split_many(texts)
+        if not numbers:
+            return numpy.zeros(0), numpy.zeros(0, dtype=numpy.uint8)
+
+        # Look up every distinct symbol only once.
+        unique_symbols, symbol_indices = numpy.unique(
+            symbols, return_inverse=True)
+        unit_codes = numpy.array([
+            MassArray._get_unit(symbol).code
+            for symbol in unique_symbols.tolist()], dtype=numpy.uint8)[symbol_indices]
+
+        return numpy.array(numbers, dtype=numpy.float64), unit_codes
+
+    @staticmethod
+    def _get_unit(symbol: str) -> MassUnit:
+        unit = lookup_unit(
+            Mass.units_by_symbol, Mass.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Mass unit "{0}".'.format(symbol))
+
+        return unit
+
+    def _with_values(self, values) -> 'MassArray':
+        return MassArray(values, self._unit)
+
+    def _get_values_in_base_unit(self) -> numpy.ndarray:
+        return self.as_unit(self.base_unit)
+
+    def _get_values_as(self, unit: MassUnit) -> numpy.ndarray:
+        # Units of other quantities have codes as well.
+        if type(unit) is not MassUnit:
+            raise NotImplementedError(
+                'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        return self._values * Mass.conversion_factors[
+            self._unit.code][unit.code]
+
+
+class MixedMassArray:
+    """Holds values given in different units.
+
+    Every value keeps the value of its unit in unit_codes. The values are
+    only converted to a common unit when an operation requires it.
+    """
+    base_unit = Mass.base_unit
+    conversion_factors = MassArray.conversion_factors
+
+    # Let numpy defer to the reflected operators of this class.
+    __array_ufunc__ = None
+
+    def __init__(self, values, unit_codes) -> None:
+        # Read-only views, so the values in _normalized can not become
+        # stale.
+        self._values = numpy.asarray(values, dtype=numpy.float64).view()
+        self._values.flags.writeable = False
+        self._unit_codes = numpy.asarray(unit_codes, dtype=numpy.uint8).view()
+        self._unit_codes.flags.writeable = False
+        if self._values.shape != self._unit_codes.shape:
+            raise ValueError('Every value needs exactly one unit code.')
+        # The values converted by the last operation which needed a
+        # common unit
+        self._normalized = None
+
+    def __str__(self):
+        quantities = [str(quantity) for quantity in self[:3]]
+        if len(self) > 6:
+            quantities.append('...')
+        quantities.extend(str(quantity) for quantity in self[max(3, len(self) - 3):])
+
+        return '[{0}]'.format(', '.join(quantities))
+
+    def __repr__(self):
+        return str(self)
+
+    def __reduce__(self):
+        # Leaves out the converted values in _normalized.
+        return MixedMassArray, (self._values, self._unit_codes)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        values = self._values[index]
+
+        if numpy.ndim(values) == 0:
+            return Mass(
+                float(values),
+                Mass.units_by_code[self._unit_codes[index]])
+
+        return MixedMassArray(values, self._unit_codes[index])
+
+    def __iter__(self):
+        units = Mass.units_by_code
+        for value, unit_code in zip(
+                self._values.tolist(), self._unit_codes.tolist()):
+            yield Mass(value, units[unit_code])
+
+    # Unary operators
+    def __neg__(self):
+        return MixedMassArray(-self._values, self._unit_codes)
+
+    # Arithmetic operators
+    def __add__(self, other):
+        if type(other) in (MixedMassArray, MassArray, Mass):
+            return self._normalize(self.base_unit) + other
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
+    def __sub__(self, other):
+        if type(other) in (MixedMassArray, MassArray, Mass):
+            return self._normalize(self.base_unit) - other
+
+        self._raise_type_error_for_undefined_operator(other, '-')
+
+    def __mul__(self, other):
+        return dispatch(self, '*', other)
+
+    def __rmul__(self, other):
+        return dispatch(other, '*', self)
+
+    def __truediv__(self, other):
+        return dispatch(self, '/', other)
+
+    def __pow__(self, other):
+        return power(self, other)
+
+    def _raise_type_error_for_undefined_operator(
+            self, other, operator: str) -> None:
+        raise TypeError(
+            'unsupported operand type(s) for {0}: \'{1}\' and \'{2}\''
+            .format(operator, type(self).__name__, type(other).__name__))
+
+    @staticmethod
+    def from_quantities(quantities) -> 'MixedMassArray':
+        quantities = list(quantities)
+
+        return MixedMassArray(
+            [quantity.value for quantity in quantities],
+            [quantity.unit.code for quantity in quantities])
+
+    @staticmethod
+    def parse_many(texts) -> 'MixedMassArray':
+        """Parses strings like "12.5 km" keeping the unit of every text."""
+        values, unit_codes = MassArray._parse_values_and_unit_codes(
+            list(texts))
+
+        return MixedMassArray(values, unit_codes)
+
+    @property
+    def values(self) -> numpy.ndarray:
+        return self._values
+
+    @property
+    def unit_codes(self) -> numpy.ndarray:
+        return self._unit_codes
+
+    def count_units(self) -> dict:
+        counts = numpy.bincount(
+            self._unit_codes, minlength=len(Mass.units_by_code))
+
+        return {
+            unit: int(count)
+            for unit, count in zip(Mass.units_by_code, counts.tolist())
+            if count}
+
+    def as_unit(self, unit: MassUnit) -> numpy.ndarray:
+        return self._normalize(unit).values
+
+    def to_unit(self, unit: MassUnit) -> MassArray:
+        return self._normalize(unit)
+
+    def to_quantities(self) -> list:
+        return list(self)
+
+    # Reductions run on the values normalized to the base unit.
+    def sum(self) -> Mass:
+        return self._normalize(Mass.base_unit).sum()
+
+    def mean(self) -> Mass:
+        return self._normalize(Mass.base_unit).mean()
+
+    def min(self) -> Mass:
+        return self._normalize(Mass.base_unit).min()
+
+    def max(self) -> Mass:
+        return self._normalize(Mass.base_unit).max()
+
+    def std(self, ddof: int = 0) -> Mass:
+        return self._normalize(Mass.base_unit).std(ddof)
+
+    def _with_values(self, values) -> 'MixedMassArray':
+        return MixedMassArray(values, self._unit_codes)
+
+    def _normalize(self, unit: MassUnit) -> MassArray:
+        if self._normalized is None or self._normalized.unit is not unit:
+            # Gather the factor of every value from the factors to unit.
+            if type(unit) is not MassUnit:
+                raise NotImplementedError(
+                    'Can not convert Mass values to {0}.'.format(unit))
+
+            factors = MixedMassArray.conversion_factors[:, unit.code]
+            values = self._values * factors[self._unit_codes]
+            # The cached values are returned to every caller, so they must
+            # not change.
+            values.flags.writeable = False
+            self._normalized = MassArray(values, unit)
+
+        return self._normalized
+
+
+def _from_bytes(data: bytes) -> MassArray:
+    # The values of a view into bytes would be read-only, unlike the values
+    # of the pickled array.
+    return MassArray.from_bytes(bytearray(data))
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace('{', '{{').replace('}', '}}')
@@ -0,0 +1,161 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import numpy
+
+from ..dispatch import register, register_power
+from ..quantities import (
+    Area,
+    ElectricCurrent,
+    Length,
+    Mass,
+    Time,
+    Volume,
+)
+from .areaArray import (
+    AreaArray, MixedAreaArray)
+from .electricCurrentArray import (
+    ElectricCurrentArray, MixedElectricCurrentArray)
+from .lengthArray import (
+    LengthArray, MixedLengthArray)
+from .massArray import (
+    MassArray, MixedMassArray)
+from .timeArray import (
+    TimeArray, MixedTimeArray)
+from .volumeArray import (
+    VolumeArray, MixedVolumeArray)
+
+# Maps the quantities to their array types
+_array_types = {
+    Area: (AreaArray, MixedAreaArray),
+    ElectricCurrent: (ElectricCurrentArray, MixedElectricCurrentArray),
+    Length: (LengthArray, MixedLengthArray),
+    Mass: (MassArray, MixedMassArray),
+    Time: (TimeArray, MixedTimeArray),
+    Volume: (VolumeArray, MixedVolumeArray),
+}
+
+
+# The products with numbers keep the unit of the array, so they also keep
+# the units of mixed unit arrays.
+def _product_with_number(array, number):
+    return array._with_values(array._values * number)
+
+
+def _reflected_product_with_number(number, array):
+    return array._with_values(number * array._values)
+
+
+def _quotient_by_number(array, number):
+    return array._with_values(array._values / number)
+
+
+def _ratio(left, right) -> numpy.ndarray:
+    return left.as_unit(left.base_unit) / right.as_unit(right.base_unit)
+
+
+def _product(result_type: type):
+    base_unit = result_type.base_unit
+
+    def kernel(left, right):
+        return result_type(
+            left.as_unit(left.base_unit) * right.as_unit(right.base_unit),
+            base_unit)
+
+    return kernel
+
+
+def _quotient(result_type: type):
+    base_unit = result_type.base_unit
+
+    def kernel(left, right):
+        return result_type(
+            left.as_unit(left.base_unit) / right.as_unit(right.base_unit),
+            base_unit)
+
+    return kernel
+
+
+def _power(result_type: type):
+    base_unit = result_type.base_unit
+
+    def kernel(base, exponent: float):
+        return result_type(base.as_unit(base.base_unit) ** exponent, base_unit)
+
+    return kernel
+
+
+def _first_power(base, exponent: float):
+    return base
+
+
+def _zeroth_power(base, exponent: float):
+    return base.as_unit(base.base_unit) ** exponent
+
+
+def _register_operators() -> None:
+    for quantity_type, array_types in _array_types.items():
+        for array_type in array_types:
+            for number_type in (float, int, numpy.ndarray):
+                register(array_type, '*', number_type, array_type,
+                         _product_with_number)
+                register(number_type, '*', array_type, array_type,
+                         _reflected_product_with_number)
+                register(array_type, '/', number_type, array_type,
+                         _quotient_by_number)
+
+            register_power(array_type, 0.0, numpy.ndarray, _zeroth_power)
+            register_power(array_type, 1.0, array_type, _first_power)
+
+        _register_for_arrays(
+            quantity_type, '/', quantity_type, numpy.ndarray, _ratio)
+
+    # Cross-quantity operators from the quantity definitions
+    _register_for_arrays(Area, '*', Length, VolumeArray,
+                         _product(VolumeArray))
+    _register_for_arrays(Area, '/', Length, LengthArray,
+                         _quotient(LengthArray))
+    _register_for_arrays(Length, '*', Length, AreaArray,
+                         _product(AreaArray))
+    _register_for_arrays(Length, '*', Area, VolumeArray,
+                         _product(VolumeArray))
+    _register_for_arrays(Volume, '/', Length, AreaArray,
+                         _quotient(AreaArray))
+    _register_for_arrays(Volume, '/', Area, LengthArray,
+                         _quotient(LengthArray))
+
+    # Powers and roots derived from the products above
+    for array_type in _array_types[Area]:
+        register_power(array_type, 0.5, LengthArray,
+                       _power(LengthArray))
+    for array_type in _array_types[Area]:
+        register_power(array_type, 1.5, VolumeArray,
+                       _power(VolumeArray))
+    for array_type in _array_types[Length]:
+        register_power(array_type, 2.0, AreaArray,
+                       _power(AreaArray))
+    for array_type in _array_types[Length]:
+        register_power(array_type, 3.0, VolumeArray,
+                       _power(VolumeArray))
+    for array_type in _array_types[Volume]:
+        register_power(array_type, 0.3333333333333333, LengthArray,
+                       _power(LengthArray))
+    for array_type in _array_types[Volume]:
+        register_power(array_type, 0.6666666666666666, AreaArray,
+                       _power(AreaArray))
+
+
+def _register_for_arrays(
+        left_type: type,
+        operator: str,
+        right_type: type,
+        result_type: type,
+        kernel) -> None:
+    # Registers an operator of two quantities for two arrays and for an
+    # array and a scalar quantity.
+    for left in (left_type,) + _array_types[left_type]:
+        for right in (right_type,) + _array_types[right_type]:
+            if (left, right) != (left_type, right_type):
+                register(left, operator, right, result_type, kernel)
+
+
+_register_operators()
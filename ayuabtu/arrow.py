@@ -0,0 +1,133 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Arrow extension types for columns of quantities.
+
+Importing this module registers one extension type per quantity, so the
+units of quantity columns survive writing them to Parquet or IPC files.
+Requires pyarrow and numpy.
+"""
+import pyarrow
+
+from .arrays import (
+    AreaArray,
+    ElectricCurrentArray,
+    LengthArray,
+    MassArray,
+    TimeArray,
+    VolumeArray,
+)
+
+
+class QuantityType(pyarrow.ExtensionType):
+    """Stores the values of a quantity array as float64 in a single unit.
+
+    The name of the unit is kept in the metadata of the type.
+    """
+    extension_name = None
+    array_type = None
+
+    def __init__(self, unit) -> None:
+        self._unit = unit
+        super().__init__(pyarrow.float64(), self.extension_name)
+
+    @property
+    def unit(self):
+        return self._unit
+
+    def __arrow_ext_serialize__(self) -> bytes:
+        return self._unit.name.encode()
+
+    @classmethod
+    def __arrow_ext_deserialize__(cls, storage_type, serialized):
+        unit_type = type(cls.array_type.base_unit)
+
+        return cls(unit_type[serialized.decode()])
+
+
+class AreaType(QuantityType):
+    extension_name = 'ayuabtu.Area'
+    array_type = AreaArray
+
+
+class ElectricCurrentType(QuantityType):
+    extension_name = 'ayuabtu.ElectricCurrent'
+    array_type = ElectricCurrentArray
+
+
+class LengthType(QuantityType):
+    extension_name = 'ayuabtu.Length'
+    array_type = LengthArray
+
+
+class MassType(QuantityType):
+    extension_name = 'ayuabtu.Mass'
+    array_type = MassArray
+
+
+class TimeType(QuantityType):
+    extension_name = 'ayuabtu.Time'
+    array_type = TimeArray
+
+
+class VolumeType(QuantityType):
+    extension_name = 'ayuabtu.Volume'
+    array_type = VolumeArray
+
+
+_types_by_array_type = {
+    AreaArray: AreaType,
+    ElectricCurrentArray: ElectricCurrentType,
+    LengthArray: LengthType,
+    MassArray: MassType,
+    TimeArray: TimeType,
+    VolumeArray: VolumeType,
+}
+
+for _extension_type in _types_by_array_type.values():
+    pyarrow.register_extension_type(
+        _extension_type(_extension_type.array_type.base_unit))
+
+
+def to_arrow(array) -> pyarrow.ExtensionArray:
+    """Converts a quantity array to an Arrow array without copying."""
+    try:
+        extension_type = _types_by_array_type[type(array)]
+    except KeyError:
+        raise TypeError(
+            'Can not convert {0} to an Arrow array.'.format(
+                type(array).__name__))
+
+    storage = pyarrow.array(array.values, type=pyarrow.float64())
+
+    return pyarrow.ExtensionArray.from_storage(
+        extension_type(array.unit), storage)
+
+
+def from_arrow(arrow_array):
+    """Converts an Arrow array or chunked array to a quantity array.
+
+    The values are not copied if arrow_array has a single chunk without
+    nulls. Nulls are converted to nan.
+    """
+    if isinstance(arrow_array, pyarrow.ChunkedArray):
+        arrow_array = _combine_chunks(arrow_array)
+
+    extension_type = arrow_array.type
+    if not isinstance(extension_type, QuantityType):
+        raise TypeError(
+            'Can not convert Arrow arrays of type {0} to quantity arrays.'
+            .format(extension_type))
+
+    values = arrow_array.storage.to_numpy(zero_copy_only=False)
+
+    return extension_type.array_type(values, extension_type.unit)
+
+
+def _combine_chunks(chunked_array: pyarrow.ChunkedArray) -> pyarrow.Array:
+    if chunked_array.num_chunks == 1:
+        return chunked_array.chunk(0)
+
+    storage = pyarrow.concat_arrays(
+        [chunk.storage for chunk in chunked_array.chunks])
+
+    return pyarrow.ExtensionArray.from_storage(chunked_array.type, storage)
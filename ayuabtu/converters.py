@@ -0,0 +1,178 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Converters between compound units like "mi/h" and "m/s".
+
+A unit expression multiplies and divides unit symbols, which may have an
+integer exponent, like "kg*m/s^2", "kg·m·s⁻²" or "m³/h".
+"""
+import fractions
+import functools
+import operator
+import re
+from typing import Tuple
+
+from .dimensions import DIMENSIONLESS
+from .parsing import lookup_symbol
+
+# Splits an expression into its factors and the operators between them
+_OPERATOR_PATTERN = re.compile(r'\s*([*/·])\s*')
+# Matches a symbol with an exponent like "s^-2" or "s⁻²"
+_EXPONENT_PATTERN = re.compile(
+    r'(.+?)(?:\^([-+]?\d+)|([⁺⁻]?[⁰¹²³⁴⁵⁶⁷⁸⁹]+))$')
+_DIGITS = str.maketrans('⁺⁻⁰¹²³⁴⁵⁶⁷⁸⁹', '+-0123456789')
+# The factors of the units to their base unit as written in the unit
+# definitions, by quantity and unit code. The fractions of the float
+# factors would keep the binary rounding of factors like 0.0254.
+_EXACT_FACTORS = {
+    'Area': (
+        fractions.Fraction('1e6'),  # SQUAREKILOMETER
+        fractions.Fraction('1e4'),  # HECTARE
+        fractions.Fraction('1'),  # SQUAREMETER
+        fractions.Fraction('1e-2'),  # SQUAREDECIMETER
+        fractions.Fraction('1e-4'),  # SQUARECENTIMETER
+        fractions.Fraction('1e-6'),  # SQUAREMILLIMETER
+        fractions.Fraction('1e-12'),  # SQUAREMICROMETER
+        fractions.Fraction('6.4516e-4'),  # SQUAREINCH
+        fractions.Fraction('9.2903e-2'),  # SQUAREFOOT
+        fractions.Fraction('8.36127e-1'),  # SQUAREYARD
+        fractions.Fraction('2.59e6'),  # SQUAREMILE
+        fractions.Fraction('4046.85642'),  # ACRE
+    ),
+    'ElectricCurrent': (
+        fractions.Fraction('1e6'),  # MEGAAMPERE
+        fractions.Fraction('1e3'),  # KILOAMPERE
+        fractions.Fraction('1e0'),  # AMPERE
+        fractions.Fraction('1e-2'),  # CENTIAMPERE
+        fractions.Fraction('1e-3'),  # MILLIAMPERE
+        fractions.Fraction('1e-6'),  # MICROAMPERE
+        fractions.Fraction('1e-9'),  # NANOAMPERE
+        fractions.Fraction('1e-12'),  # PICOAMPERE
+    ),
+    'Length': (
+        fractions.Fraction('1e3'),  # KILOMETER
+        fractions.Fraction('1e2'),  # HECTOMETER
+        fractions.Fraction('1e1'),  # DECAMETER
+        fractions.Fraction('1e0'),  # METER
+        fractions.Fraction('1e-1'),  # DECIMETER
+        fractions.Fraction('1e-2'),  # CENTIMETER
+        fractions.Fraction('1e-3'),  # MILLIMETER
+        fractions.Fraction('1e-6'),  # MICROMETER
+        fractions.Fraction('1e-9'),  # NANOMETER
+        fractions.Fraction('0.0254'),  # INCH
+        fractions.Fraction('0.3048'),  # FOOT
+        fractions.Fraction('0.9144'),  # YARD
+        fractions.Fraction('1609.34'),  # MILE
+    ),
+    'Mass': (
+        fractions.Fraction('1e12'),  # GIGATONNE
+        fractions.Fraction('1e9'),  # MEGATONNE
+        fractions.Fraction('1e6'),  # KILOTONNE
+        fractions.Fraction('1e3'),  # TONNE
+        fractions.Fraction('1e0'),  # KILOGRAM
+        fractions.Fraction('1e-1'),  # HECTOGRAM
+        fractions.Fraction('1e-2'),  # DECAGRAM
+        fractions.Fraction('1e-3'),  # GRAM
+        fractions.Fraction('1e-4'),  # DECIGRAM
+        fractions.Fraction('1e-5'),  # CENTIGRAM
+        fractions.Fraction('1e-6'),  # MILLIGRAM
+        fractions.Fraction('1e-9'),  # MICROGRAM
+        fractions.Fraction('1e-12'),  # NANOGRAM
+        fractions.Fraction('4.53592370e5'),  # MEGAPOUND
+        fractions.Fraction('4.53592370e2'),  # KILOPOUND
+        fractions.Fraction('4.53592370e-1'),  # POUND
+        fractions.Fraction('2.8349523125e-2'),  # OUNCE
+        fractions.Fraction('6.479891e-5'),  # GRAIN
+        fractions.Fraction('45.359237'),  # SHORTHUNDREDWEIGHT
+        fractions.Fraction('907.18474'),  # SHORTTON
+        fractions.Fraction('6.35029318'),  # STONE
+        fractions.Fraction('50.80234544'),  # LONGHUNDREDWEIGHT
+        fractions.Fraction('1016.0469088'),  # LONGTON
+        fractions.Fraction('5.9723e24'),  # EARTHMASS
+        fractions.Fraction('1.98892e30'),  # SOLARMASS
+    ),
+    'Time': (
+        fractions.Fraction('604800'),  # WEEK
+        fractions.Fraction('86400'),  # DAY
+        fractions.Fraction('3600'),  # HOUR
+        fractions.Fraction('60'),  # MINUTE
+        fractions.Fraction('1e0'),  # SECOND
+        fractions.Fraction('1e-3'),  # MILLISECOND
+        fractions.Fraction('1e-6'),  # MICROSECOND
+        fractions.Fraction('1e-9'),  # NANOSECOND
+    ),
+    'Volume': (
+        fractions.Fraction('1'),  # CUBICMETER
+    ),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def converter(from_unit: str, to_unit: str):
+    """Returns a function converting values from one unit to another.
+
+    Both unit expressions must have the same dimension. The function
+    multiplies by a single factor, so it takes floats as well as NumPy
+    arrays.
+    """
+    from_factor, from_dimension = parse_unit_expression(from_unit)
+    to_factor, to_dimension = parse_unit_expression(to_unit)
+    if from_dimension != to_dimension:
+        raise ValueError(
+            'Can not convert "{0}" to "{1}".'.format(from_unit, to_unit))
+
+    return functools.partial(operator.mul, float(from_factor / to_factor))
+
+
+@functools.lru_cache(maxsize=256)
+def parse_unit_expression(
+        expression: str) -> Tuple[fractions.Fraction, tuple]:
+    """Returns the factor to the base units and the dimension of a unit.
+
+    The factor is exact, so it is rounded only once in the converter.
+    """
+    parts = _OPERATOR_PATTERN.split(expression.strip())
+    factor = fractions.Fraction(1)
+    dimension = DIMENSIONLESS
+    sign = 1
+
+    # The parts alternate between factors and operators. Like in Python,
+    # "/" only divides by the factor following it.
+    for index, part in enumerate(parts):
+        if index % 2:
+            sign = -1 if part == '/' else 1
+            continue
+
+        unit_factor, unit_dimension, exponent = _parse_factor(
+            part, expression)
+        exponent *= sign
+        factor *= unit_factor ** exponent
+        dimension = tuple(
+            total + exponent * unit_exponent
+            for total, unit_exponent in zip(dimension, unit_dimension))
+
+    return factor, dimension
+
+
+def _parse_factor(
+        text: str, expression: str) -> Tuple[fractions.Fraction, tuple, int]:
+    if text == '1':
+        return fractions.Fraction(1), DIMENSIONLESS, 1
+
+    entry = lookup_symbol(text)
+    exponent = 1
+    if entry is None:
+        match = _EXPONENT_PATTERN.match(text)
+        if match is not None:
+            symbol, exponent_text, superscript = match.groups()
+            exponent = int(exponent_text or superscript.translate(_DIGITS))
+            entry = lookup_symbol(symbol)
+
+    if entry is None:
+        raise ValueError(
+            'Unknown unit "{0}" in "{1}".'.format(text, expression))
+
+    quantity_type, unit = entry
+
+    factor = _EXACT_FACTORS[quantity_type.__name__][unit.code]
+
+    return factor, quantity_type.dimension, exponent
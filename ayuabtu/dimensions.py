@@ -0,0 +1,336 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Resolves the operators of quantities by their dimensions.
+
+The dimension of a quantity holds the exponents of the base dimensions,
+e.g. (0, 2, 0, 0) for an Area. Products and quotients which are not
+registered in the dispatch table get the quantity of the combined
+dimension. Dimensions without a generated quantity get a subclass of
+DerivedQuantity. The resolved operators are registered, so they are
+resolved only once per pair of operand types.
+"""
+import fractions
+import functools
+import math
+
+from .dispatch import (
+    dispatch,
+    power,
+    register,
+    register_power_resolver,
+    register_resolver,
+)
+
+BASE_DIMENSIONS = (
+    'electric_current',
+    'length',
+    'mass',
+    'time',
+)
+DIMENSIONLESS = (0,) * len(BASE_DIMENSIONS)
+# The symbols of the base units of the base dimensions
+_BASE_SYMBOLS = (
+    'A',
+    'm',
+    'kg',
+    's',
+)
+_SUPERSCRIPTS = str.maketrans('-0123456789', '⁻⁰¹²³⁴⁵⁶⁷⁸⁹')
+_NUMBER_TYPES = (float, int)
+
+# Maps the dimensions to their quantity types. The table is populated on
+# first use because the quantity modules import this one.
+_types_by_dimension = {}
+# Memoizes the result types of (left dimension, operator, right dimension).
+_result_types = {}
+
+
+class DerivedQuantity:
+    """A quantity of a dimension without a generated quantity class.
+
+    The value is given in the product of the base units, like m·s⁻¹ for a
+    Length divided by a Time. get_quantity_type creates the subclass of a
+    dimension.
+    """
+    dimension = None
+    symbol = None
+
+    __slots__ = ('_value',)
+
+    def __init__(self, value: float) -> None:
+        self._value = value
+
+    def __str__(self):
+        return '{0} {1}'.format(self._value, self.symbol)
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # The subclasses are created at runtime, so they are pickled by
+        # their dimension.
+        return _from_dimension, (self._value, self.dimension)
+
+    # Comparison operators
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._value == other._value
+
+    def __lt__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._value < other._value
+
+    def __le__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._value <= other._value
+
+    def __gt__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._value > other._value
+
+    def __ge__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._value >= other._value
+
+    def __hash__(self):
+        return hash(self._value)
+
+    # Unary operators
+    def __neg__(self):
+        return type(self)(-self._value)
+
+    # Arithmetic operators
+    def __add__(self, other):
+        if type(other) is type(self):
+            return type(self)(self._value + other._value)
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
+    def __sub__(self, other):
+        if type(other) is type(self):
+            return type(self)(self._value - other._value)
+
+        self._raise_type_error_for_undefined_operator(other, '-')
+
+    def __mul__(self, other):
+        return dispatch(self, '*', other)
+
+    def __rmul__(self, other):
+        return dispatch(other, '*', self)
+
+    def __truediv__(self, other):
+        return dispatch(self, '/', other)
+
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
+
+    def __pow__(self, other):
+        return power(self, other)
+
+    def _raise_type_error_for_undefined_operator(
+            self, other, operator: str) -> None:
+        raise TypeError(
+            'unsupported operand type(s) for {0}: \'{1}\' and \'{2}\''
+            .format(operator, type(self).__name__, type(other).__name__))
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def _get_value_in_base_unit(self) -> float:
+        return self._value
+
+
+def get_quantity_type(dimension: tuple) -> type:
+    """Returns the type of the quantities of a dimension.
+
+    This is the generated quantity class of the dimension, float for
+    dimensionless values or a subclass of DerivedQuantity.
+    """
+    if not _types_by_dimension:
+        _load_types_by_dimension()
+
+    dimension = _normalize(dimension)
+    try:
+        return _types_by_dimension[dimension]
+    except KeyError:
+        pass
+
+    if len(dimension) != len(BASE_DIMENSIONS):
+        raise ValueError(
+            'A dimension needs {0} exponents.'.format(len(BASE_DIMENSIONS)))
+
+    symbol = _create_symbol(dimension)
+    derived_type = type(
+        'DerivedQuantity[{0}]'.format(symbol),
+        (DerivedQuantity,),
+        {'__slots__': (), 'dimension': dimension, 'symbol': symbol})
+    _types_by_dimension[dimension] = derived_type
+
+    return derived_type
+
+
+def _resolve(left_type: type, operator: str, right_type: type):
+    left_dimension = _get_dimension(left_type)
+    right_dimension = _get_dimension(right_type)
+    if (operator not in ('*', '/')
+            or left_dimension is None
+            or right_dimension is None
+            or (left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES)):
+        return None
+
+    key = (left_dimension, operator, right_dimension)
+    try:
+        result_type = _result_types[key]
+    except KeyError:
+        sign = 1 if operator == '*' else -1
+        result_type = get_quantity_type(tuple(
+            left + sign * right
+            for left, right in zip(left_dimension, right_dimension)))
+        _result_types[key] = result_type
+
+    kernel = _create_kernel(left_type, operator, right_type, result_type)
+    register(left_type, operator, right_type, result_type, kernel)
+
+    return result_type, kernel
+
+
+# The powers are cached instead of registered, so arbitrary exponents do
+# not fill the dispatch table.
+@functools.lru_cache(maxsize=256)
+def _resolve_power(base_type: type, exponent: float):
+    dimension = getattr(base_type, 'dimension', None)
+    if dimension is None or not math.isfinite(exponent):
+        return None
+
+    # Only rational exponents with small denominators, like 1/3, give a
+    # dimension.
+    fraction = fractions.Fraction(exponent).limit_denominator(1000)
+    if float(fraction) != exponent:
+        return None
+
+    result_type = get_quantity_type(tuple(
+        base_exponent * fraction for base_exponent in dimension))
+    create = _get_constructor(result_type)
+
+    def kernel(base, exponent: float):
+        # Like the registered powers, fractional powers of negative values
+        # raise ValueError instead of returning a complex number.
+        return create(math.pow(base._get_value_in_base_unit(), exponent))
+
+    return result_type, kernel
+
+
+def _create_kernel(
+        left_type: type,
+        operator: str,
+        right_type: type,
+        result_type: type):
+    get_left_value = _get_value_getter(left_type)
+    get_right_value = _get_value_getter(right_type)
+    create = _get_constructor(result_type)
+
+    if operator == '*':
+        def kernel(left, right):
+            return create(get_left_value(left) * get_right_value(right))
+    else:
+        def kernel(left, right):
+            return create(get_left_value(left) / get_right_value(right))
+
+    return kernel
+
+
+def _get_dimension(operand_type: type):
+    if operand_type in _NUMBER_TYPES:
+        return DIMENSIONLESS
+
+    return getattr(operand_type, 'dimension', None)
+
+
+def _get_value_getter(operand_type: type):
+    # Returns a function giving the value of an operand in the base units.
+    if operand_type in _NUMBER_TYPES:
+        return float
+
+    return operand_type._get_value_in_base_unit
+
+
+def _get_constructor(result_type: type):
+    # Returns a function creating a result from its value in the base units.
+    if result_type is float or issubclass(result_type, DerivedQuantity):
+        return result_type
+
+    base_unit = result_type.base_unit
+
+    def create(value: float):
+        return result_type(value, base_unit)
+
+    return create
+
+
+def _normalize(dimension: tuple) -> tuple:
+    # Integral exponents are stored as int, so equal dimensions hash equally
+    # and print without a fraction.
+    return tuple(
+        int(exponent) if fractions.Fraction(exponent).denominator == 1
+        else fractions.Fraction(exponent)
+        for exponent in dimension)
+
+
+def _create_symbol(dimension: tuple) -> str:
+    parts = []
+    for base_symbol, exponent in zip(_BASE_SYMBOLS, dimension):
+        if exponent == 1:
+            parts.append(base_symbol)
+        elif type(exponent) is int and exponent != 0:
+            parts.append(base_symbol + str(exponent).translate(_SUPERSCRIPTS))
+        elif exponent != 0:
+            parts.append('{0}^({1})'.format(base_symbol, exponent))
+
+    return '·'.join(parts)
+
+
+def _load_types_by_dimension() -> None:
+    from .quantities import (
+        Area,
+        ElectricCurrent,
+        Length,
+        Mass,
+        Time,
+        Volume,
+    )
+
+    _types_by_dimension[DIMENSIONLESS] = float
+    for quantity_type in (
+            Area,
+            ElectricCurrent,
+            Length,
+            Mass,
+            Time,
+            Volume,
+    ):
+        _types_by_dimension[quantity_type.dimension] = quantity_type
+
+
+def _from_dimension(value: float, dimension: tuple) -> DerivedQuantity:
+    return get_quantity_type(dimension)(value)
+
+
+register_resolver(_resolve)
+register_power_resolver(_resolve_power)
@@ -0,0 +1,133 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import decimal
+import numbers
+
+# Maps (left operand type, operator, right operand type) to the result type
+# of the operation and the kernel computing it from both operands.
+_operators = {}
+
+# Maps (base type, exponent) to the result type of the power and the kernel
+# computing it from the base and the exponent.
+_powers = {}
+
+# Functions which resolve the operators and powers that are not registered.
+# They register and return the entry for the operand types or return None.
+_resolvers = []
+_power_resolvers = []
+
+
+def register(
+        left_type: type,
+        operator: str,
+        right_type: type,
+        result_type: type,
+        kernel) -> None:
+    _operators[(left_type, operator, right_type)] = (result_type, kernel)
+
+
+def lookup(left_type: type, operator: str, right_type: type):
+    try:
+        return _operators[(left_type, operator, right_type)]
+    except KeyError:
+        return _resolve(left_type, operator, right_type)
+
+
+def dispatch(left, operator: str, right):
+    try:
+        _, kernel = _operators[(type(left), operator, type(right))]
+    except KeyError:
+        entry = _resolve(type(left), operator, type(right))
+        if entry is None:
+            return NotImplemented
+        _, kernel = entry
+
+    return kernel(left, right)
+
+
+def register_power(
+        base_type: type,
+        exponent: float,
+        result_type: type,
+        kernel) -> None:
+    _powers[(base_type, exponent)] = (result_type, kernel)
+
+
+def register_resolver(resolver) -> None:
+    _resolvers.append(resolver)
+
+
+def register_power_resolver(resolver) -> None:
+    _power_resolvers.append(resolver)
+
+
+def power(base, exponent):
+    if not _is_number_type(type(exponent)):
+        return NotImplemented
+
+    exponent = float(exponent)
+    try:
+        _, kernel = _powers[(type(base), exponent)]
+    except KeyError:
+        entry = _resolve_power(type(base), exponent)
+        if entry is None:
+            return NotImplemented
+        _, kernel = entry
+
+    return kernel(base, exponent)
+
+
+def _resolve(left_type: type, operator: str, right_type: type):
+    for resolver in _resolvers:
+        entry = resolver(left_type, operator, right_type)
+        if entry is not None:
+            return entry
+
+    return None
+
+
+def _resolve_power(base_type: type, exponent: float):
+    for resolver in _power_resolvers:
+        entry = resolver(base_type, exponent)
+        if entry is not None:
+            return entry
+
+    return None
+
+
+def _register_number_type(left_type: type, operator: str, right_type: type):
+    # Numbers other than int and float (numpy scalars, Fraction, Decimal,
+    # ...) are converted to float and handled by the float kernels. The
+    # entry is registered for the new type, so this only happens once.
+    if right_type is not float and _is_number_type(right_type):
+        entry = lookup(left_type, operator, float)
+        if entry is None:
+            return None
+
+        result_type, float_kernel = entry
+
+        def kernel(left, right):
+            return float_kernel(left, float(right))
+    elif left_type is not float and _is_number_type(left_type):
+        entry = lookup(float, operator, right_type)
+        if entry is None:
+            return None
+
+        result_type, float_kernel = entry
+
+        def kernel(left, right):
+            return float_kernel(float(left), right)
+    else:
+        return None
+
+    register(left_type, operator, right_type, result_type, kernel)
+
+    return _operators[(left_type, operator, right_type)]
+
+
+def _is_number_type(value_type: type) -> bool:
+    return issubclass(value_type, (numbers.Real, decimal.Decimal))
+
+
+# Other number types are tried before any other resolver.
+register_resolver(_register_number_type)
@@ -0,0 +1,183 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Encodes quantities and quantity arrays as JSON objects like
+
+    {"quantity": "Length", "value": 2.5, "unit": "KILOMETER"}
+    {"quantity": "Length", "values": [1.0, 2.5], "unit": "KILOMETER"}
+
+Use default or QuantityEncoder to encode and object_hook to decode them.
+"""
+import collections.abc
+import itertools
+import json
+
+from .parsing import lookup_unit
+from .quantities import (
+    Area,
+    ElectricCurrent,
+    Length,
+    Mass,
+    Time,
+    Volume,
+)
+
+_quantity_types = {
+    'Area': Area,
+    'ElectricCurrent': ElectricCurrent,
+    'Length': Length,
+    'Mass': Mass,
+    'Time': Time,
+    'Volume': Volume,
+}
+
+# The arrays are only available if numpy is installed.
+try:
+    from .arrays import (
+        AreaArray,
+        ElectricCurrentArray,
+        LengthArray,
+        MassArray,
+        TimeArray,
+        VolumeArray,
+    )
+except ImportError:
+    _array_types = {}
+else:
+    _array_types = {
+        'Area': AreaArray,
+        'ElectricCurrent': ElectricCurrentArray,
+        'Length': LengthArray,
+        'Mass': MassArray,
+        'Time': TimeArray,
+        'Volume': VolumeArray,
+    }
+
+# Maps the quantity and array types to the name of their quantity
+_quantity_names = {
+    quantity_type: quantity_name
+    for types in (_quantity_types, _array_types)
+    for quantity_name, quantity_type in types.items()}
+
+
+def default(obj) -> dict:
+    """Encodes quantities and quantity arrays for json.dump(default=...)."""
+    quantity_name = _quantity_names.get(type(obj))
+    if quantity_name is None:
+        raise TypeError(
+            'Object of type {0} is not JSON serializable'.format(
+                type(obj).__name__))
+
+    if type(obj) is _array_types.get(quantity_name):
+        return {
+            'quantity': quantity_name,
+            'values': obj.values.tolist(),
+            'unit': obj.unit.name,
+        }
+
+    return {
+        'quantity': quantity_name,
+        'value': obj.value,
+        'unit': obj.unit.name,
+    }
+
+
+def object_hook(obj: dict):
+    """Decodes the objects written by default for json.load(object_hook=...).
+
+    Other objects are returned unchanged. The unit is either the name of a
+    unit or a symbol like "km". Arrays are decoded to lists of quantities if
+    numpy is not installed.
+    """
+    if len(obj) != 3 or 'quantity' not in obj or 'unit' not in obj:
+        return obj
+
+    quantity_type = _quantity_types.get(obj['quantity'])
+    if quantity_type is None:
+        return obj
+
+    if 'value' in obj:
+        return quantity_type(obj['value'], _get_unit(quantity_type, obj['unit']))
+
+    if 'values' in obj:
+        unit = _get_unit(quantity_type, obj['unit'])
+        array_type = _array_types.get(obj['quantity'])
+        if array_type is None:
+            return [quantity_type(value, unit) for value in obj['values']]
+
+        return array_type(obj['values'], unit)
+
+    return obj
+
+
+class QuantityEncoder(json.JSONEncoder):
+    def default(self, o):
+        try:
+            return default(o)
+        except TypeError:
+            return super().default(o)
+
+
+_ENCODER = QuantityEncoder()
+
+
+def iterencode(obj, chunk_size: int = 65536):
+    """Encodes obj like json.dumps(obj, cls=QuantityEncoder) in parts.
+
+    Quantity arrays are encoded chunk_size values at a time. Iterators, like
+    generators of quantities, are encoded as lists chunk_size items at a
+    time, so they are never held in memory as a whole.
+    """
+    if type(obj) in _array_types.values():
+        yield from _iterencode_array(obj, chunk_size)
+    elif isinstance(obj, collections.abc.Iterator):
+        yield from _iterencode_iterator(obj, chunk_size)
+    else:
+        yield from _ENCODER.iterencode(obj)
+
+
+def dump(obj, file, chunk_size: int = 65536) -> None:
+    """Writes the parts of iterencode to a text file object."""
+    for part in iterencode(obj, chunk_size):
+        file.write(part)
+
+
+def _iterencode_array(array, chunk_size: int):
+    yield '{"quantity": ' + json.dumps(_quantity_names[type(array)])
+    yield ', "values": ['
+
+    for start in range(0, len(array), chunk_size):
+        if start:
+            yield ', '
+        # Drop the brackets of the encoded chunk.
+        yield json.dumps(array.values[start:start + chunk_size].tolist())[1:-1]
+
+    yield '], "unit": ' + json.dumps(array.unit.name) + '}'
+
+
+def _iterencode_iterator(iterator, chunk_size: int):
+    yield '['
+
+    chunk = list(itertools.islice(iterator, chunk_size))
+    while chunk:
+        yield _ENCODER.encode(chunk)[1:-1]
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if chunk:
+            yield ', '
+
+    yield ']'
+
+
+def _get_unit(quantity_type: type, unit_name: str):
+    unit_type = type(quantity_type.base_unit)
+    try:
+        return unit_type[unit_name]
+    except KeyError:
+        pass
+
+    unit = lookup_unit(
+        quantity_type.units_by_symbol, quantity_type.units_by_name, unit_name)
+    if unit is None:
+        raise ValueError('Unknown {0} unit "{1}".'.format(
+            quantity_type.__name__, unit_name))
+
+    return unit
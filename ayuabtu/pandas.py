@@ -0,0 +1,532 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""pandas extension types for columns of quantities.
+
+Importing this module registers a dtype per quantity, named like
+"ayuabtu[Length:m]". The columns are backed by quantity arrays, so
+conversions, reductions and arithmetics run on float arrays instead of
+one quantity object per row. Requires pandas and numpy.
+"""
+import numbers
+import operator
+import re
+
+import numpy
+import pandas
+from pandas.api.extensions import (
+    ExtensionArray, ExtensionDtype, register_extension_dtype, take)
+from pandas.api.indexers import check_array_indexer
+
+from .arrays import (
+    AreaArray,
+    ElectricCurrentArray,
+    LengthArray,
+    MassArray,
+    TimeArray,
+    VolumeArray,
+)
+from .parsing import lookup_unit
+from .quantities import (
+    Area,
+    ElectricCurrent,
+    Length,
+    Mass,
+    Time,
+    Volume,
+)
+
+_DTYPE_PATTERN = re.compile(r'^ayuabtu\[(\w+)(?::(.+))?\]$')
+
+# Reductions which keep the unit of the values
+_REDUCTIONS = {
+    'sum': numpy.sum,
+    'min': numpy.min,
+    'max': numpy.max,
+    'mean': numpy.mean,
+    'median': numpy.median,
+    'std': numpy.std,
+}
+# Maps accumulations to their ufunc and its identity for skipping nans
+_ACCUMULATIONS = {
+    'cumsum': (numpy.add, 0.0),
+    'cummin': (numpy.minimum, numpy.inf),
+    'cummax': (numpy.maximum, -numpy.inf),
+}
+# Group by operations which keep the unit of the values. min and max map
+# to their ufunc and its identity.
+_GROUPBY_OPERATIONS = {
+    'sum': None,
+    'mean': None,
+    'std': None,
+    'min': (numpy.minimum, numpy.inf),
+    'max': (numpy.maximum, -numpy.inf),
+}
+
+
+class QuantityDtype(ExtensionDtype):
+    """Holds the quantity and the unit of a column.
+
+    The subclasses of the quantities are created from strings like
+    "ayuabtu[Length:ft]". The unit defaults to the base unit.
+    """
+    quantity_type = None
+    array_type = None
+
+    _metadata = ('unit',)
+    na_value = numpy.nan
+
+    def __init__(self, unit=None) -> None:
+        if unit is None:
+            unit = self.quantity_type.base_unit
+        self._unit = unit
+
+    def __repr__(self):
+        return self.name
+
+    @property
+    def unit(self):
+        return self._unit
+
+    @property
+    def type(self) -> type:
+        return self.quantity_type
+
+    @property
+    def name(self) -> str:
+        quantity_type = self.quantity_type
+        symbol = quantity_type.abbreviations[self._unit]
+        # Use the unit name for symbols which are shared by several units.
+        unit = lookup_unit(
+            quantity_type.units_by_symbol, quantity_type.units_by_name, symbol)
+        if unit is not self._unit:
+            symbol = self._unit.name
+
+        return 'ayuabtu[{0}:{1}]'.format(quantity_type.__name__, symbol)
+
+    @property
+    def _is_numeric(self) -> bool:
+        return True
+
+    @classmethod
+    def construct_array_type(cls) -> type:
+        return QuantityExtensionArray
+
+    def _get_common_dtype(self, dtypes):
+        # Columns of the same quantity are converted to the first unit.
+        if all(type(dtype) is type(self) for dtype in dtypes):
+            return self
+
+        return None
+
+    @classmethod
+    def construct_from_string(cls, string: str) -> 'QuantityDtype':
+        if not isinstance(string, str):
+            raise TypeError(
+                'Expected a string, got {0}.'.format(type(string).__name__))
+
+        match = _DTYPE_PATTERN.match(string)
+        if match is None or match.group(1) != cls.quantity_type.__name__:
+            raise TypeError(
+                'Can not construct a {0} from "{1}".'.format(
+                    cls.__name__, string))
+
+        symbol = match.group(2)
+        if symbol is None:
+            return cls()
+
+        unit_type = type(cls.quantity_type.base_unit)
+        unit = lookup_unit(
+            cls.quantity_type.units_by_symbol,
+            cls.quantity_type.units_by_name,
+            symbol)
+        if unit is None and symbol in unit_type.__members__:
+            unit = unit_type[symbol]
+        if unit is None:
+            raise TypeError('Unknown {0} unit "{1}".'.format(
+                cls.quantity_type.__name__, symbol))
+
+        return cls(unit)
+
+
+@register_extension_dtype
+class AreaDtype(QuantityDtype):
+    quantity_type = Area
+    array_type = AreaArray
+
+
+@register_extension_dtype
+class ElectricCurrentDtype(QuantityDtype):
+    quantity_type = ElectricCurrent
+    array_type = ElectricCurrentArray
+
+
+@register_extension_dtype
+class LengthDtype(QuantityDtype):
+    quantity_type = Length
+    array_type = LengthArray
+
+
+@register_extension_dtype
+class MassDtype(QuantityDtype):
+    quantity_type = Mass
+    array_type = MassArray
+
+
+@register_extension_dtype
+class TimeDtype(QuantityDtype):
+    quantity_type = Time
+    array_type = TimeArray
+
+
+@register_extension_dtype
+class VolumeDtype(QuantityDtype):
+    quantity_type = Volume
+    array_type = VolumeArray
+
+
+_dtypes_by_array_type = {
+    AreaArray: AreaDtype,
+    ElectricCurrentArray: ElectricCurrentDtype,
+    LengthArray: LengthDtype,
+    MassArray: MassDtype,
+    TimeArray: TimeDtype,
+    VolumeArray: VolumeDtype,
+}
+_dtypes_by_quantity_type = {
+    dtype.quantity_type: dtype for dtype in _dtypes_by_array_type.values()}
+
+
+class QuantityExtensionArray(ExtensionArray):
+    """A pandas extension array backed by a quantity array."""
+
+    def __init__(self, array) -> None:
+        self._array = array
+        self._dtype = _dtypes_by_array_type[type(array)](array.unit)
+
+    @property
+    def quantity_array(self):
+        return self._array
+
+    @property
+    def dtype(self) -> QuantityDtype:
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._array.values.nbytes
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(dtype, str):
+            dtype = pandas.api.types.pandas_dtype(dtype)
+
+        array = _to_quantity_array(scalars, dtype)
+        if copy:
+            array = type(array)(array.values.copy(), array.unit)
+
+        return cls(array)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls(original.dtype.array_type(values, original.dtype.unit))
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        unit = to_concat[0].dtype.unit
+        values = numpy.concatenate(
+            [array.quantity_array.as_unit(unit) for array in to_concat])
+
+        return cls(to_concat[0].dtype.array_type(values, unit))
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, item):
+        if not isinstance(item, (numbers.Integral, slice, tuple)):
+            item = check_array_indexer(self, item)
+
+        values = self._array.values[item]
+        if numpy.ndim(values) == 0:
+            if numpy.isnan(values):
+                return self._dtype.na_value
+
+            return self._dtype.quantity_type(float(values), self._dtype.unit)
+
+        return type(self)(self._dtype.array_type(values, self._dtype.unit))
+
+    def __setitem__(self, key, value) -> None:
+        if not isinstance(key, (numbers.Integral, slice, tuple)):
+            key = check_array_indexer(self, key)
+
+        if pandas.api.types.is_list_like(value):
+            value = _to_quantity_array(value, self._dtype).values
+        else:
+            value = _to_value(value, self._dtype)
+
+        self._array.values[key] = value
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        if dtype is not None and numpy.dtype(dtype).kind == 'f':
+            return self._array.values.astype(dtype)
+
+        return numpy.array(
+            [self[index] for index in range(len(self))], dtype=object)
+
+    def isna(self) -> numpy.ndarray:
+        return numpy.isnan(self._array.values)
+
+    def take(self, indices, allow_fill: bool = False, fill_value=None):
+        if allow_fill:
+            fill_value = _to_value(fill_value, self._dtype)
+
+        values = take(
+            self._array.values,
+            indices,
+            allow_fill=allow_fill,
+            fill_value=fill_value)
+
+        return type(self)(self._dtype.array_type(values, self._dtype.unit))
+
+    def copy(self) -> 'QuantityExtensionArray':
+        return type(self)(self._dtype.array_type(
+            self._array.values.copy(), self._dtype.unit))
+
+    def astype(self, dtype, copy: bool = True):
+        dtype = pandas.api.types.pandas_dtype(dtype)
+        if isinstance(dtype, QuantityDtype):
+            if dtype.array_type is not self._dtype.array_type:
+                raise TypeError('Can not convert {0} to {1}.'.format(
+                    self._dtype, dtype))
+            if dtype == self._dtype and not copy:
+                return self
+
+            return type(self)(self._array.to_unit(dtype.unit))
+
+        if dtype.kind == 'f':
+            if isinstance(dtype, numpy.dtype):
+                return self._array.values.astype(dtype, copy=copy)
+
+            # Extension dtypes like "Float64" can not be created from the
+            # quantities, only from their values.
+            return pandas.array(self._array.values, dtype=dtype)
+
+        return super().astype(dtype, copy=copy)
+
+    def _values_for_factorize(self):
+        return self._array.values, numpy.nan
+
+    def _values_for_argsort(self) -> numpy.ndarray:
+        return self._array.values
+
+    def _reduce(
+            self,
+            name: str,
+            *,
+            skipna: bool = True,
+            keepdims: bool = False,
+            **kwargs):
+        if name not in _REDUCTIONS:
+            return super()._reduce(
+                name, skipna=skipna, keepdims=keepdims, **kwargs)
+
+        values = self._array.values
+        if skipna:
+            values = values[~numpy.isnan(values)]
+
+        if name == 'std':
+            result = numpy.std(values, ddof=kwargs.get('ddof', 1))
+        elif len(values) or name == 'sum':
+            result = _REDUCTIONS[name](values)
+        else:
+            result = numpy.nan
+
+        if keepdims:
+            return type(self)(self._dtype.array_type([result], self._dtype.unit))
+        if numpy.isnan(result):
+            return self._dtype.na_value
+
+        return self._dtype.quantity_type(float(result), self._dtype.unit)
+
+    def _accumulate(self, name: str, *, skipna: bool = True, **kwargs):
+        if name not in _ACCUMULATIONS:
+            return super()._accumulate(name, skipna=skipna, **kwargs)
+
+        ufunc, identity = _ACCUMULATIONS[name]
+        values = self._array.values
+        missing = numpy.isnan(values)
+        if skipna:
+            values = numpy.where(missing, identity, values)
+
+        values = ufunc.accumulate(values)
+        if skipna:
+            values[missing] = numpy.nan
+
+        return type(self)(self._dtype.array_type(values, self._dtype.unit))
+
+    def _groupby_op(
+            self,
+            *,
+            how: str,
+            has_dropped_na: bool,
+            min_count: int,
+            ngroups: int,
+            ids: numpy.ndarray,
+            **kwargs):
+        if how not in _GROUPBY_OPERATIONS:
+            # Like first, last and median, which pandas computes from the
+            # sorted values.
+            return super()._groupby_op(
+                how=how,
+                has_dropped_na=has_dropped_na,
+                min_count=min_count,
+                ngroups=ngroups,
+                ids=ids,
+                **kwargs)
+
+        # Rows with a missing key have the id -1; missing values are skipped.
+        values = self._array.values
+        valid = (ids >= 0) & ~numpy.isnan(values)
+        group_ids = ids[valid]
+        group_values = values[valid]
+        counts = numpy.bincount(group_ids, minlength=ngroups)
+        sums = numpy.bincount(group_ids, group_values, minlength=ngroups)
+
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            if how == 'sum':
+                result = sums
+            elif how == 'mean':
+                result = sums / counts
+            elif how == 'std':
+                ddof = kwargs.get('ddof', 1)
+                squares = numpy.bincount(
+                    group_ids,
+                    (group_values - (sums / counts)[group_ids]) ** 2,
+                    minlength=ngroups)
+                result = numpy.sqrt(squares / (counts - ddof))
+                result[counts <= ddof] = numpy.nan
+            else:
+                ufunc, identity = _GROUPBY_OPERATIONS[how]
+                result = numpy.full(ngroups, identity)
+                ufunc.at(result, group_ids, group_values)
+
+        # Empty groups only have a sum.
+        result[counts < max(min_count, 0 if how == 'sum' else 1)] = numpy.nan
+
+        return type(self)(self._dtype.array_type(result, self._dtype.unit))
+
+    # Arithmetic operators
+    def __neg__(self):
+        return type(self)(-self._array)
+
+    def __add__(self, other):
+        return self._apply_operator(operator.add, other)
+
+    def __sub__(self, other):
+        return self._apply_operator(operator.sub, other)
+
+    def __mul__(self, other):
+        return self._apply_operator(operator.mul, other)
+
+    def __rmul__(self, other):
+        return self._apply_operator(operator.mul, other, reflected=True)
+
+    def __truediv__(self, other):
+        return self._apply_operator(operator.truediv, other)
+
+    def __pow__(self, other):
+        return self._apply_operator(operator.pow, other)
+
+    # Comparison operators
+    def __eq__(self, other):
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other):
+        return self._compare(operator.ne, other)
+
+    def __lt__(self, other):
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other):
+        return self._compare(operator.le, other)
+
+    def __gt__(self, other):
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other):
+        return self._compare(operator.ge, other)
+
+    def _apply_operator(self, function, other, reflected: bool = False):
+        if isinstance(other, (pandas.Series, pandas.Index, pandas.DataFrame)):
+            return NotImplemented
+        if isinstance(other, QuantityExtensionArray):
+            other = other.quantity_array
+
+        if reflected:
+            result = function(other, self._array)
+        else:
+            result = function(self._array, other)
+
+        if type(result) in _dtypes_by_array_type:
+            return type(self)(result)
+
+        return result
+
+    def _compare(self, function, other):
+        if isinstance(other, (pandas.Series, pandas.Index, pandas.DataFrame)):
+            return NotImplemented
+        if isinstance(other, QuantityExtensionArray):
+            other = other.quantity_array
+
+        if type(other) not in (self._dtype.quantity_type, self._dtype.array_type):
+            if function in (operator.eq, operator.ne):
+                return numpy.full(len(self), function is operator.ne)
+
+            raise TypeError('Can not compare {0} with {1}.'.format(
+                self._dtype, type(other).__name__))
+
+        return function(self._array.values, other.as_unit(self._dtype.unit))
+
+
+def _to_quantity_array(values, dtype: QuantityDtype):
+    if isinstance(values, QuantityExtensionArray):
+        values = values.quantity_array
+    if isinstance(values, pandas.Series):
+        values = values.array
+        if isinstance(values, QuantityExtensionArray):
+            values = values.quantity_array
+
+    if type(values) in _dtypes_by_array_type:
+        if dtype is None or values.unit is dtype.unit:
+            return values
+
+        return values.to_unit(dtype.unit)
+
+    values = numpy.asarray(values)
+    if values.dtype.kind in 'iuf':
+        if dtype is None:
+            raise TypeError('Can not create quantities without a dtype.')
+
+        return dtype.array_type(values, dtype.unit)
+
+    if dtype is None:
+        first_value = next(
+            (value for value in values if not pandas.isna(value)), None)
+        if type(first_value) not in _dtypes_by_quantity_type:
+            raise TypeError('Can not infer the quantity of the values.')
+        dtype = _dtypes_by_quantity_type[type(first_value)](first_value.unit)
+
+    return dtype.array_type(
+        [_to_value(value, dtype) for value in values], dtype.unit)
+
+
+def _to_value(value, dtype: QuantityDtype) -> float:
+    if type(value) is dtype.quantity_type:
+        return value.as_unit(dtype.unit)
+    if value is None or pandas.isna(value):
+        return numpy.nan
+    # Plain numbers are given in the unit of the column.
+    if isinstance(value, numbers.Real):
+        return float(value)
+
+    raise TypeError('Can not store {0} in a column of {1}.'.format(
+        type(value).__name__, dtype))
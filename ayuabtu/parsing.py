@@ -0,0 +1,133 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import functools
+import re
+from typing import List, Optional, Tuple
+
+_NUMBER = r'([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)'
+_QUANTITY_PATTERN = re.compile(
+    r'\s*' + _NUMBER + r'\s*(\S(?:.*\S)?)\s*$')
+# Matches one quantity per line of a multi-line string
+_QUANTITY_LINE_PATTERN = re.compile(
+    r'^[^\S\n]*' + _NUMBER + r'[^\S\n]*(\S(?:.*\S)?)[^\S\n]*$',
+    re.MULTILINE)
+
+# Maps every symbol which is unique across all quantities to its quantity
+# type and unit. The table is populated on first use because the quantity
+# modules import this one.
+_quantities_by_symbol = {}
+# Like _quantities_by_symbol, but for the lowercase unit names
+_quantities_by_name = {}
+
+
+def split(text: str) -> Tuple[float, str]:
+    match = _QUANTITY_PATTERN.match(text)
+    if match is None:
+        raise ValueError(
+            'Can not parse "{0}" as a quantity.'.format(text))
+
+    return float(match.group(1)), match.group(2)
+
+
+def split_many(texts: List[str]) -> Tuple[List[str], List[str]]:
+    """Splits all texts into numbers and symbols with a single regex pass.
+
+    The numbers are returned as strings, so they can be converted in bulk.
+    """
+    if not texts:
+        return [], []
+
+    joined = '\n'.join(texts)
+    matches = _QUANTITY_LINE_PATTERN.findall(joined)
+
+    if (len(matches) != len(texts)
+            or joined.count('\n') != len(texts) - 1):
+        # Parse one by one to report the first text which is invalid.
+        for text in texts:
+            split(text)
+
+        raise ValueError('Can not parse texts containing line breaks.')
+
+    numbers, symbols = zip(*matches)
+
+    return list(numbers), list(symbols)
+
+
+@functools.lru_cache(maxsize=256)
+def split_format_spec(format_spec: str) -> Tuple[str, Optional[str]]:
+    """Splits a spec like ".3f~km" into the spec of the value and a symbol.
+
+    The symbol is None if the spec does not select a unit.
+    """
+    value_spec, separator, symbol = format_spec.partition('~')
+    if separator and not symbol:
+        raise ValueError(
+            'Missing unit in format specifier "{0}".'.format(format_spec))
+
+    return value_spec, symbol or None
+
+
+def lookup_unit(units_by_symbol: dict, units_by_name: dict, symbol: str):
+    try:
+        return units_by_symbol[symbol]
+    except KeyError:
+        # Only the names ignore the case, abbreviations like "Mg" and "mg"
+        # differ in their case alone.
+        return units_by_name.get(symbol.lower())
+
+
+def lookup_symbol(symbol: str):
+    """Returns the quantity type and the unit of a symbol or None."""
+    if not _quantities_by_symbol:
+        _load_quantities_by_symbol()
+
+    return lookup_unit(_quantities_by_symbol, _quantities_by_name, symbol)
+
+
+def parse(text: str):
+    value, symbol = split(text)
+    entry = lookup_symbol(symbol)
+    if entry is None:
+        raise ValueError('Unknown unit "{0}" in "{1}".'.format(symbol, text))
+
+    quantity_type, unit = entry
+
+    return quantity_type(value, unit)
+
+
+def _load_quantities_by_symbol() -> None:
+    from .quantities import (
+        Area,
+        ElectricCurrent,
+        Length,
+        Mass,
+        Time,
+        Volume,
+    )
+
+    quantity_types = (
+        Area,
+        ElectricCurrent,
+        Length,
+        Mass,
+        Time,
+        Volume,
+    )
+    _quantities_by_symbol.update(
+        _merge_tables(quantity_types, 'units_by_symbol'))
+    _quantities_by_name.update(
+        _merge_tables(quantity_types, 'units_by_name'))
+
+
+def _merge_tables(quantity_types: tuple, table_name: str) -> dict:
+    # Keeps the symbols which are unique across all quantities.
+    entries_by_symbol = {}
+    for quantity_type in quantity_types:
+        for symbol, unit in getattr(quantity_type, table_name).items():
+            entries_by_symbol.setdefault(symbol, []).append(
+                (quantity_type, unit))
+
+    return {
+        symbol: entries[0]
+        for symbol, entries in entries_by_symbol.items()
+        if len(entries) == 1}
@@ -1,6 +1,11 @@
-from .length import Length
+from .area import Area
 from .electricCurrent import ElectricCurrent
-from .time import Time
+from .length import Length
 from .mass import Mass
-from .area import Area
+from .time import Time
 from .volume import Volume
+
+# Registers the arithmetic operators of the classes above.
+from . import operators  # noqa: F401
+# Resolves the remaining operators by the dimensions of the quantities.
+from .. import dimensions  # noqa: F401
@@ -1,10 +1,21 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+import bisect
+import functools
+import math
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split, split_format_spec
+from ..serialization import QUANTITY_FORMAT, unpack_quantity
 from ..units import AreaUnit
 
 
 class Area:
+    # Identifies the quantity in the binary format
+    type_code = 1
     base_unit = AreaUnit.SQUAREMETER
+    # Exponents of ayuabtu.dimensions.BASE_DIMENSIONS
+    dimension = (0, 2, 0, 0)
     factors = {
         AreaUnit.SQUAREKILOMETER: 1e6,
         AreaUnit.HECTARE: 1e4,
@@ -33,22 +44,276 @@ class Area:
         AreaUnit.SQUAREMILE: 'mi²',
         AreaUnit.ACRE: 'ac',
     }
+    # The tables by unit.code, for the operations which would otherwise
+    # hash the unit.
+    units_by_code = tuple(AreaUnit)
+    factors_by_code = (
+        1e6,  # SQUAREKILOMETER
+        1e4,  # HECTARE
+        1,  # SQUAREMETER
+        1e-2,  # SQUAREDECIMETER
+        1e-4,  # SQUARECENTIMETER
+        1e-6,  # SQUAREMILLIMETER
+        1e-12,  # SQUAREMICROMETER
+        6.4516e-4,  # SQUAREINCH
+        9.2903e-2,  # SQUAREFOOT
+        8.36127e-1,  # SQUAREYARD
+        2.59e6,  # SQUAREMILE
+        4046.85642,  # ACRE
+    )
+    abbreviations_by_code = (
+        'km²',  # SQUAREKILOMETER
+        'ha',  # HECTARE
+        'm²',  # SQUAREMETER
+        'dm²',  # SQUAREDECIMETER
+        'cm²',  # SQUARECENTIMETER
+        'mm²',  # SQUAREMILLIMETER
+        'μm²',  # SQUAREMICROMETER
+        'in²',  # SQUAREINCH
+        'ft²',  # SQUAREFOOT
+        'yd²',  # SQUAREYARD
+        'mi²',  # SQUAREMILE
+        'ac',  # ACRE
+    )
+    # Maps abbreviations and unit names to units for parsing
+    units_by_symbol = {
+        'km²': AreaUnit.SQUAREKILOMETER,
+        'square kilometer': AreaUnit.SQUAREKILOMETER,
+        'square kilometers': AreaUnit.SQUAREKILOMETER,
+        'ha': AreaUnit.HECTARE,
+        'hectare': AreaUnit.HECTARE,
+        'hectares': AreaUnit.HECTARE,
+        'm²': AreaUnit.SQUAREMETER,
+        'square meter': AreaUnit.SQUAREMETER,
+        'square meters': AreaUnit.SQUAREMETER,
+        'dm²': AreaUnit.SQUAREDECIMETER,
+        'square decimeter': AreaUnit.SQUAREDECIMETER,
+        'square decimeters': AreaUnit.SQUAREDECIMETER,
+        'cm²': AreaUnit.SQUARECENTIMETER,
+        'square centimeter': AreaUnit.SQUARECENTIMETER,
+        'square centimeters': AreaUnit.SQUARECENTIMETER,
+        'mm²': AreaUnit.SQUAREMILLIMETER,
+        'square millimeter': AreaUnit.SQUAREMILLIMETER,
+        'square millimeters': AreaUnit.SQUAREMILLIMETER,
+        'square micrometer': AreaUnit.SQUAREMICROMETER,
+        'square micrometers': AreaUnit.SQUAREMICROMETER,
+        'µm²': AreaUnit.SQUAREMICROMETER,
+        'μm²': AreaUnit.SQUAREMICROMETER,
+        'in²': AreaUnit.SQUAREINCH,
+        'square inch': AreaUnit.SQUAREINCH,
+        'square inchs': AreaUnit.SQUAREINCH,
+        'ft²': AreaUnit.SQUAREFOOT,
+        'square foot': AreaUnit.SQUAREFOOT,
+        'square foots': AreaUnit.SQUAREFOOT,
+        'square yard': AreaUnit.SQUAREYARD,
+        'square yards': AreaUnit.SQUAREYARD,
+        'yd²': AreaUnit.SQUAREYARD,
+        'mi²': AreaUnit.SQUAREMILE,
+        'square mile': AreaUnit.SQUAREMILE,
+        'square miles': AreaUnit.SQUAREMILE,
+        'ac': AreaUnit.ACRE,
+        'acre': AreaUnit.ACRE,
+        'acres': AreaUnit.ACRE,
+    }
+    # Maps the lowercase unit names to units for case-insensitive parsing
+    units_by_name = {
+        'square kilometer': AreaUnit.SQUAREKILOMETER,
+        'square kilometers': AreaUnit.SQUAREKILOMETER,
+        'hectare': AreaUnit.HECTARE,
+        'hectares': AreaUnit.HECTARE,
+        'square meter': AreaUnit.SQUAREMETER,
+        'square meters': AreaUnit.SQUAREMETER,
+        'square decimeter': AreaUnit.SQUAREDECIMETER,
+        'square decimeters': AreaUnit.SQUAREDECIMETER,
+        'square centimeter': AreaUnit.SQUARECENTIMETER,
+        'square centimeters': AreaUnit.SQUARECENTIMETER,
+        'square millimeter': AreaUnit.SQUAREMILLIMETER,
+        'square millimeters': AreaUnit.SQUAREMILLIMETER,
+        'square micrometer': AreaUnit.SQUAREMICROMETER,
+        'square micrometers': AreaUnit.SQUAREMICROMETER,
+        'square inch': AreaUnit.SQUAREINCH,
+        'square inchs': AreaUnit.SQUAREINCH,
+        'square foot': AreaUnit.SQUAREFOOT,
+        'square foots': AreaUnit.SQUAREFOOT,
+        'square yard': AreaUnit.SQUAREYARD,
+        'square yards': AreaUnit.SQUAREYARD,
+        'square mile': AreaUnit.SQUAREMILE,
+        'square miles': AreaUnit.SQUAREMILE,
+        'acre': AreaUnit.ACRE,
+        'acres': AreaUnit.ACRE,
+    }
+    # conversion_factors[from_unit.code][to_unit.code] is the factor that
+    # converts a value given in from_unit into to_unit.
+    conversion_factors = (
+        # SQUAREKILOMETER
+        (1.0, 100.0, 1000000.0, 100000000.0, 10000000000.0, 1000000000000.0,
+         1e+18, 1550003100.0062, 10763915.051182415, 1195990.5612424908,
+         0.3861003861003861, 247.1053816137119),
+        # HECTARE
+        (0.01, 1.0, 10000.0, 1000000.0, 100000000.0, 10000000000.0, 1e+16,
+         15500031.000062, 107639.15051182416, 11959.905612424907,
+         0.003861003861003861, 2.471053816137119),
+        # SQUAREMETER
+        (1e-06, 0.0001, 1.0, 100.0, 10000.0, 1000000.0, 1000000000000.0,
+         1550.0031000062, 10.763915051182416, 1.1959905612424906,
+         3.861003861003861e-07, 0.0002471053816137119),
+        # SQUAREDECIMETER
+        (1e-08, 1e-06, 0.01, 1.0, 100.0, 10000.0, 10000000000.0,
+         15.500031000062, 0.10763915051182416, 0.011959905612424908,
+         3.861003861003861e-09, 2.471053816137119e-06),
+        # SQUARECENTIMETER
+        (1e-10, 1e-08, 0.0001, 0.01, 1.0, 100.0, 100000000.0,
+         0.15500031000062, 0.0010763915051182416, 0.00011959905612424907,
+         3.861003861003861e-11, 2.4710538161371192e-08),
+        # SQUAREMILLIMETER
+        (1e-12, 1e-10, 1e-06, 0.0001, 0.01, 1.0, 1000000.0,
+         0.0015500031000062, 1.0763915051182416e-05, 1.1959905612424907e-06,
+         3.861003861003861e-13, 2.471053816137119e-10),
+        # SQUAREMICROMETER
+        (1e-18, 1e-16, 1e-12, 1e-10, 1e-08, 1e-06, 1.0,
+         1.5500031000062001e-09, 1.0763915051182416e-11,
+         1.1959905612424907e-12, 3.861003861003861e-19,
+         2.471053816137119e-16),
+        # SQUAREINCH
+        (6.4516e-10, 6.4516e-08, 0.00064516, 0.064516, 6.4516, 645.16,
+         645160000.0, 1.0, 0.006944447434420848, 0.0007716052704912052,
+         2.490965250965251e-10, 1.5942250800190238e-07),
+        # SQUAREFOOT
+        (9.2903e-08, 9.2903e-06, 0.092903, 9.2903, 929.03, 92903.0,
+         92903000000.0, 143.999937999876, 1.0, 0.1111111111111111,
+         3.586988416988417e-08, 2.295683126805868e-05),
+        # SQUAREYARD
+        (8.36127e-07, 8.36127e-05, 0.836127, 83.6127, 8361.27, 836127.0,
+         836127000000.0, 1295.999441998884, 9.0, 1.0,
+         3.2282895752895753e-07, 0.0002066114814125281),
+        # SQUAREMILE
+        (2.59, 259.0, 2590000.0, 259000000.0, 25900000000.0,
+         2590000000000.0, 2.59e+18, 4014508029.016058, 27878539.982562456,
+         3097615.5536180506, 1.0, 640.0029383795138),
+        # ACRE
+        (0.00404685642, 0.404685642, 4046.85642, 404685.642, 40468564.2,
+         4046856420.0, 4046856420000000.0, 6272639.996279992,
+         43560.01872921219, 4840.0020810235765, 0.0015624928262548262, 1.0),
+    )
+    # Maps a unit system to the factors of its units in ascending order and
+    # the units themselves. The None entry holds all units.
+    units_by_factor = {
+        None: (
+            (1e-12, 1e-06, 0.0001, 0.00064516, 0.01, 0.092903, 0.836127,
+             1.0, 4046.85642, 10000.0, 1000000.0, 2590000.0),
+            (
+                AreaUnit.SQUAREMICROMETER,
+                AreaUnit.SQUAREMILLIMETER,
+                AreaUnit.SQUARECENTIMETER,
+                AreaUnit.SQUAREINCH,
+                AreaUnit.SQUAREDECIMETER,
+                AreaUnit.SQUAREFOOT,
+                AreaUnit.SQUAREYARD,
+                AreaUnit.SQUAREMETER,
+                AreaUnit.ACRE,
+                AreaUnit.HECTARE,
+                AreaUnit.SQUAREKILOMETER,
+                AreaUnit.SQUAREMILE,
+            )),
+        'astronomical': (
+            (),
+            (
+            )),
+        'imperial': (
+            (0.00064516, 0.092903, 0.836127, 4046.85642, 2590000.0),
+            (
+                AreaUnit.SQUAREINCH,
+                AreaUnit.SQUAREFOOT,
+                AreaUnit.SQUAREYARD,
+                AreaUnit.ACRE,
+                AreaUnit.SQUAREMILE,
+            )),
+        'metric': (
+            (1e-12, 1e-06, 0.0001, 0.01, 1.0, 10000.0, 1000000.0),
+            (
+                AreaUnit.SQUAREMICROMETER,
+                AreaUnit.SQUAREMILLIMETER,
+                AreaUnit.SQUARECENTIMETER,
+                AreaUnit.SQUAREDECIMETER,
+                AreaUnit.SQUAREMETER,
+                AreaUnit.HECTARE,
+                AreaUnit.SQUAREKILOMETER,
+            )),
+    }
+
+    # Instances are read-only through the public interface, so there is no
+    # need for a per-instance __dict__.
+    __slots__ = ('_value', '_unit')
 
     def __init__(self, value: float, unit: 'AreaUnit') -> None:
+        if type(unit) is not AreaUnit:
+            raise TypeError('{0} is not a AreaUnit.'.format(unit))
+
         self._value = value
         self._unit = unit
 
     def __str__(self):
-        return "{value} {unit}".format(
-            value=str(self._value),
-            unit=Area.abbreviations[self._unit])
+        return '{0} {1}'.format(
+            self._value, Area.abbreviations_by_code[self._unit.code])
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # Pickles the unit as its value instead of a reference to the enum
+        # member.
+        return _from_unit_code, (self._value, self._unit.code)
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the quantity with a spec like ".3f~km".
+
+        The part before "~" formats the value, the optional part after it
+        selects the unit to convert to.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = Area._get_unit(symbol)
 
-    def __repr__(self):
-        return str(self)
+        return '{0} {1}'.format(
+            format(self.as_unit(unit), value_spec),
+            Area.abbreviations[unit])
 
     # Comparison operators
+    # All comparisons and the hash use the value in the base unit, so equal
+    # quantities given in different units hash equally.
     def __eq__(self, other):
-        return self._value == other.as_unit(self._unit)
+        if type(other) is not Area:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() == other._get_value_in_base_unit()
+
+    def __lt__(self, other):
+        if type(other) is not Area:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() < other._get_value_in_base_unit()
+
+    def __le__(self, other):
+        if type(other) is not Area:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() <= other._get_value_in_base_unit()
+
+    def __gt__(self, other):
+        if type(other) is not Area:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() > other._get_value_in_base_unit()
+
+    def __ge__(self, other):
+        if type(other) is not Area:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() >= other._get_value_in_base_unit()
+
+    def __hash__(self):
+        return hash(self._get_value_in_base_unit())
 
     # Unary operators
     def __neg__(self):
@@ -61,6 +326,13 @@ class Area:
 
         self._raise_type_error_for_undefined_operator(other, '+')
 
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
     def __sub__(self, other):
         if type(other) is Area:
             return Area(self._value - other.as_unit(self._unit), self._unit)
@@ -68,55 +340,19 @@ class Area:
         self._raise_type_error_for_undefined_operator(other, '-')
 
     def __mul__(self, other):
-        from .volume import Volume
-        from .length import Length
-
-        if type(other) in (float, int):
-            result = Area(self._value * other, self._unit)
-        elif type(other) is Length:
-            result = Volume(
-                self.as_unit(self.base_unit) * other.as_unit(other.base_unit),
-                Volume.base_unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '*')
-
-        return result
+        return dispatch(self, '*', other)
 
     def __rmul__(self, other):
-        from .volume import Volume
-        from .length import Length
-
-        if type(other) in (float, int, Length):
-            return self * other
-
-        self._raise_type_error_for_undefined_operator(other, '*')
+        return dispatch(other, '*', self)
 
     def __truediv__(self, other):
-        from .length import Length
-
-        if type(other) is Area:
-            result = (self._get_value_in_base_unit()
-                    / other.as_unit(other.base_unit))
-        elif type(other) in (float, int):
-            result = Area(self._value / other, self._unit)
-        elif type(other) is Length:
-            result = Length(
-                self.as_unit(self.base_unit) / other.as_unit(other.base_unit),
-                Length.base_unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '/')
+        return dispatch(self, '/', other)
 
-        return result
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
 
     def __pow__(self, other):
-        if type(other) in (float, int):
-            result = 1
-            for _ in range(other):
-              result *= self
-
-            return result
-        else:
-            self._raise_type_error_for_undefined_operator(other, '**')
+        return power(self, other)
 
     def _raise_type_error_for_undefined_operator(
             self, other, operator: str) -> None:
@@ -126,7 +362,70 @@ class Area:
 
     @staticmethod
     def zero() -> 'Area':
-        return Area(0, Area.base_unit)
+        return _ZERO
+
+    @staticmethod
+    def interned(value: float, unit: AreaUnit) -> 'Area':
+        """Returns a shared Area for values which are created often.
+
+        The quantities of the last 256 distinct values and units are kept.
+        """
+        # 0.0 and -0.0 are equal, so the sign is part of the key.
+        return _interned(math.copysign(1, value), value, unit)
+
+    @staticmethod
+    def interned_cache_info():
+        """Returns the hits and misses of interned like lru_cache."""
+        return _interned.cache_info()
+
+    # Reductions
+    @staticmethod
+    def sum(quantities) -> 'Area':
+        """Sums the quantities with math.fsum in the base unit."""
+        return Area(math.fsum(Area._get_base_values(quantities)), Area.base_unit)
+
+    @staticmethod
+    def mean(quantities) -> 'Area':
+        values = list(Area._get_base_values(quantities))
+        if not values:
+            raise ValueError('mean() arg is an empty iterable')
+
+        return Area(math.fsum(values) / len(values), Area.base_unit)
+
+    @staticmethod
+    def min(quantities) -> 'Area':
+        return Area(min(Area._get_base_values(quantities)), Area.base_unit)
+
+    @staticmethod
+    def max(quantities) -> 'Area':
+        return Area(max(Area._get_base_values(quantities)), Area.base_unit)
+
+    @staticmethod
+    def std(quantities, ddof: int = 0) -> 'Area':
+        """Standard deviation like numpy.std, in the base unit."""
+        values = list(Area._get_base_values(quantities))
+        if len(values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} quantities'.format(ddof))
+
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((value - mean) ** 2 for value in values) / (
+            len(values) - ddof)
+
+        return Area(math.sqrt(variance), Area.base_unit)
+
+    @staticmethod
+    def parse(text: str) -> 'Area':
+        value, symbol = split(text)
+
+        return Area(value, Area._get_unit(symbol))
+
+    @staticmethod
+    def from_bytes(data) -> 'Area':
+        unit, value = unpack_quantity(
+            data, Area.type_code, Area.units_by_code)
+
+        return Area(value, unit)
 
     @property
     def unit(self) -> AreaUnit:
@@ -137,7 +436,7 @@ class Area:
         return self._value
 
     def as_unit(self, unit: AreaUnit) -> float:
-        if unit == self._unit:
+        if unit is self._unit:
             return self._value
 
         return self._get_value_as(unit)
@@ -147,6 +446,67 @@ class Area:
 
         return Area(converted_value, unit)
 
+    @staticmethod
+    def converter(from_unit: AreaUnit, to_unit: AreaUnit):
+        """Returns a function converting values from from_unit to to_unit.
+
+        The function takes a float, a NumPy array or a sequence of floats,
+        which is converted to a list.
+        """
+        if type(from_unit) is not AreaUnit or type(to_unit) is not AreaUnit:
+            raise TypeError('Can only convert between Area units.')
+
+        factor = Area.conversion_factors[from_unit.code][to_unit.code]
+
+        def convert(values):
+            try:
+                return values * factor
+            except TypeError:
+                return [value * factor for value in values]
+
+        return convert
+
+    def to_bytes(self) -> bytes:
+        return QUANTITY_FORMAT.pack(
+            Area.type_code, self._unit.code, self._value)
+
+    def humanize(self, system: str = None) -> 'Area':
+        """Converts to the largest unit which is not larger than the value.
+
+        system restricts the candidates to the units of one unit system,
+        like "metric" or "imperial".
+        """
+        factors, units = Area._get_units_by_factor(system)
+        value = abs(self._get_value_in_base_unit())
+        if not units or value == 0 or not math.isfinite(value):
+            return self
+
+        index = max(bisect.bisect_right(factors, value) - 1, 0)
+
+        return self.to_unit(units[index])
+
+    def isclose(
+            self,
+            other: 'Area',
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        """Like math.isclose, but for quantities in arbitrary units.
+
+        abs_tol is either a Area or a float in the base unit.
+        """
+        if type(other) is not Area:
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Area:
+            abs_tol = abs_tol._get_value_in_base_unit()
+
+        return math.isclose(
+            self._get_value_in_base_unit(),
+            other._get_value_in_base_unit(),
+            rel_tol=rel_tol,
+            abs_tol=abs_tol)
+
     # Generation shorthands
     @staticmethod
     def from_squareKilometers(value: float) -> 'Area':
@@ -245,21 +605,67 @@ class Area:
     def acres(self) -> float:
         return self.as_unit(AreaUnit.ACRE)
 
+    @staticmethod
+    def _get_unit(symbol: str) -> AreaUnit:
+        unit = lookup_unit(
+            Area.units_by_symbol, Area.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Area unit "{0}".'.format(symbol))
+
+        return unit
+
+    @staticmethod
+    def _get_units_by_factor(system: str) -> tuple:
+        try:
+            return Area.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+    @staticmethod
+    def _get_base_values(quantities):
+        # Yields the values of the quantities in the base unit without
+        # creating intermediate quantities.
+        factors = Area.factors_by_code
+        for quantity in quantities:
+            if type(quantity) is not Area:
+                raise TypeError(
+                    'Can not aggregate {0} with Area.'.format(
+                        type(quantity).__name__))
+
+            yield quantity._value * factors[quantity._unit.code]
+
     def _to_base_unit(self) -> 'Area':
         return self.to_unit(self.base_unit)
 
     def _get_value_in_base_unit(self) -> float:
-        try:
-            return self._value * Area.factors[self._unit]
-        except KeyError:
-            raise NotImplementedError(
-                'Can not convert {0} to base units.'.format(self._unit.name))
+        return self._get_value_as(self.base_unit)
 
     def _get_value_as(self, unit: AreaUnit) -> float:
-        base_unit_value = self._get_value_in_base_unit()
-
-        try:
-            return base_unit_value / Area.factors[unit]
-        except KeyError:
+        # Units of other quantities have codes as well.
+        if type(unit) is not AreaUnit:
             raise NotImplementedError(
                 'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        factor = Area.conversion_factors[self._unit.code][unit.code]
+        try:
+            return self._value * factor
+        except TypeError:
+            # Decimal values do not multiply with float factors.
+            return float(self._value) * factor
+
+
+# Quantities are immutable, so all callers can share these instances.
+_ZERO = Area(0, Area.base_unit)
+
+
+# typed keeps 1 and 1.0 apart, so interned values keep the requested type.
+@functools.lru_cache(maxsize=256, typed=True)
+def _interned(
+        sign: float,
+        value: float,
+        unit: AreaUnit) -> Area:
+    return Area(value, unit)
+
+
+def _from_unit_code(value: float, unit_code: int) -> Area:
+    return Area(value, Area.units_by_code[unit_code])
@@ -1,10 +1,21 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+import bisect
+import functools
+import math
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split, split_format_spec
+from ..serialization import QUANTITY_FORMAT, unpack_quantity
 from ..units import ElectricCurrentUnit
 
 
 class ElectricCurrent:
+    # Identifies the quantity in the binary format
+    type_code = 2
     base_unit = ElectricCurrentUnit.AMPERE
+    # Exponents of ayuabtu.dimensions.BASE_DIMENSIONS
+    dimension = (1, 0, 0, 0)
     factors = {
         ElectricCurrentUnit.MEGAAMPERE: 1e6,
         ElectricCurrentUnit.KILOAMPERE: 1e3,
@@ -25,22 +36,225 @@ class ElectricCurrent:
         ElectricCurrentUnit.NANOAMPERE: 'nA',
         ElectricCurrentUnit.PICOAMPERE: 'pA',
     }
+    # The tables by unit.code, for the operations which would otherwise
+    # hash the unit.
+    units_by_code = tuple(ElectricCurrentUnit)
+    factors_by_code = (
+        1e6,  # MEGAAMPERE
+        1e3,  # KILOAMPERE
+        1e0,  # AMPERE
+        1e-2,  # CENTIAMPERE
+        1e-3,  # MILLIAMPERE
+        1e-6,  # MICROAMPERE
+        1e-9,  # NANOAMPERE
+        1e-12,  # PICOAMPERE
+    )
+    abbreviations_by_code = (
+        'MA',  # MEGAAMPERE
+        'kA',  # KILOAMPERE
+        'A',  # AMPERE
+        'cA',  # CENTIAMPERE
+        'mA',  # MILLIAMPERE
+        'μA',  # MICROAMPERE
+        'nA',  # NANOAMPERE
+        'pA',  # PICOAMPERE
+    )
+    # Maps abbreviations and unit names to units for parsing
+    units_by_symbol = {
+        'MA': ElectricCurrentUnit.MEGAAMPERE,
+        'megaampere': ElectricCurrentUnit.MEGAAMPERE,
+        'megaamperes': ElectricCurrentUnit.MEGAAMPERE,
+        'kA': ElectricCurrentUnit.KILOAMPERE,
+        'kiloampere': ElectricCurrentUnit.KILOAMPERE,
+        'kiloamperes': ElectricCurrentUnit.KILOAMPERE,
+        'A': ElectricCurrentUnit.AMPERE,
+        'ampere': ElectricCurrentUnit.AMPERE,
+        'amperes': ElectricCurrentUnit.AMPERE,
+        'cA': ElectricCurrentUnit.CENTIAMPERE,
+        'centiampere': ElectricCurrentUnit.CENTIAMPERE,
+        'centiamperes': ElectricCurrentUnit.CENTIAMPERE,
+        'mA': ElectricCurrentUnit.MILLIAMPERE,
+        'milliampere': ElectricCurrentUnit.MILLIAMPERE,
+        'milliamperes': ElectricCurrentUnit.MILLIAMPERE,
+        'microampere': ElectricCurrentUnit.MICROAMPERE,
+        'microamperes': ElectricCurrentUnit.MICROAMPERE,
+        'µA': ElectricCurrentUnit.MICROAMPERE,
+        'μA': ElectricCurrentUnit.MICROAMPERE,
+        'nA': ElectricCurrentUnit.NANOAMPERE,
+        'nanoampere': ElectricCurrentUnit.NANOAMPERE,
+        'nanoamperes': ElectricCurrentUnit.NANOAMPERE,
+        'pA': ElectricCurrentUnit.PICOAMPERE,
+        'picoampere': ElectricCurrentUnit.PICOAMPERE,
+        'picoamperes': ElectricCurrentUnit.PICOAMPERE,
+    }
+    # Maps the lowercase unit names to units for case-insensitive parsing
+    units_by_name = {
+        'megaampere': ElectricCurrentUnit.MEGAAMPERE,
+        'megaamperes': ElectricCurrentUnit.MEGAAMPERE,
+        'kiloampere': ElectricCurrentUnit.KILOAMPERE,
+        'kiloamperes': ElectricCurrentUnit.KILOAMPERE,
+        'ampere': ElectricCurrentUnit.AMPERE,
+        'amperes': ElectricCurrentUnit.AMPERE,
+        'centiampere': ElectricCurrentUnit.CENTIAMPERE,
+        'centiamperes': ElectricCurrentUnit.CENTIAMPERE,
+        'milliampere': ElectricCurrentUnit.MILLIAMPERE,
+        'milliamperes': ElectricCurrentUnit.MILLIAMPERE,
+        'microampere': ElectricCurrentUnit.MICROAMPERE,
+        'microamperes': ElectricCurrentUnit.MICROAMPERE,
+        'nanoampere': ElectricCurrentUnit.NANOAMPERE,
+        'nanoamperes': ElectricCurrentUnit.NANOAMPERE,
+        'picoampere': ElectricCurrentUnit.PICOAMPERE,
+        'picoamperes': ElectricCurrentUnit.PICOAMPERE,
+    }
+    # conversion_factors[from_unit.code][to_unit.code] is the factor that
+    # converts a value given in from_unit into to_unit.
+    conversion_factors = (
+        # MEGAAMPERE
+        (1.0, 1000.0, 1000000.0, 100000000.0, 1000000000.0, 1000000000000.0,
+         1000000000000000.0, 1e+18),
+        # KILOAMPERE
+        (0.001, 1.0, 1000.0, 100000.0, 1000000.0, 1000000000.0,
+         1000000000000.0, 1000000000000000.0),
+        # AMPERE
+        (1e-06, 0.001, 1.0, 100.0, 1000.0, 1000000.0, 1000000000.0,
+         1000000000000.0),
+        # CENTIAMPERE
+        (1e-08, 1e-05, 0.01, 1.0, 10.0, 10000.0, 10000000.0, 10000000000.0),
+        # MILLIAMPERE
+        (1e-09, 1e-06, 0.001, 0.1, 1.0, 1000.0, 1000000.0, 1000000000.0),
+        # MICROAMPERE
+        (1e-12, 1e-09, 1e-06, 0.0001, 0.001, 1.0, 1000.0, 1000000.0),
+        # NANOAMPERE
+        (1e-15, 1e-12, 1e-09, 1e-07, 1e-06, 0.001, 1.0, 1000.0),
+        # PICOAMPERE
+        (1e-18, 1e-15, 1e-12, 1e-10, 1e-09, 1e-06, 0.001, 1.0),
+    )
+    # Maps a unit system to the factors of its units in ascending order and
+    # the units themselves. The None entry holds all units.
+    units_by_factor = {
+        None: (
+            (1e-12, 1e-09, 1e-06, 0.001, 0.01, 1.0, 1000.0, 1000000.0),
+            (
+                ElectricCurrentUnit.PICOAMPERE,
+                ElectricCurrentUnit.NANOAMPERE,
+                ElectricCurrentUnit.MICROAMPERE,
+                ElectricCurrentUnit.MILLIAMPERE,
+                ElectricCurrentUnit.CENTIAMPERE,
+                ElectricCurrentUnit.AMPERE,
+                ElectricCurrentUnit.KILOAMPERE,
+                ElectricCurrentUnit.MEGAAMPERE,
+            )),
+        'astronomical': (
+            (1e-12, 1e-09, 1e-06, 0.001, 0.01, 1.0, 1000.0, 1000000.0),
+            (
+                ElectricCurrentUnit.PICOAMPERE,
+                ElectricCurrentUnit.NANOAMPERE,
+                ElectricCurrentUnit.MICROAMPERE,
+                ElectricCurrentUnit.MILLIAMPERE,
+                ElectricCurrentUnit.CENTIAMPERE,
+                ElectricCurrentUnit.AMPERE,
+                ElectricCurrentUnit.KILOAMPERE,
+                ElectricCurrentUnit.MEGAAMPERE,
+            )),
+        'imperial': (
+            (1e-12, 1e-09, 1e-06, 0.001, 0.01, 1.0, 1000.0, 1000000.0),
+            (
+                ElectricCurrentUnit.PICOAMPERE,
+                ElectricCurrentUnit.NANOAMPERE,
+                ElectricCurrentUnit.MICROAMPERE,
+                ElectricCurrentUnit.MILLIAMPERE,
+                ElectricCurrentUnit.CENTIAMPERE,
+                ElectricCurrentUnit.AMPERE,
+                ElectricCurrentUnit.KILOAMPERE,
+                ElectricCurrentUnit.MEGAAMPERE,
+            )),
+        'metric': (
+            (1e-12, 1e-09, 1e-06, 0.001, 0.01, 1.0, 1000.0, 1000000.0),
+            (
+                ElectricCurrentUnit.PICOAMPERE,
+                ElectricCurrentUnit.NANOAMPERE,
+                ElectricCurrentUnit.MICROAMPERE,
+                ElectricCurrentUnit.MILLIAMPERE,
+                ElectricCurrentUnit.CENTIAMPERE,
+                ElectricCurrentUnit.AMPERE,
+                ElectricCurrentUnit.KILOAMPERE,
+                ElectricCurrentUnit.MEGAAMPERE,
+            )),
+    }
+
+    # Instances are read-only through the public interface, so there is no
+    # need for a per-instance __dict__.
+    __slots__ = ('_value', '_unit')
 
     def __init__(self, value: float, unit: 'ElectricCurrentUnit') -> None:
+        if type(unit) is not ElectricCurrentUnit:
+            raise TypeError('{0} is not a ElectricCurrentUnit.'.format(unit))
+
         self._value = value
         self._unit = unit
 
     def __str__(self):
-        return "{value} {unit}".format(
-            value=str(self._value),
-            unit=ElectricCurrent.abbreviations[self._unit])
+        return '{0} {1}'.format(
+            self._value, ElectricCurrent.abbreviations_by_code[self._unit.code])
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # Pickles the unit as its value instead of a reference to the enum
+        # member.
+        return _from_unit_code, (self._value, self._unit.code)
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the quantity with a spec like ".3f~km".
+
+        The part before "~" formats the value, the optional part after it
+        selects the unit to convert to.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = ElectricCurrent._get_unit(symbol)
 
-    def __repr__(self):
-        return str(self)
+        return '{0} {1}'.format(
+            format(self.as_unit(unit), value_spec),
+            ElectricCurrent.abbreviations[unit])
 
     # Comparison operators
+    # All comparisons and the hash use the value in the base unit, so equal
+    # quantities given in different units hash equally.
     def __eq__(self, other):
-        return self._value == other.as_unit(self._unit)
+        if type(other) is not ElectricCurrent:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() == other._get_value_in_base_unit()
+
+    def __lt__(self, other):
+        if type(other) is not ElectricCurrent:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() < other._get_value_in_base_unit()
+
+    def __le__(self, other):
+        if type(other) is not ElectricCurrent:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() <= other._get_value_in_base_unit()
+
+    def __gt__(self, other):
+        if type(other) is not ElectricCurrent:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() > other._get_value_in_base_unit()
+
+    def __ge__(self, other):
+        if type(other) is not ElectricCurrent:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() >= other._get_value_in_base_unit()
+
+    def __hash__(self):
+        return hash(self._get_value_in_base_unit())
 
     # Unary operators
     def __neg__(self):
@@ -53,6 +267,13 @@ class ElectricCurrent:
 
         self._raise_type_error_for_undefined_operator(other, '+')
 
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
     def __sub__(self, other):
         if type(other) is ElectricCurrent:
             return ElectricCurrent(self._value - other.as_unit(self._unit), self._unit)
@@ -60,42 +281,19 @@ class ElectricCurrent:
         self._raise_type_error_for_undefined_operator(other, '-')
 
     def __mul__(self, other):
-
-        if type(other) in (float, int):
-            result = ElectricCurrent(self._value * other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '*')
-
-        return result
+        return dispatch(self, '*', other)
 
     def __rmul__(self, other):
-
-        if type(other) in (float, int, ):
-            return self * other
-
-        self._raise_type_error_for_undefined_operator(other, '*')
+        return dispatch(other, '*', self)
 
     def __truediv__(self, other):
+        return dispatch(self, '/', other)
 
-        if type(other) is ElectricCurrent:
-            result = (self._get_value_in_base_unit()
-                    / other.as_unit(other.base_unit))
-        elif type(other) in (float, int):
-            result = ElectricCurrent(self._value / other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '/')
-
-        return result
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
 
     def __pow__(self, other):
-        if type(other) in (float, int):
-            result = 1
-            for _ in range(other):
-              result *= self
-
-            return result
-        else:
-            self._raise_type_error_for_undefined_operator(other, '**')
+        return power(self, other)
 
     def _raise_type_error_for_undefined_operator(
             self, other, operator: str) -> None:
@@ -105,7 +303,70 @@ class ElectricCurrent:
 
     @staticmethod
     def zero() -> 'ElectricCurrent':
-        return ElectricCurrent(0, ElectricCurrent.base_unit)
+        return _ZERO
+
+    @staticmethod
+    def interned(value: float, unit: ElectricCurrentUnit) -> 'ElectricCurrent':
+        """Returns a shared ElectricCurrent for values which are created often.
+
+        The quantities of the last 256 distinct values and units are kept.
+        """
+        # 0.0 and -0.0 are equal, so the sign is part of the key.
+        return _interned(math.copysign(1, value), value, unit)
+
+    @staticmethod
+    def interned_cache_info():
+        """Returns the hits and misses of interned like lru_cache."""
+        return _interned.cache_info()
+
+    # Reductions
+    @staticmethod
+    def sum(quantities) -> 'ElectricCurrent':
+        """Sums the quantities with math.fsum in the base unit."""
+        return ElectricCurrent(math.fsum(ElectricCurrent._get_base_values(quantities)), ElectricCurrent.base_unit)
+
+    @staticmethod
+    def mean(quantities) -> 'ElectricCurrent':
+        values = list(ElectricCurrent._get_base_values(quantities))
+        if not values:
+            raise ValueError('mean() arg is an empty iterable')
+
+        return ElectricCurrent(math.fsum(values) / len(values), ElectricCurrent.base_unit)
+
+    @staticmethod
+    def min(quantities) -> 'ElectricCurrent':
+        return ElectricCurrent(min(ElectricCurrent._get_base_values(quantities)), ElectricCurrent.base_unit)
+
+    @staticmethod
+    def max(quantities) -> 'ElectricCurrent':
+        return ElectricCurrent(max(ElectricCurrent._get_base_values(quantities)), ElectricCurrent.base_unit)
+
+    @staticmethod
+    def std(quantities, ddof: int = 0) -> 'ElectricCurrent':
+        """Standard deviation like numpy.std, in the base unit."""
+        values = list(ElectricCurrent._get_base_values(quantities))
+        if len(values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} quantities'.format(ddof))
+
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((value - mean) ** 2 for value in values) / (
+            len(values) - ddof)
+
+        return ElectricCurrent(math.sqrt(variance), ElectricCurrent.base_unit)
+
+    @staticmethod
+    def parse(text: str) -> 'ElectricCurrent':
+        value, symbol = split(text)
+
+        return ElectricCurrent(value, ElectricCurrent._get_unit(symbol))
+
+    @staticmethod
+    def from_bytes(data) -> 'ElectricCurrent':
+        unit, value = unpack_quantity(
+            data, ElectricCurrent.type_code, ElectricCurrent.units_by_code)
+
+        return ElectricCurrent(value, unit)
 
     @property
     def unit(self) -> ElectricCurrentUnit:
@@ -116,7 +377,7 @@ class ElectricCurrent:
         return self._value
 
     def as_unit(self, unit: ElectricCurrentUnit) -> float:
-        if unit == self._unit:
+        if unit is self._unit:
             return self._value
 
         return self._get_value_as(unit)
@@ -126,6 +387,67 @@ class ElectricCurrent:
 
         return ElectricCurrent(converted_value, unit)
 
+    @staticmethod
+    def converter(from_unit: ElectricCurrentUnit, to_unit: ElectricCurrentUnit):
+        """Returns a function converting values from from_unit to to_unit.
+
+        The function takes a float, a NumPy array or a sequence of floats,
+        which is converted to a list.
+        """
+        if type(from_unit) is not ElectricCurrentUnit or type(to_unit) is not ElectricCurrentUnit:
+            raise TypeError('Can only convert between ElectricCurrent units.')
+
+        factor = ElectricCurrent.conversion_factors[from_unit.code][to_unit.code]
+
+        def convert(values):
+            try:
+                return values * factor
+            except TypeError:
+                return [value * factor for value in values]
+
+        return convert
+
+    def to_bytes(self) -> bytes:
+        return QUANTITY_FORMAT.pack(
+            ElectricCurrent.type_code, self._unit.code, self._value)
+
+    def humanize(self, system: str = None) -> 'ElectricCurrent':
+        """Converts to the largest unit which is not larger than the value.
+
+        system restricts the candidates to the units of one unit system,
+        like "metric" or "imperial".
+        """
+        factors, units = ElectricCurrent._get_units_by_factor(system)
+        value = abs(self._get_value_in_base_unit())
+        if not units or value == 0 or not math.isfinite(value):
+            return self
+
+        index = max(bisect.bisect_right(factors, value) - 1, 0)
+
+        return self.to_unit(units[index])
+
+    def isclose(
+            self,
+            other: 'ElectricCurrent',
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        """Like math.isclose, but for quantities in arbitrary units.
+
+        abs_tol is either a ElectricCurrent or a float in the base unit.
+        """
+        if type(other) is not ElectricCurrent:
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is ElectricCurrent:
+            abs_tol = abs_tol._get_value_in_base_unit()
+
+        return math.isclose(
+            self._get_value_in_base_unit(),
+            other._get_value_in_base_unit(),
+            rel_tol=rel_tol,
+            abs_tol=abs_tol)
+
     # Generation shorthands
     @staticmethod
     def from_megaamperes(value: float) -> 'ElectricCurrent':
@@ -192,21 +514,67 @@ class ElectricCurrent:
     def picoamperes(self) -> float:
         return self.as_unit(ElectricCurrentUnit.PICOAMPERE)
 
+    @staticmethod
+    def _get_unit(symbol: str) -> ElectricCurrentUnit:
+        unit = lookup_unit(
+            ElectricCurrent.units_by_symbol, ElectricCurrent.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown ElectricCurrent unit "{0}".'.format(symbol))
+
+        return unit
+
+    @staticmethod
+    def _get_units_by_factor(system: str) -> tuple:
+        try:
+            return ElectricCurrent.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+    @staticmethod
+    def _get_base_values(quantities):
+        # Yields the values of the quantities in the base unit without
+        # creating intermediate quantities.
+        factors = ElectricCurrent.factors_by_code
+        for quantity in quantities:
+            if type(quantity) is not ElectricCurrent:
+                raise TypeError(
+                    'Can not aggregate {0} with ElectricCurrent.'.format(
+                        type(quantity).__name__))
+
+            yield quantity._value * factors[quantity._unit.code]
+
     def _to_base_unit(self) -> 'ElectricCurrent':
         return self.to_unit(self.base_unit)
 
     def _get_value_in_base_unit(self) -> float:
-        try:
-            return self._value * ElectricCurrent.factors[self._unit]
-        except KeyError:
-            raise NotImplementedError(
-                'Can not convert {0} to base units.'.format(self._unit.name))
+        return self._get_value_as(self.base_unit)
 
     def _get_value_as(self, unit: ElectricCurrentUnit) -> float:
-        base_unit_value = self._get_value_in_base_unit()
-
-        try:
-            return base_unit_value / ElectricCurrent.factors[unit]
-        except KeyError:
+        # Units of other quantities have codes as well.
+        if type(unit) is not ElectricCurrentUnit:
             raise NotImplementedError(
                 'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        factor = ElectricCurrent.conversion_factors[self._unit.code][unit.code]
+        try:
+            return self._value * factor
+        except TypeError:
+            # Decimal values do not multiply with float factors.
+            return float(self._value) * factor
+
+
+# Quantities are immutable, so all callers can share these instances.
+_ZERO = ElectricCurrent(0, ElectricCurrent.base_unit)
+
+
+# typed keeps 1 and 1.0 apart, so interned values keep the requested type.
+@functools.lru_cache(maxsize=256, typed=True)
+def _interned(
+        sign: float,
+        value: float,
+        unit: ElectricCurrentUnit) -> ElectricCurrent:
+    return ElectricCurrent(value, unit)
+
+
+def _from_unit_code(value: float, unit_code: int) -> ElectricCurrent:
+    return ElectricCurrent(value, ElectricCurrent.units_by_code[unit_code])
@@ -1,10 +1,21 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+import bisect
+import functools
+import math
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split, split_format_spec
+from ..serialization import QUANTITY_FORMAT, unpack_quantity
 from ..units import LengthUnit
 
 
 class Length:
+    # Identifies the quantity in the binary format
+    type_code = 3
     base_unit = LengthUnit.METER
+    # Exponents of ayuabtu.dimensions.BASE_DIMENSIONS
+    dimension = (0, 1, 0, 0)
     factors = {
         LengthUnit.KILOMETER: 1e3,
         LengthUnit.HECTOMETER: 1e2,
@@ -35,22 +46,287 @@ class Length:
         LengthUnit.YARD: 'yd',
         LengthUnit.MILE: 'mi',
     }
+    # The tables by unit.code, for the operations which would otherwise
+    # hash the unit.
+    units_by_code = tuple(LengthUnit)
+    factors_by_code = (
+        1e3,  # KILOMETER
+        1e2,  # HECTOMETER
+        1e1,  # DECAMETER
+        1e0,  # METER
+        1e-1,  # DECIMETER
+        1e-2,  # CENTIMETER
+        1e-3,  # MILLIMETER
+        1e-6,  # MICROMETER
+        1e-9,  # NANOMETER
+        0.0254,  # INCH
+        0.3048,  # FOOT
+        0.9144,  # YARD
+        1609.34,  # MILE
+    )
+    abbreviations_by_code = (
+        'km',  # KILOMETER
+        'hm',  # HECTOMETER
+        'dam',  # DECAMETER
+        'm',  # METER
+        'dm',  # DECIMETER
+        'cm',  # CENTIMETER
+        'mm',  # MILLIMETER
+        'μm',  # MICROMETER
+        'nm',  # NANOMETER
+        'in',  # INCH
+        'ft',  # FOOT
+        'yd',  # YARD
+        'mi',  # MILE
+    )
+    # Maps abbreviations and unit names to units for parsing
+    units_by_symbol = {
+        'kilometer': LengthUnit.KILOMETER,
+        'kilometers': LengthUnit.KILOMETER,
+        'km': LengthUnit.KILOMETER,
+        'hectometer': LengthUnit.HECTOMETER,
+        'hectometers': LengthUnit.HECTOMETER,
+        'hm': LengthUnit.HECTOMETER,
+        'dam': LengthUnit.DECAMETER,
+        'decameter': LengthUnit.DECAMETER,
+        'decameters': LengthUnit.DECAMETER,
+        'm': LengthUnit.METER,
+        'meter': LengthUnit.METER,
+        'meters': LengthUnit.METER,
+        'decimeter': LengthUnit.DECIMETER,
+        'decimeters': LengthUnit.DECIMETER,
+        'dm': LengthUnit.DECIMETER,
+        'centimeter': LengthUnit.CENTIMETER,
+        'centimeters': LengthUnit.CENTIMETER,
+        'cm': LengthUnit.CENTIMETER,
+        'millimeter': LengthUnit.MILLIMETER,
+        'millimeters': LengthUnit.MILLIMETER,
+        'mm': LengthUnit.MILLIMETER,
+        'micrometer': LengthUnit.MICROMETER,
+        'micrometers': LengthUnit.MICROMETER,
+        'µm': LengthUnit.MICROMETER,
+        'μm': LengthUnit.MICROMETER,
+        'nanometer': LengthUnit.NANOMETER,
+        'nanometers': LengthUnit.NANOMETER,
+        'nm': LengthUnit.NANOMETER,
+        'in': LengthUnit.INCH,
+        'inch': LengthUnit.INCH,
+        'inches': LengthUnit.INCH,
+        'feet': LengthUnit.FOOT,
+        'foot': LengthUnit.FOOT,
+        'ft': LengthUnit.FOOT,
+        'yard': LengthUnit.YARD,
+        'yards': LengthUnit.YARD,
+        'yd': LengthUnit.YARD,
+        'mi': LengthUnit.MILE,
+        'mile': LengthUnit.MILE,
+        'miles': LengthUnit.MILE,
+    }
+    # Maps the lowercase unit names to units for case-insensitive parsing
+    units_by_name = {
+        'kilometer': LengthUnit.KILOMETER,
+        'kilometers': LengthUnit.KILOMETER,
+        'hectometer': LengthUnit.HECTOMETER,
+        'hectometers': LengthUnit.HECTOMETER,
+        'decameter': LengthUnit.DECAMETER,
+        'decameters': LengthUnit.DECAMETER,
+        'meter': LengthUnit.METER,
+        'meters': LengthUnit.METER,
+        'decimeter': LengthUnit.DECIMETER,
+        'decimeters': LengthUnit.DECIMETER,
+        'centimeter': LengthUnit.CENTIMETER,
+        'centimeters': LengthUnit.CENTIMETER,
+        'millimeter': LengthUnit.MILLIMETER,
+        'millimeters': LengthUnit.MILLIMETER,
+        'micrometer': LengthUnit.MICROMETER,
+        'micrometers': LengthUnit.MICROMETER,
+        'nanometer': LengthUnit.NANOMETER,
+        'nanometers': LengthUnit.NANOMETER,
+        'inch': LengthUnit.INCH,
+        'inches': LengthUnit.INCH,
+        'feet': LengthUnit.FOOT,
+        'foot': LengthUnit.FOOT,
+        'yard': LengthUnit.YARD,
+        'yards': LengthUnit.YARD,
+        'mile': LengthUnit.MILE,
+        'miles': LengthUnit.MILE,
+    }
+    # conversion_factors[from_unit.code][to_unit.code] is the factor that
+    # converts a value given in from_unit into to_unit.
+    conversion_factors = (
+        # KILOMETER
+        (1.0, 10.0, 100.0, 1000.0, 10000.0, 100000.0, 1000000.0,
+         1000000000.0, 1000000000000.0, 39370.07874015748,
+         3280.839895013123, 1093.6132983377079, 0.6213727366498067),
+        # HECTOMETER
+        (0.1, 1.0, 10.0, 100.0, 1000.0, 10000.0, 100000.0, 100000000.0,
+         100000000000.0, 3937.0078740157483, 328.0839895013123,
+         109.36132983377078, 0.062137273664980675),
+        # DECAMETER
+        (0.01, 0.1, 1.0, 10.0, 100.0, 1000.0, 10000.0, 10000000.0,
+         10000000000.0, 393.7007874015748, 32.808398950131235,
+         10.936132983377078, 0.006213727366498068),
+        # METER
+        (0.001, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0, 1000000.0,
+         1000000000.0, 39.37007874015748, 3.2808398950131235,
+         1.0936132983377078, 0.0006213727366498067),
+        # DECIMETER
+        (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, 100.0, 100000.0, 100000000.0,
+         3.937007874015748, 0.32808398950131235, 0.10936132983377078,
+         6.213727366498067e-05),
+        # CENTIMETER
+        (1e-05, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, 10000.0, 10000000.0,
+         0.3937007874015748, 0.03280839895013123, 0.010936132983377077,
+         6.213727366498068e-06),
+        # MILLIMETER
+        (1e-06, 1e-05, 0.0001, 0.001, 0.01, 0.1, 1.0, 1000.0, 1000000.0,
+         0.03937007874015748, 0.0032808398950131233, 0.0010936132983377078,
+         6.213727366498067e-07),
+        # MICROMETER
+        (1e-09, 1e-08, 1e-07, 1e-06, 1e-05, 0.0001, 0.001, 1.0, 1000.0,
+         3.937007874015748e-05, 3.2808398950131235e-06,
+         1.0936132983377078e-06, 6.213727366498067e-10),
+        # NANOMETER
+        (1e-12, 1e-11, 1e-10, 1e-09, 1e-08, 1e-07, 1e-06, 0.001, 1.0,
+         3.937007874015748e-08, 3.2808398950131233e-09,
+         1.0936132983377077e-09, 6.213727366498067e-13),
+        # INCH
+        (2.54e-05, 0.000254, 0.00254, 0.0254, 0.254, 2.54, 25.4, 25400.0,
+         25400000.0, 1.0, 0.08333333333333333, 0.027777777777777776,
+         1.578286751090509e-05),
+        # FOOT
+        (0.0003048, 0.003048, 0.03048, 0.3048, 3.048, 30.48, 304.8,
+         304800.0, 304800000.0, 12.0, 1.0, 0.3333333333333333,
+         0.00018939441013086109),
+        # YARD
+        (0.0009144, 0.009144, 0.09144, 0.9144, 9.144, 91.44, 914.4,
+         914400.0, 914400000.0, 36.0, 3.0, 1.0, 0.0005681832303925833),
+        # MILE
+        (1.60934, 16.0934, 160.934, 1609.34, 16093.4, 160934.0, 1609340.0,
+         1609340000.0, 1609340000000.0, 63359.84251968504, 5279.98687664042,
+         1759.9956255468067, 1.0),
+    )
+    # Maps a unit system to the factors of its units in ascending order and
+    # the units themselves. The None entry holds all units.
+    units_by_factor = {
+        None: (
+            (1e-09, 1e-06, 0.001, 0.01, 0.0254, 0.1, 0.3048, 0.9144, 1.0,
+             10.0, 100.0, 1000.0, 1609.34),
+            (
+                LengthUnit.NANOMETER,
+                LengthUnit.MICROMETER,
+                LengthUnit.MILLIMETER,
+                LengthUnit.CENTIMETER,
+                LengthUnit.INCH,
+                LengthUnit.DECIMETER,
+                LengthUnit.FOOT,
+                LengthUnit.YARD,
+                LengthUnit.METER,
+                LengthUnit.DECAMETER,
+                LengthUnit.HECTOMETER,
+                LengthUnit.KILOMETER,
+                LengthUnit.MILE,
+            )),
+        'astronomical': (
+            (),
+            (
+            )),
+        'imperial': (
+            (0.0254, 0.3048, 0.9144, 1609.34),
+            (
+                LengthUnit.INCH,
+                LengthUnit.FOOT,
+                LengthUnit.YARD,
+                LengthUnit.MILE,
+            )),
+        'metric': (
+            (1e-09, 1e-06, 0.001, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0),
+            (
+                LengthUnit.NANOMETER,
+                LengthUnit.MICROMETER,
+                LengthUnit.MILLIMETER,
+                LengthUnit.CENTIMETER,
+                LengthUnit.DECIMETER,
+                LengthUnit.METER,
+                LengthUnit.DECAMETER,
+                LengthUnit.HECTOMETER,
+                LengthUnit.KILOMETER,
+            )),
+    }
+
+    # Instances are read-only through the public interface, so there is no
+    # need for a per-instance __dict__.
+    __slots__ = ('_value', '_unit')
 
     def __init__(self, value: float, unit: 'LengthUnit') -> None:
+        if type(unit) is not LengthUnit:
+            raise TypeError('{0} is not a LengthUnit.'.format(unit))
+
         self._value = value
         self._unit = unit
 
     def __str__(self):
-        return "{value} {unit}".format(
-            value=str(self._value),
-            unit=Length.abbreviations[self._unit])
+        return '{0} {1}'.format(
+            self._value, Length.abbreviations_by_code[self._unit.code])
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # Pickles the unit as its value instead of a reference to the enum
+        # member.
+        return _from_unit_code, (self._value, self._unit.code)
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the quantity with a spec like ".3f~km".
+
+        The part before "~" formats the value, the optional part after it
+        selects the unit to convert to.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = Length._get_unit(symbol)
 
-    def __repr__(self):
-        return str(self)
+        return '{0} {1}'.format(
+            format(self.as_unit(unit), value_spec),
+            Length.abbreviations[unit])
 
     # Comparison operators
+    # All comparisons and the hash use the value in the base unit, so equal
+    # quantities given in different units hash equally.
     def __eq__(self, other):
-        return self._value == other.as_unit(self._unit)
+        if type(other) is not Length:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() == other._get_value_in_base_unit()
+
+    def __lt__(self, other):
+        if type(other) is not Length:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() < other._get_value_in_base_unit()
+
+    def __le__(self, other):
+        if type(other) is not Length:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() <= other._get_value_in_base_unit()
+
+    def __gt__(self, other):
+        if type(other) is not Length:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() > other._get_value_in_base_unit()
+
+    def __ge__(self, other):
+        if type(other) is not Length:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() >= other._get_value_in_base_unit()
+
+    def __hash__(self):
+        return hash(self._get_value_in_base_unit())
 
     # Unary operators
     def __neg__(self):
@@ -63,6 +339,13 @@ class Length:
 
         self._raise_type_error_for_undefined_operator(other, '+')
 
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
     def __sub__(self, other):
         if type(other) is Length:
             return Length(self._value - other.as_unit(self._unit), self._unit)
@@ -70,54 +353,19 @@ class Length:
         self._raise_type_error_for_undefined_operator(other, '-')
 
     def __mul__(self, other):
-        from .volume import Volume
-        from .area import Area
-
-        if type(other) in (float, int):
-            result = Length(self._value * other, self._unit)
-        elif type(other) is Length:
-            result = Area(
-                self.as_unit(self.base_unit) * other.as_unit(other.base_unit),
-                Area.base_unit)
-        elif type(other) is Area:
-            result = Volume(
-                self.as_unit(self.base_unit) * other.as_unit(other.base_unit),
-                Volume.base_unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '*')
-
-        return result
+        return dispatch(self, '*', other)
 
     def __rmul__(self, other):
-        from .volume import Volume
-        from .area import Area
-
-        if type(other) in (float, int, Length, Area):
-            return self * other
-
-        self._raise_type_error_for_undefined_operator(other, '*')
+        return dispatch(other, '*', self)
 
     def __truediv__(self, other):
+        return dispatch(self, '/', other)
 
-        if type(other) is Length:
-            result = (self._get_value_in_base_unit()
-                    / other.as_unit(other.base_unit))
-        elif type(other) in (float, int):
-            result = Length(self._value / other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '/')
-
-        return result
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
 
     def __pow__(self, other):
-        if type(other) in (float, int):
-            result = 1
-            for _ in range(other):
-              result *= self
-
-            return result
-        else:
-            self._raise_type_error_for_undefined_operator(other, '**')
+        return power(self, other)
 
     def _raise_type_error_for_undefined_operator(
             self, other, operator: str) -> None:
@@ -127,7 +375,70 @@ class Length:
 
     @staticmethod
     def zero() -> 'Length':
-        return Length(0, Length.base_unit)
+        return _ZERO
+
+    @staticmethod
+    def interned(value: float, unit: LengthUnit) -> 'Length':
+        """Returns a shared Length for values which are created often.
+
+        The quantities of the last 256 distinct values and units are kept.
+        """
+        # 0.0 and -0.0 are equal, so the sign is part of the key.
+        return _interned(math.copysign(1, value), value, unit)
+
+    @staticmethod
+    def interned_cache_info():
+        """Returns the hits and misses of interned like lru_cache."""
+        return _interned.cache_info()
+
+    # Reductions
+    @staticmethod
+    def sum(quantities) -> 'Length':
+        """Sums the quantities with math.fsum in the base unit."""
+        return Length(math.fsum(Length._get_base_values(quantities)), Length.base_unit)
+
+    @staticmethod
+    def mean(quantities) -> 'Length':
+        values = list(Length._get_base_values(quantities))
+        if not values:
+            raise ValueError('mean() arg is an empty iterable')
+
+        return Length(math.fsum(values) / len(values), Length.base_unit)
+
+    @staticmethod
+    def min(quantities) -> 'Length':
+        return Length(min(Length._get_base_values(quantities)), Length.base_unit)
+
+    @staticmethod
+    def max(quantities) -> 'Length':
+        return Length(max(Length._get_base_values(quantities)), Length.base_unit)
+
+    @staticmethod
+    def std(quantities, ddof: int = 0) -> 'Length':
+        """Standard deviation like numpy.std, in the base unit."""
+        values = list(Length._get_base_values(quantities))
+        if len(values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} quantities'.format(ddof))
+
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((value - mean) ** 2 for value in values) / (
+            len(values) - ddof)
+
+        return Length(math.sqrt(variance), Length.base_unit)
+
+    @staticmethod
+    def parse(text: str) -> 'Length':
+        value, symbol = split(text)
+
+        return Length(value, Length._get_unit(symbol))
+
+    @staticmethod
+    def from_bytes(data) -> 'Length':
+        unit, value = unpack_quantity(
+            data, Length.type_code, Length.units_by_code)
+
+        return Length(value, unit)
 
     @property
     def unit(self) -> LengthUnit:
@@ -138,7 +449,7 @@ class Length:
         return self._value
 
     def as_unit(self, unit: LengthUnit) -> float:
-        if unit == self._unit:
+        if unit is self._unit:
             return self._value
 
         return self._get_value_as(unit)
@@ -148,6 +459,67 @@ class Length:
 
         return Length(converted_value, unit)
 
+    @staticmethod
+    def converter(from_unit: LengthUnit, to_unit: LengthUnit):
+        """Returns a function converting values from from_unit to to_unit.
+
+        The function takes a float, a NumPy array or a sequence of floats,
+        which is converted to a list.
+        """
+        if type(from_unit) is not LengthUnit or type(to_unit) is not LengthUnit:
+            raise TypeError('Can only convert between Length units.')
+
+        factor = Length.conversion_factors[from_unit.code][to_unit.code]
+
+        def convert(values):
+            try:
+                return values * factor
+            except TypeError:
+                return [value * factor for value in values]
+
+        return convert
+
+    def to_bytes(self) -> bytes:
+        return QUANTITY_FORMAT.pack(
+            Length.type_code, self._unit.code, self._value)
+
+    def humanize(self, system: str = None) -> 'Length':
+        """Converts to the largest unit which is not larger than the value.
+
+        system restricts the candidates to the units of one unit system,
+        like "metric" or "imperial".
+        """
+        factors, units = Length._get_units_by_factor(system)
+        value = abs(self._get_value_in_base_unit())
+        if not units or value == 0 or not math.isfinite(value):
+            return self
+
+        index = max(bisect.bisect_right(factors, value) - 1, 0)
+
+        return self.to_unit(units[index])
+
+    def isclose(
+            self,
+            other: 'Length',
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        """Like math.isclose, but for quantities in arbitrary units.
+
+        abs_tol is either a Length or a float in the base unit.
+        """
+        if type(other) is not Length:
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Length:
+            abs_tol = abs_tol._get_value_in_base_unit()
+
+        return math.isclose(
+            self._get_value_in_base_unit(),
+            other._get_value_in_base_unit(),
+            rel_tol=rel_tol,
+            abs_tol=abs_tol)
+
     # Generation shorthands
     @staticmethod
     def from_kilometers(value: float) -> 'Length':
@@ -254,21 +626,67 @@ class Length:
     def miles(self) -> float:
         return self.as_unit(LengthUnit.MILE)
 
+    @staticmethod
+    def _get_unit(symbol: str) -> LengthUnit:
+        unit = lookup_unit(
+            Length.units_by_symbol, Length.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Length unit "{0}".'.format(symbol))
+
+        return unit
+
+    @staticmethod
+    def _get_units_by_factor(system: str) -> tuple:
+        try:
+            return Length.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+    @staticmethod
+    def _get_base_values(quantities):
+        # Yields the values of the quantities in the base unit without
+        # creating intermediate quantities.
+        factors = Length.factors_by_code
+        for quantity in quantities:
+            if type(quantity) is not Length:
+                raise TypeError(
+                    'Can not aggregate {0} with Length.'.format(
+                        type(quantity).__name__))
+
+            yield quantity._value * factors[quantity._unit.code]
+
     def _to_base_unit(self) -> 'Length':
         return self.to_unit(self.base_unit)
 
     def _get_value_in_base_unit(self) -> float:
-        try:
-            return self._value * Length.factors[self._unit]
-        except KeyError:
-            raise NotImplementedError(
-                'Can not convert {0} to base units.'.format(self._unit.name))
+        return self._get_value_as(self.base_unit)
 
     def _get_value_as(self, unit: LengthUnit) -> float:
-        base_unit_value = self._get_value_in_base_unit()
-
-        try:
-            return base_unit_value / Length.factors[unit]
-        except KeyError:
+        # Units of other quantities have codes as well.
+        if type(unit) is not LengthUnit:
             raise NotImplementedError(
                 'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        factor = Length.conversion_factors[self._unit.code][unit.code]
+        try:
+            return self._value * factor
+        except TypeError:
+            # Decimal values do not multiply with float factors.
+            return float(self._value) * factor
+
+
+# Quantities are immutable, so all callers can share these instances.
+_ZERO = Length(0, Length.base_unit)
+
+
+# typed keeps 1 and 1.0 apart, so interned values keep the requested type.
+@functools.lru_cache(maxsize=256, typed=True)
+def _interned(
+        sign: float,
+        value: float,
+        unit: LengthUnit) -> Length:
+    return Length(value, unit)
+
+
+def _from_unit_code(value: float, unit_code: int) -> Length:
+    return Length(value, Length.units_by_code[unit_code])
@@ -1,10 +1,21 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+import bisect
+import functools
+import math
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split, split_format_spec
+from ..serialization import QUANTITY_FORMAT, unpack_quantity
 from ..units import MassUnit
 
 
 class Mass:
+    # Identifies the quantity in the binary format
+    type_code = 4
     base_unit = MassUnit.KILOGRAM
+    # Exponents of ayuabtu.dimensions.BASE_DIMENSIONS
+    dimension = (0, 0, 1, 0)
     factors = {
         MassUnit.GIGATONNE: 1e12,
         MassUnit.MEGATONNE: 1e9,
@@ -59,22 +70,545 @@ class Mass:
         MassUnit.EARTHMASS: 'M⊕',
         MassUnit.SOLARMASS: 'M☉',
     }
+    # The tables by unit.code, for the operations which would otherwise
+    # hash the unit.
+    units_by_code = tuple(MassUnit)
+    factors_by_code = (
+        1e12,  # GIGATONNE
+        1e9,  # MEGATONNE
+        1e6,  # KILOTONNE
+        1e3,  # TONNE
+        1e0,  # KILOGRAM
+        1e-1,  # HECTOGRAM
+        1e-2,  # DECAGRAM
+        1e-3,  # GRAM
+        1e-4,  # DECIGRAM
+        1e-5,  # CENTIGRAM
+        1e-6,  # MILLIGRAM
+        1e-9,  # MICROGRAM
+        1e-12,  # NANOGRAM
+        4.53592370e5,  # MEGAPOUND
+        4.53592370e2,  # KILOPOUND
+        4.53592370e-1,  # POUND
+        2.8349523125e-2,  # OUNCE
+        6.479891e-5,  # GRAIN
+        45.359237,  # SHORTHUNDREDWEIGHT
+        907.18474,  # SHORTTON
+        6.35029318,  # STONE
+        50.80234544,  # LONGHUNDREDWEIGHT
+        1016.0469088,  # LONGTON
+        5.9723e24,  # EARTHMASS
+        1.98892e30,  # SOLARMASS
+    )
+    abbreviations_by_code = (
+        'Gt',  # GIGATONNE
+        'Mt',  # MEGATONNE
+        'kt',  # KILOTONNE
+        't',  # TONNE
+        'kg',  # KILOGRAM
+        'hg',  # HECTOGRAM
+        'dag',  # DECAGRAM
+        'g',  # GRAM
+        'dg',  # DECIGRAM
+        'cg',  # CENTIGRAM
+        'mg',  # MILLIGRAM
+        'μg',  # MICROGRAM
+        'ng',  # NANOGRAM
+        'Mlb.',  # MEGAPOUND
+        'klb.',  # KILOPOUND
+        'lb.',  # POUND
+        'oz.',  # OUNCE
+        'gr.',  # GRAIN
+        'cwt.',  # SHORTHUNDREDWEIGHT
+        'to.',  # SHORTTON
+        'st.',  # STONE
+        'cwt.',  # LONGHUNDREDWEIGHT
+        'to.',  # LONGTON
+        'M⊕',  # EARTHMASS
+        'M☉',  # SOLARMASS
+    )
+    # Maps abbreviations and unit names to units for parsing
+    units_by_symbol = {
+        'Gt': MassUnit.GIGATONNE,
+        'gigatonne': MassUnit.GIGATONNE,
+        'gigatonnes': MassUnit.GIGATONNE,
+        'Mt': MassUnit.MEGATONNE,
+        'megatonne': MassUnit.MEGATONNE,
+        'megatonnes': MassUnit.MEGATONNE,
+        'kilotonne': MassUnit.KILOTONNE,
+        'kilotonnes': MassUnit.KILOTONNE,
+        'kt': MassUnit.KILOTONNE,
+        't': MassUnit.TONNE,
+        'tonne': MassUnit.TONNE,
+        'tonnes': MassUnit.TONNE,
+        'kg': MassUnit.KILOGRAM,
+        'kilogram': MassUnit.KILOGRAM,
+        'kilograms': MassUnit.KILOGRAM,
+        'hectogram': MassUnit.HECTOGRAM,
+        'hectograms': MassUnit.HECTOGRAM,
+        'hg': MassUnit.HECTOGRAM,
+        'dag': MassUnit.DECAGRAM,
+        'decagram': MassUnit.DECAGRAM,
+        'decagrams': MassUnit.DECAGRAM,
+        'g': MassUnit.GRAM,
+        'gram': MassUnit.GRAM,
+        'grams': MassUnit.GRAM,
+        'decigram': MassUnit.DECIGRAM,
+        'decigrams': MassUnit.DECIGRAM,
+        'dg': MassUnit.DECIGRAM,
+        'centigram': MassUnit.CENTIGRAM,
+        'centigrams': MassUnit.CENTIGRAM,
+        'cg': MassUnit.CENTIGRAM,
+        'mg': MassUnit.MILLIGRAM,
+        'milligram': MassUnit.MILLIGRAM,
+        'milligrams': MassUnit.MILLIGRAM,
+        'microgram': MassUnit.MICROGRAM,
+        'micrograms': MassUnit.MICROGRAM,
+        'µg': MassUnit.MICROGRAM,
+        'μg': MassUnit.MICROGRAM,
+        'nanogram': MassUnit.NANOGRAM,
+        'nanograms': MassUnit.NANOGRAM,
+        'ng': MassUnit.NANOGRAM,
+        'Mlb': MassUnit.MEGAPOUND,
+        'Mlb.': MassUnit.MEGAPOUND,
+        'megapound': MassUnit.MEGAPOUND,
+        'megapounds': MassUnit.MEGAPOUND,
+        'kilopound': MassUnit.KILOPOUND,
+        'kilopounds': MassUnit.KILOPOUND,
+        'klb': MassUnit.KILOPOUND,
+        'klb.': MassUnit.KILOPOUND,
+        'lb': MassUnit.POUND,
+        'lb.': MassUnit.POUND,
+        'pound': MassUnit.POUND,
+        'pounds': MassUnit.POUND,
+        'ounce': MassUnit.OUNCE,
+        'ounces': MassUnit.OUNCE,
+        'oz': MassUnit.OUNCE,
+        'oz.': MassUnit.OUNCE,
+        'gr': MassUnit.GRAIN,
+        'gr.': MassUnit.GRAIN,
+        'grain': MassUnit.GRAIN,
+        'grains': MassUnit.GRAIN,
+        'short hundredweight': MassUnit.SHORTHUNDREDWEIGHT,
+        'short hundredweights': MassUnit.SHORTHUNDREDWEIGHT,
+        'short ton': MassUnit.SHORTTON,
+        'short tons': MassUnit.SHORTTON,
+        'st': MassUnit.STONE,
+        'st.': MassUnit.STONE,
+        'stone': MassUnit.STONE,
+        'stones': MassUnit.STONE,
+        'long hundredweight': MassUnit.LONGHUNDREDWEIGHT,
+        'long hundredweights': MassUnit.LONGHUNDREDWEIGHT,
+        'long ton': MassUnit.LONGTON,
+        'long tons': MassUnit.LONGTON,
+        'M⊕': MassUnit.EARTHMASS,
+        'earth mass': MassUnit.EARTHMASS,
+        'earth masses': MassUnit.EARTHMASS,
+        'M☉': MassUnit.SOLARMASS,
+        'solar mass': MassUnit.SOLARMASS,
+        'solar masses': MassUnit.SOLARMASS,
+    }
+    # Maps the lowercase unit names to units for case-insensitive parsing
+    units_by_name = {
+        'gigatonne': MassUnit.GIGATONNE,
+        'gigatonnes': MassUnit.GIGATONNE,
+        'megatonne': MassUnit.MEGATONNE,
+        'megatonnes': MassUnit.MEGATONNE,
+        'kilotonne': MassUnit.KILOTONNE,
+        'kilotonnes': MassUnit.KILOTONNE,
+        'tonne': MassUnit.TONNE,
+        'tonnes': MassUnit.TONNE,
+        'kilogram': MassUnit.KILOGRAM,
+        'kilograms': MassUnit.KILOGRAM,
+        'hectogram': MassUnit.HECTOGRAM,
+        'hectograms': MassUnit.HECTOGRAM,
+        'decagram': MassUnit.DECAGRAM,
+        'decagrams': MassUnit.DECAGRAM,
+        'gram': MassUnit.GRAM,
+        'grams': MassUnit.GRAM,
+        'decigram': MassUnit.DECIGRAM,
+        'decigrams': MassUnit.DECIGRAM,
+        'centigram': MassUnit.CENTIGRAM,
+        'centigrams': MassUnit.CENTIGRAM,
+        'milligram': MassUnit.MILLIGRAM,
+        'milligrams': MassUnit.MILLIGRAM,
+        'microgram': MassUnit.MICROGRAM,
+        'micrograms': MassUnit.MICROGRAM,
+        'nanogram': MassUnit.NANOGRAM,
+        'nanograms': MassUnit.NANOGRAM,
+        'megapound': MassUnit.MEGAPOUND,
+        'megapounds': MassUnit.MEGAPOUND,
+        'kilopound': MassUnit.KILOPOUND,
+        'kilopounds': MassUnit.KILOPOUND,
+        'pound': MassUnit.POUND,
+        'pounds': MassUnit.POUND,
+        'ounce': MassUnit.OUNCE,
+        'ounces': MassUnit.OUNCE,
+        'grain': MassUnit.GRAIN,
+        'grains': MassUnit.GRAIN,
+        'short hundredweight': MassUnit.SHORTHUNDREDWEIGHT,
+        'short hundredweights': MassUnit.SHORTHUNDREDWEIGHT,
+        'short ton': MassUnit.SHORTTON,
+        'short tons': MassUnit.SHORTTON,
+        'stone': MassUnit.STONE,
+        'stones': MassUnit.STONE,
+        'long hundredweight': MassUnit.LONGHUNDREDWEIGHT,
+        'long hundredweights': MassUnit.LONGHUNDREDWEIGHT,
+        'long ton': MassUnit.LONGTON,
+        'long tons': MassUnit.LONGTON,
+        'earth mass': MassUnit.EARTHMASS,
+        'earth masses': MassUnit.EARTHMASS,
+        'solar mass': MassUnit.SOLARMASS,
+        'solar masses': MassUnit.SOLARMASS,
+    }
+    # conversion_factors[from_unit.code][to_unit.code] is the factor that
+    # converts a value given in from_unit into to_unit.
+    conversion_factors = (
+        # GIGATONNE
+        (1.0, 1000.0, 1000000.0, 1000000000.0, 1000000000000.0,
+         10000000000000.0, 100000000000000.0, 1000000000000000.0, 1e+16,
+         1e+17, 1e+18, 1e+21, 1e+24, 2204622.621848776, 2204622621.848776,
+         2204622621848.776, 35273961949580.414, 1.543235835294143e+16,
+         22046226218.48776, 1102311310.924388, 157473044417.7697,
+         19684130552.221214, 984206527.6110606, 1.6743967985533212e-13,
+         5.02785431289343e-19),
+        # MEGATONNE
+        (0.001, 1.0, 1000.0, 1000000.0, 1000000000.0, 10000000000.0,
+         100000000000.0, 1000000000000.0, 10000000000000.0,
+         100000000000000.0, 1000000000000000.0, 1e+18, 1e+21,
+         2204.622621848776, 2204622.621848776, 2204622621.848776,
+         35273961949.580414, 15432358352941.43, 22046226.21848776,
+         1102311.310924388, 157473044.4177697, 19684130.552221213,
+         984206.5276110607, 1.6743967985533213e-16, 5.02785431289343e-22),
+        # KILOTONNE
+        (1e-06, 0.001, 1.0, 1000.0, 1000000.0, 10000000.0, 100000000.0,
+         1000000000.0, 10000000000.0, 100000000000.0, 1000000000000.0,
+         1000000000000000.0, 1e+18, 2.2046226218487757, 2204.622621848776,
+         2204622.621848776, 35273961.949580416, 15432358352.941431,
+         22046.226218487758, 1102.311310924388, 157473.0444177697,
+         19684.130552221213, 984.2065276110607, 1.6743967985533212e-19,
+         5.02785431289343e-25),
+        # TONNE
+        (1e-09, 1e-06, 0.001, 1.0, 1000.0, 10000.0, 100000.0, 1000000.0,
+         10000000.0, 100000000.0, 1000000000.0, 1000000000000.0,
+         1000000000000000.0, 0.002204622621848776, 2.2046226218487757,
+         2204.622621848776, 35273.961949580415, 15432358.352941431,
+         22.046226218487757, 1.1023113109243878, 157.4730444177697,
+         19.684130552221212, 0.9842065276110606, 1.6743967985533212e-22,
+         5.02785431289343e-28),
+        # KILOGRAM
+        (1e-12, 1e-09, 1e-06, 0.001, 1.0, 10.0, 100.0, 1000.0, 10000.0,
+         100000.0, 1000000.0, 1000000000.0, 1000000000000.0,
+         2.204622621848776e-06, 0.002204622621848776, 2.2046226218487757,
+         35.27396194958041, 15432.35835294143, 0.022046226218487758,
+         0.001102311310924388, 0.15747304441776971, 0.019684130552221214,
+         0.0009842065276110606, 1.6743967985533212e-25,
+         5.027854312893429e-31),
+        # HECTOGRAM
+        (1e-13, 1e-10, 1e-07, 0.0001, 0.1, 1.0, 10.0, 100.0, 1000.0,
+         10000.0, 100000.0, 100000000.0, 100000000000.0,
+         2.2046226218487757e-07, 0.00022046226218487759,
+         0.22046226218487758, 3.5273961949580412, 1543.235835294143,
+         0.002204622621848776, 0.00011023113109243879, 0.01574730444177697,
+         0.001968413055222121, 9.842065276110607e-05,
+         1.6743967985533212e-26, 5.027854312893429e-32),
+        # DECAGRAM
+        (1e-14, 1e-11, 1e-08, 1e-05, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0,
+         10000.0, 10000000.0, 10000000000.0, 2.2046226218487758e-08,
+         2.2046226218487758e-05, 0.022046226218487758, 0.3527396194958041,
+         154.3235835294143, 0.00022046226218487759, 1.1023113109243879e-05,
+         0.001574730444177697, 0.00019684130552221214,
+         9.842065276110606e-06, 1.674396798553321e-27,
+         5.0278543128934294e-33),
+        # GRAM
+        (1e-15, 1e-12, 1e-09, 1e-06, 0.001, 0.01, 0.1, 1.0, 10.0, 100.0,
+         1000.0, 1000000.0, 1000000000.0, 2.204622621848776e-09,
+         2.204622621848776e-06, 0.002204622621848776, 0.035273961949580414,
+         15.432358352941431, 2.2046226218487758e-05, 1.102311310924388e-06,
+         0.0001574730444177697, 1.968413055222121e-05,
+         9.842065276110607e-07, 1.6743967985533212e-28,
+         5.027854312893429e-34),
+        # DECIGRAM
+        (1e-16, 1e-13, 1e-10, 1e-07, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0,
+         100.0, 100000.0, 100000000.0, 2.204622621848776e-10,
+         2.2046226218487757e-07, 0.00022046226218487759,
+         0.0035273961949580414, 1.543235835294143, 2.204622621848776e-06,
+         1.1023113109243879e-07, 1.574730444177697e-05,
+         1.9684130552221214e-06, 9.842065276110606e-08,
+         1.6743967985533212e-29, 5.02785431289343e-35),
+        # CENTIGRAM
+        (1e-17, 1e-14, 1e-11, 1e-08, 1e-05, 0.0001, 0.001, 0.01, 0.1, 1.0,
+         10.0, 10000.0, 10000000.0, 2.2046226218487758e-11,
+         2.2046226218487758e-08, 2.2046226218487758e-05,
+         0.00035273961949580413, 0.1543235835294143, 2.2046226218487757e-07,
+         1.1023113109243879e-08, 1.574730444177697e-06,
+         1.9684130552221212e-07, 9.842065276110606e-09,
+         1.674396798553321e-30, 5.0278543128934296e-36),
+        # MILLIGRAM
+        (1e-18, 1e-15, 1e-12, 1e-09, 1e-06, 1e-05, 0.0001, 0.001, 0.01, 0.1,
+         1.0, 1000.0, 1000000.0, 2.2046226218487757e-12,
+         2.204622621848776e-09, 2.204622621848776e-06,
+         3.5273961949580415e-05, 0.015432358352941431,
+         2.2046226218487758e-08, 1.102311310924388e-09,
+         1.574730444177697e-07, 1.9684130552221212e-08,
+         9.842065276110607e-10, 1.674396798553321e-31,
+         5.0278543128934295e-37),
+        # MICROGRAM
+        (1e-21, 1e-18, 1e-15, 1e-12, 1e-09, 1e-08, 1e-07, 1e-06, 1e-05,
+         0.0001, 0.001, 1.0, 1000.0, 2.204622621848776e-15,
+         2.2046226218487757e-12, 2.204622621848776e-09,
+         3.5273961949580413e-08, 1.543235835294143e-05,
+         2.2046226218487758e-11, 1.1023113109243879e-12,
+         1.5747304441776971e-10, 1.9684130552221214e-11,
+         9.842065276110605e-13, 1.6743967985533212e-34, 5.02785431289343e-40),
+        # NANOGRAM
+        (1e-24, 1e-21, 1e-18, 1e-15, 1e-12, 1e-11, 1e-10, 1e-09, 1e-08,
+         1e-07, 1e-06, 0.001, 1.0, 2.204622621848776e-18,
+         2.204622621848776e-15, 2.2046226218487757e-12,
+         3.527396194958041e-11, 1.543235835294143e-08,
+         2.204622621848776e-14, 1.102311310924388e-15,
+         1.574730444177697e-13, 1.9684130552221212e-14,
+         9.842065276110607e-16, 1.6743967985533212e-37, 5.02785431289343e-43),
+        # MEGAPOUND
+        (4.5359237e-07, 0.00045359237, 0.45359237, 453.59237, 453592.37,
+         4535923.7, 45359237.0, 453592370.0, 4535923700.0, 45359237000.0,
+         453592370000.0, 453592370000000.0, 4.5359237e+17, 1.0, 1000.0,
+         1000000.0, 16000000.0, 7000000000.0, 10000.0, 500.0,
+         71428.57142857143, 8928.57142857143, 446.42857142857144,
+         7.594936121762135e-20, 2.280596353800052e-25),
+        # KILOPOUND
+        (4.5359237e-10, 4.5359237e-07, 0.00045359237, 0.45359237, 453.59237,
+         4535.9237, 45359.237, 453592.37, 4535923.7, 45359237.0,
+         453592370.0, 453592370000.0, 453592370000000.0, 0.001, 1.0, 1000.0,
+         16000.0, 7000000.0, 10.0, 0.5, 71.42857142857143,
+         8.928571428571429, 0.44642857142857145, 7.594936121762136e-23,
+         2.280596353800052e-28),
+        # POUND
+        (4.5359237e-13, 4.5359237e-10, 4.5359237e-07, 0.00045359237,
+         0.45359237, 4.5359237, 45.359237, 453.59237, 4535.9237, 45359.237,
+         453592.37, 453592370.0, 453592370000.0, 1e-06, 0.001, 1.0, 16.0,
+         7000.0, 0.01, 0.0005, 0.07142857142857142, 0.008928571428571428,
+         0.0004464285714285714, 7.594936121762135e-26, 2.280596353800052e-31),
+        # OUNCE
+        (2.8349523125e-14, 2.8349523125e-11, 2.8349523125e-08,
+         2.8349523125e-05, 0.028349523125, 0.28349523125, 2.8349523125,
+         28.349523125, 283.49523125, 2834.9523125, 28349.523125,
+         28349523.125, 28349523125.0, 6.25e-08, 6.25e-05, 0.0625, 1.0,
+         437.5, 0.000625, 3.125e-05, 0.004464285714285714,
+         0.0005580357142857143, 2.7901785714285713e-05,
+         4.746835076101335e-27, 1.4253727211250326e-32),
+        # GRAIN
+        (6.479891e-17, 6.479891e-14, 6.479891e-11, 6.479891e-08,
+         6.479891e-05, 0.0006479891, 0.006479891, 0.06479891, 0.6479891,
+         6.479891, 64.79891, 64798.91, 64798910.0, 1.4285714285714285e-10,
+         1.4285714285714285e-07, 0.00014285714285714287,
+         0.002285714285714286, 1.0, 1.4285714285714286e-06,
+         7.142857142857142e-08, 1.0204081632653061e-05,
+         1.2755102040816327e-06, 6.377551020408163e-08,
+         1.0849908745374478e-29, 3.2579947911429316e-35),
+        # SHORTHUNDREDWEIGHT
+        (4.5359237e-11, 4.5359237e-08, 4.5359237e-05, 0.045359237,
+         45.359237, 453.59237, 4535.9237, 45359.237, 453592.37, 4535923.7,
+         45359237.0, 45359237000.0, 45359237000000.0, 0.0001, 0.1, 100.0,
+         1600.0, 700000.0, 1.0, 0.05, 7.142857142857143, 0.8928571428571429,
+         0.044642857142857144, 7.594936121762136e-24, 2.2805963538000523e-29),
+        # SHORTTON
+        (9.0718474e-10, 9.0718474e-07, 0.00090718474, 0.90718474, 907.18474,
+         9071.8474, 90718.474, 907184.74, 9071847.4, 90718474.0,
+         907184740.0, 907184740000.0, 907184740000000.0, 0.002, 2.0, 2000.0,
+         32000.0, 14000000.0, 20.0, 1.0, 142.85714285714286,
+         17.857142857142858, 0.8928571428571429, 1.5189872243524271e-22,
+         4.561192707600104e-28),
+        # STONE
+        (6.35029318e-12, 6.35029318e-09, 6.35029318e-06, 0.00635029318,
+         6.35029318, 63.5029318, 635.029318, 6350.29318, 63502.9318,
+         635029.318, 6350293.18, 6350293180.0, 6350293180000.0, 1.4e-05,
+         0.014, 14.0, 224.0, 98000.0, 0.14, 0.007, 1.0, 0.125, 0.00625,
+         1.063291057046699e-24, 3.192834895320073e-30),
+        # LONGHUNDREDWEIGHT
+        (5.080234544e-11, 5.080234544e-08, 5.080234544e-05, 0.05080234544,
+         50.80234544, 508.0234544, 5080.234544, 50802.34544, 508023.4544,
+         5080234.544, 50802345.44, 50802345440.0, 50802345440000.0,
+         0.000112, 0.112, 112.0, 1792.0, 784000.0, 1.12, 0.056, 8.0, 1.0,
+         0.05, 8.506328456373591e-24, 2.5542679162560583e-29),
+        # LONGTON
+        (1.0160469088e-09, 1.0160469088e-06, 0.0010160469088, 1.0160469088,
+         1016.0469088, 10160.469088, 101604.69088, 1016046.9088,
+         10160469.088, 101604690.88, 1016046908.8, 1016046908800.0,
+         1016046908800000.0, 0.00224, 2.24, 2240.0, 35840.0, 15680000.0,
+         22.4, 1.12, 160.0, 20.0, 1.0, 1.7012656912747182e-22,
+         5.108535832512117e-28),
+        # EARTHMASS
+        (5972300000000.0, 5972300000000000.0, 5.9723e+18, 5.9723e+21,
+         5.9723e+24, 5.9723e+25, 5.9723e+26, 5.9723e+27, 5.9723e+28,
+         5.9723e+29, 5.9723e+30, 5.9723e+33, 5.9723e+36,
+         1.3166667684467444e+19, 1.3166667684467444e+22,
+         1.3166667684467443e+25, 2.106666829514791e+26,
+         9.216667379127211e+28, 1.3166667684467444e+23,
+         6.583333842233722e+21, 9.40476263176246e+23,
+         1.1755953289703075e+23, 5.877976644851538e+21, 1.0,
+         3.002785431289343e-06),
+        # SOLARMASS
+        (1.98892e+18, 1.98892e+21, 1.98892e+24, 1.98892e+27, 1.98892e+30,
+         1.98892e+31, 1.98892e+32, 1.98892e+33, 1.98892e+34, 1.98892e+35,
+         1.98892e+36, 1.98892e+39, 1.98892e+42, 4.3848180250474673e+24,
+         4.3848180250474674e+27, 4.384818025047467e+30,
+         7.015708840075947e+31, 3.069372617533227e+34,
+         4.384818025047467e+28, 2.1924090125237337e+27,
+         3.132012875033905e+29, 3.9150160937923814e+28,
+         1.9575080468961908e+27, 333024.1280578672, 1.0),
+    )
+    # Maps a unit system to the factors of its units in ascending order and
+    # the units themselves. The None entry holds all units.
+    units_by_factor = {
+        None: (
+            (1e-12, 1e-09, 1e-06, 1e-05, 6.479891e-05, 0.0001, 0.001, 0.01,
+             0.028349523125, 0.1, 0.45359237, 1.0, 6.35029318, 45.359237,
+             50.80234544, 453.59237, 907.18474, 1000.0, 1016.0469088,
+             453592.37, 1000000.0, 1000000000.0, 1000000000000.0,
+             5.9723e+24, 1.98892e+30),
+            (
+                MassUnit.NANOGRAM,
+                MassUnit.MICROGRAM,
+                MassUnit.MILLIGRAM,
+                MassUnit.CENTIGRAM,
+                MassUnit.GRAIN,
+                MassUnit.DECIGRAM,
+                MassUnit.GRAM,
+                MassUnit.DECAGRAM,
+                MassUnit.OUNCE,
+                MassUnit.HECTOGRAM,
+                MassUnit.POUND,
+                MassUnit.KILOGRAM,
+                MassUnit.STONE,
+                MassUnit.SHORTHUNDREDWEIGHT,
+                MassUnit.LONGHUNDREDWEIGHT,
+                MassUnit.KILOPOUND,
+                MassUnit.SHORTTON,
+                MassUnit.TONNE,
+                MassUnit.LONGTON,
+                MassUnit.MEGAPOUND,
+                MassUnit.KILOTONNE,
+                MassUnit.MEGATONNE,
+                MassUnit.GIGATONNE,
+                MassUnit.EARTHMASS,
+                MassUnit.SOLARMASS,
+            )),
+        'astronomical': (
+            (5.9723e+24, 1.98892e+30),
+            (
+                MassUnit.EARTHMASS,
+                MassUnit.SOLARMASS,
+            )),
+        'imperial': (
+            (6.479891e-05, 0.028349523125, 0.45359237, 6.35029318,
+             45.359237, 50.80234544, 453.59237, 907.18474, 1016.0469088,
+             453592.37),
+            (
+                MassUnit.GRAIN,
+                MassUnit.OUNCE,
+                MassUnit.POUND,
+                MassUnit.STONE,
+                MassUnit.SHORTHUNDREDWEIGHT,
+                MassUnit.LONGHUNDREDWEIGHT,
+                MassUnit.KILOPOUND,
+                MassUnit.SHORTTON,
+                MassUnit.LONGTON,
+                MassUnit.MEGAPOUND,
+            )),
+        'metric': (
+            (1e-12, 1e-09, 1e-06, 1e-05, 0.0001, 0.001, 0.01, 0.1, 1.0,
+             1000.0, 1000000.0, 1000000000.0, 1000000000000.0),
+            (
+                MassUnit.NANOGRAM,
+                MassUnit.MICROGRAM,
+                MassUnit.MILLIGRAM,
+                MassUnit.CENTIGRAM,
+                MassUnit.DECIGRAM,
+                MassUnit.GRAM,
+                MassUnit.DECAGRAM,
+                MassUnit.HECTOGRAM,
+                MassUnit.KILOGRAM,
+                MassUnit.TONNE,
+                MassUnit.KILOTONNE,
+                MassUnit.MEGATONNE,
+                MassUnit.GIGATONNE,
+            )),
+    }
+
+    # Instances are read-only through the public interface, so there is no
+    # need for a per-instance __dict__.
+    __slots__ = ('_value', '_unit')
 
     def __init__(self, value: float, unit: 'MassUnit') -> None:
+        if type(unit) is not MassUnit:
+            raise TypeError('{0} is not a MassUnit.'.format(unit))
+
         self._value = value
         self._unit = unit
 
     def __str__(self):
-        return "{value} {unit}".format(
-            value=str(self._value),
-            unit=Mass.abbreviations[self._unit])
+        return '{0} {1}'.format(
+            self._value, Mass.abbreviations_by_code[self._unit.code])
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # Pickles the unit as its value instead of a reference to the enum
+        # member.
+        return _from_unit_code, (self._value, self._unit.code)
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the quantity with a spec like ".3f~km".
+
+        The part before "~" formats the value, the optional part after it
+        selects the unit to convert to.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = Mass._get_unit(symbol)
 
-    def __repr__(self):
-        return str(self)
+        return '{0} {1}'.format(
+            format(self.as_unit(unit), value_spec),
+            Mass.abbreviations[unit])
 
     # Comparison operators
+    # All comparisons and the hash use the value in the base unit, so equal
+    # quantities given in different units hash equally.
     def __eq__(self, other):
-        return self._value == other.as_unit(self._unit)
+        if type(other) is not Mass:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() == other._get_value_in_base_unit()
+
+    def __lt__(self, other):
+        if type(other) is not Mass:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() < other._get_value_in_base_unit()
+
+    def __le__(self, other):
+        if type(other) is not Mass:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() <= other._get_value_in_base_unit()
+
+    def __gt__(self, other):
+        if type(other) is not Mass:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() > other._get_value_in_base_unit()
+
+    def __ge__(self, other):
+        if type(other) is not Mass:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() >= other._get_value_in_base_unit()
+
+    def __hash__(self):
+        return hash(self._get_value_in_base_unit())
 
     # Unary operators
     def __neg__(self):
@@ -87,6 +621,13 @@ class Mass:
 
         self._raise_type_error_for_undefined_operator(other, '+')
 
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
     def __sub__(self, other):
         if type(other) is Mass:
             return Mass(self._value - other.as_unit(self._unit), self._unit)
@@ -94,42 +635,19 @@ class Mass:
         self._raise_type_error_for_undefined_operator(other, '-')
 
     def __mul__(self, other):
-
-        if type(other) in (float, int):
-            result = Mass(self._value * other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '*')
-
-        return result
+        return dispatch(self, '*', other)
 
     def __rmul__(self, other):
-
-        if type(other) in (float, int, ):
-            return self * other
-
-        self._raise_type_error_for_undefined_operator(other, '*')
+        return dispatch(other, '*', self)
 
     def __truediv__(self, other):
+        return dispatch(self, '/', other)
 
-        if type(other) is Mass:
-            result = (self._get_value_in_base_unit()
-                    / other.as_unit(other.base_unit))
-        elif type(other) in (float, int):
-            result = Mass(self._value / other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '/')
-
-        return result
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
 
     def __pow__(self, other):
-        if type(other) in (float, int):
-            result = 1
-            for _ in range(other):
-              result *= self
-
-            return result
-        else:
-            self._raise_type_error_for_undefined_operator(other, '**')
+        return power(self, other)
 
     def _raise_type_error_for_undefined_operator(
             self, other, operator: str) -> None:
@@ -139,7 +657,70 @@ class Mass:
 
     @staticmethod
     def zero() -> 'Mass':
-        return Mass(0, Mass.base_unit)
+        return _ZERO
+
+    @staticmethod
+    def interned(value: float, unit: MassUnit) -> 'Mass':
+        """Returns a shared Mass for values which are created often.
+
+        The quantities of the last 256 distinct values and units are kept.
+        """
+        # 0.0 and -0.0 are equal, so the sign is part of the key.
+        return _interned(math.copysign(1, value), value, unit)
+
+    @staticmethod
+    def interned_cache_info():
+        """Returns the hits and misses of interned like lru_cache."""
+        return _interned.cache_info()
+
+    # Reductions
+    @staticmethod
+    def sum(quantities) -> 'Mass':
+        """Sums the quantities with math.fsum in the base unit."""
+        return Mass(math.fsum(Mass._get_base_values(quantities)), Mass.base_unit)
+
+    @staticmethod
+    def mean(quantities) -> 'Mass':
+        values = list(Mass._get_base_values(quantities))
+        if not values:
+            raise ValueError('mean() arg is an empty iterable')
+
+        return Mass(math.fsum(values) / len(values), Mass.base_unit)
+
+    @staticmethod
+    def min(quantities) -> 'Mass':
+        return Mass(min(Mass._get_base_values(quantities)), Mass.base_unit)
+
+    @staticmethod
+    def max(quantities) -> 'Mass':
+        return Mass(max(Mass._get_base_values(quantities)), Mass.base_unit)
+
+    @staticmethod
+    def std(quantities, ddof: int = 0) -> 'Mass':
+        """Standard deviation like numpy.std, in the base unit."""
+        values = list(Mass._get_base_values(quantities))
+        if len(values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} quantities'.format(ddof))
+
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((value - mean) ** 2 for value in values) / (
+            len(values) - ddof)
+
+        return Mass(math.sqrt(variance), Mass.base_unit)
+
+    @staticmethod
+    def parse(text: str) -> 'Mass':
+        value, symbol = split(text)
+
+        return Mass(value, Mass._get_unit(symbol))
+
+    @staticmethod
+    def from_bytes(data) -> 'Mass':
+        unit, value = unpack_quantity(
+            data, Mass.type_code, Mass.units_by_code)
+
+        return Mass(value, unit)
 
     @property
     def unit(self) -> MassUnit:
@@ -150,7 +731,7 @@ class Mass:
         return self._value
 
     def as_unit(self, unit: MassUnit) -> float:
-        if unit == self._unit:
+        if unit is self._unit:
             return self._value
 
         return self._get_value_as(unit)
@@ -160,6 +741,67 @@ class Mass:
 
         return Mass(converted_value, unit)
 
+    @staticmethod
+    def converter(from_unit: MassUnit, to_unit: MassUnit):
+        """Returns a function converting values from from_unit to to_unit.
+
+        The function takes a float, a NumPy array or a sequence of floats,
+        which is converted to a list.
+        """
+        if type(from_unit) is not MassUnit or type(to_unit) is not MassUnit:
+            raise TypeError('Can only convert between Mass units.')
+
+        factor = Mass.conversion_factors[from_unit.code][to_unit.code]
+
+        def convert(values):
+            try:
+                return values * factor
+            except TypeError:
+                return [value * factor for value in values]
+
+        return convert
+
+    def to_bytes(self) -> bytes:
+        return QUANTITY_FORMAT.pack(
+            Mass.type_code, self._unit.code, self._value)
+
+    def humanize(self, system: str = None) -> 'Mass':
+        """Converts to the largest unit which is not larger than the value.
+
+        system restricts the candidates to the units of one unit system,
+        like "metric" or "imperial".
+        """
+        factors, units = Mass._get_units_by_factor(system)
+        value = abs(self._get_value_in_base_unit())
+        if not units or value == 0 or not math.isfinite(value):
+            return self
+
+        index = max(bisect.bisect_right(factors, value) - 1, 0)
+
+        return self.to_unit(units[index])
+
+    def isclose(
+            self,
+            other: 'Mass',
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        """Like math.isclose, but for quantities in arbitrary units.
+
+        abs_tol is either a Mass or a float in the base unit.
+        """
+        if type(other) is not Mass:
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Mass:
+            abs_tol = abs_tol._get_value_in_base_unit()
+
+        return math.isclose(
+            self._get_value_in_base_unit(),
+            other._get_value_in_base_unit(),
+            rel_tol=rel_tol,
+            abs_tol=abs_tol)
+
     # Generation shorthands
     @staticmethod
     def from_gigatonnes(value: float) -> 'Mass':
@@ -362,21 +1004,67 @@ class Mass:
     def solarMasses(self) -> float:
         return self.as_unit(MassUnit.SOLARMASS)
 
+    @staticmethod
+    def _get_unit(symbol: str) -> MassUnit:
+        unit = lookup_unit(
+            Mass.units_by_symbol, Mass.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Mass unit "{0}".'.format(symbol))
+
+        return unit
+
+    @staticmethod
+    def _get_units_by_factor(system: str) -> tuple:
+        try:
+            return Mass.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+    @staticmethod
+    def _get_base_values(quantities):
+        # Yields the values of the quantities in the base unit without
+        # creating intermediate quantities.
+        factors = Mass.factors_by_code
+        for quantity in quantities:
+            if type(quantity) is not Mass:
+                raise TypeError(
+                    'Can not aggregate {0} with Mass.'.format(
+                        type(quantity).__name__))
+
+            yield quantity._value * factors[quantity._unit.code]
+
     def _to_base_unit(self) -> 'Mass':
         return self.to_unit(self.base_unit)
 
     def _get_value_in_base_unit(self) -> float:
-        try:
-            return self._value * Mass.factors[self._unit]
-        except KeyError:
-            raise NotImplementedError(
-                'Can not convert {0} to base units.'.format(self._unit.name))
+        return self._get_value_as(self.base_unit)
 
     def _get_value_as(self, unit: MassUnit) -> float:
-        base_unit_value = self._get_value_in_base_unit()
-
-        try:
-            return base_unit_value / Mass.factors[unit]
-        except KeyError:
+        # Units of other quantities have codes as well.
+        if type(unit) is not MassUnit:
             raise NotImplementedError(
                 'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        factor = Mass.conversion_factors[self._unit.code][unit.code]
+        try:
+            return self._value * factor
+        except TypeError:
+            # Decimal values do not multiply with float factors.
+            return float(self._value) * factor
+
+
+# Quantities are immutable, so all callers can share these instances.
+_ZERO = Mass(0, Mass.base_unit)
+
+
+# typed keeps 1 and 1.0 apart, so interned values keep the requested type.
+@functools.lru_cache(maxsize=256, typed=True)
+def _interned(
+        sign: float,
+        value: float,
+        unit: MassUnit) -> Mass:
+    return Mass(value, unit)
+
+
+def _from_unit_code(value: float, unit_code: int) -> Mass:
+    return Mass(value, Mass.units_by_code[unit_code])
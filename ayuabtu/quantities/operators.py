@@ -0,0 +1,131 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import math
+
+from ..dispatch import register, register_power
+from .area import Area
+from .electricCurrent import ElectricCurrent
+from .length import Length
+from .mass import Mass
+from .time import Time
+from .volume import Volume
+
+
+def _product_with_number(quantity_type: type):
+    def kernel(quantity, number):
+        return quantity_type(quantity._value * number, quantity._unit)
+
+    return kernel
+
+
+def _reflected_product_with_number(quantity_type: type):
+    def kernel(number, quantity):
+        return quantity_type(number * quantity._value, quantity._unit)
+
+    return kernel
+
+
+def _quotient_by_number(quantity_type: type):
+    def kernel(quantity, number):
+        return quantity_type(quantity._value / number, quantity._unit)
+
+    return kernel
+
+
+def _ratio(left, right) -> float:
+    return left._get_value_in_base_unit() / right._get_value_in_base_unit()
+
+
+def _product(result_type: type):
+    base_unit = result_type.base_unit
+
+    def kernel(left, right):
+        return result_type(
+            left._get_value_in_base_unit() * right._get_value_in_base_unit(),
+            base_unit)
+
+    return kernel
+
+
+def _quotient(result_type: type):
+    base_unit = result_type.base_unit
+
+    def kernel(left, right):
+        return result_type(
+            left._get_value_in_base_unit() / right._get_value_in_base_unit(),
+            base_unit)
+
+    return kernel
+
+
+def _power(result_type: type):
+    base_unit = result_type.base_unit
+
+    def kernel(base, exponent: float):
+        # math.pow raises ValueError for fractional powers of negative
+        # values, where ** would return a complex number.
+        return result_type(
+            math.pow(base._get_value_in_base_unit(), exponent), base_unit)
+
+    return kernel
+
+
+def _first_power(base, exponent: float):
+    return base
+
+
+def _zeroth_power(base, exponent: float):
+    return base._get_value_in_base_unit() ** exponent
+
+
+def _register_operators() -> None:
+    for quantity_type in (
+            Area,
+            ElectricCurrent,
+            Length,
+            Mass,
+            Time,
+            Volume,
+    ):
+        for number_type in (float, int):
+            register(quantity_type, '*', number_type, quantity_type,
+                     _product_with_number(quantity_type))
+            register(number_type, '*', quantity_type, quantity_type,
+                     _reflected_product_with_number(quantity_type))
+            register(quantity_type, '/', number_type, quantity_type,
+                     _quotient_by_number(quantity_type))
+
+        register(quantity_type, '/', quantity_type, float, _ratio)
+        register_power(quantity_type, 0.0, float, _zeroth_power)
+        register_power(quantity_type, 1.0, quantity_type, _first_power)
+
+    # Cross-quantity operators from the quantity definitions
+    register(Area, '*', Length, Volume,
+             _product(Volume))
+    register(Area, '/', Length, Length,
+             _quotient(Length))
+    register(Length, '*', Length, Area,
+             _product(Area))
+    register(Length, '*', Area, Volume,
+             _product(Volume))
+    register(Volume, '/', Length, Area,
+             _quotient(Area))
+    register(Volume, '/', Area, Length,
+             _quotient(Length))
+
+    # Powers and roots derived from the products above
+    register_power(Area, 0.5, Length,
+                   _power(Length))
+    register_power(Area, 1.5, Volume,
+                   _power(Volume))
+    register_power(Length, 2.0, Area,
+                   _power(Area))
+    register_power(Length, 3.0, Volume,
+                   _power(Volume))
+    register_power(Volume, 0.3333333333333333, Length,
+                   _power(Length))
+    register_power(Volume, 0.6666666666666666, Area,
+                   _power(Area))
+
+
+_register_operators()
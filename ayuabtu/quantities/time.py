@@ -1,10 +1,21 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+import bisect
+import functools
+import math
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split, split_format_spec
+from ..serialization import QUANTITY_FORMAT, unpack_quantity
 from ..units import TimeUnit
 
 
 class Time:
+    # Identifies the quantity in the binary format
+    type_code = 5
     base_unit = TimeUnit.SECOND
+    # Exponents of ayuabtu.dimensions.BASE_DIMENSIONS
+    dimension = (0, 0, 0, 1)
     factors = {
         TimeUnit.WEEK: 604800,
         TimeUnit.DAY: 86400,
@@ -25,22 +36,234 @@ class Time:
         TimeUnit.MICROSECOND: 'μs',
         TimeUnit.NANOSECOND: 'ns',
     }
+    # The tables by unit.code, for the operations which would otherwise
+    # hash the unit.
+    units_by_code = tuple(TimeUnit)
+    factors_by_code = (
+        604800,  # WEEK
+        86400,  # DAY
+        3600,  # HOUR
+        60,  # MINUTE
+        1e0,  # SECOND
+        1e-3,  # MILLISECOND
+        1e-6,  # MICROSECOND
+        1e-9,  # NANOSECOND
+    )
+    abbreviations_by_code = (
+        'wk',  # WEEK
+        'day',  # DAY
+        'hr',  # HOUR
+        'min',  # MINUTE
+        's',  # SECOND
+        'ms',  # MILLISECOND
+        'μs',  # MICROSECOND
+        'ns',  # NANOSECOND
+    )
+    # Maps abbreviations and unit names to units for parsing
+    units_by_symbol = {
+        'week': TimeUnit.WEEK,
+        'weeks': TimeUnit.WEEK,
+        'wk': TimeUnit.WEEK,
+        'day': TimeUnit.DAY,
+        'days': TimeUnit.DAY,
+        'h': TimeUnit.HOUR,
+        'hour': TimeUnit.HOUR,
+        'hours': TimeUnit.HOUR,
+        'hr': TimeUnit.HOUR,
+        'min': TimeUnit.MINUTE,
+        'minute': TimeUnit.MINUTE,
+        'minutes': TimeUnit.MINUTE,
+        's': TimeUnit.SECOND,
+        'second': TimeUnit.SECOND,
+        'seconds': TimeUnit.SECOND,
+        'millisecond': TimeUnit.MILLISECOND,
+        'milliseconds': TimeUnit.MILLISECOND,
+        'ms': TimeUnit.MILLISECOND,
+        'microsecond': TimeUnit.MICROSECOND,
+        'microseconds': TimeUnit.MICROSECOND,
+        'µs': TimeUnit.MICROSECOND,
+        'μs': TimeUnit.MICROSECOND,
+        'nanosecond': TimeUnit.NANOSECOND,
+        'nanoseconds': TimeUnit.NANOSECOND,
+        'ns': TimeUnit.NANOSECOND,
+    }
+    # Maps the lowercase unit names to units for case-insensitive parsing
+    units_by_name = {
+        'week': TimeUnit.WEEK,
+        'weeks': TimeUnit.WEEK,
+        'day': TimeUnit.DAY,
+        'days': TimeUnit.DAY,
+        'hour': TimeUnit.HOUR,
+        'hours': TimeUnit.HOUR,
+        'minute': TimeUnit.MINUTE,
+        'minutes': TimeUnit.MINUTE,
+        'second': TimeUnit.SECOND,
+        'seconds': TimeUnit.SECOND,
+        'millisecond': TimeUnit.MILLISECOND,
+        'milliseconds': TimeUnit.MILLISECOND,
+        'microsecond': TimeUnit.MICROSECOND,
+        'microseconds': TimeUnit.MICROSECOND,
+        'nanosecond': TimeUnit.NANOSECOND,
+        'nanoseconds': TimeUnit.NANOSECOND,
+    }
+    # conversion_factors[from_unit.code][to_unit.code] is the factor that
+    # converts a value given in from_unit into to_unit.
+    conversion_factors = (
+        # WEEK
+        (1.0, 7.0, 168.0, 10080.0, 604800.0, 604800000.0, 604800000000.0,
+         604800000000000.0),
+        # DAY
+        (0.14285714285714285, 1.0, 24.0, 1440.0, 86400.0, 86400000.0,
+         86400000000.0, 86400000000000.0),
+        # HOUR
+        (0.005952380952380952, 0.041666666666666664, 1.0, 60.0, 3600.0,
+         3600000.0, 3600000000.0, 3600000000000.0),
+        # MINUTE
+        (9.92063492063492e-05, 0.0006944444444444445, 0.016666666666666666,
+         1.0, 60.0, 60000.0, 60000000.0, 60000000000.0),
+        # SECOND
+        (1.6534391534391535e-06, 1.1574074074074073e-05,
+         0.0002777777777777778, 0.016666666666666666, 1.0, 1000.0,
+         1000000.0, 1000000000.0),
+        # MILLISECOND
+        (1.6534391534391535e-09, 1.1574074074074074e-08,
+         2.7777777777777776e-07, 1.6666666666666667e-05, 0.001, 1.0, 1000.0,
+         1000000.0),
+        # MICROSECOND
+        (1.6534391534391534e-12, 1.1574074074074074e-11,
+         2.7777777777777777e-10, 1.6666666666666667e-08, 1e-06, 0.001, 1.0,
+         1000.0),
+        # NANOSECOND
+        (1.6534391534391534e-15, 1.1574074074074074e-14,
+         2.777777777777778e-13, 1.6666666666666667e-11, 1e-09, 1e-06, 0.001,
+         1.0),
+    )
+    # Maps a unit system to the factors of its units in ascending order and
+    # the units themselves. The None entry holds all units.
+    units_by_factor = {
+        None: (
+            (1e-09, 1e-06, 0.001, 1.0, 60.0, 3600.0, 86400.0, 604800.0),
+            (
+                TimeUnit.NANOSECOND,
+                TimeUnit.MICROSECOND,
+                TimeUnit.MILLISECOND,
+                TimeUnit.SECOND,
+                TimeUnit.MINUTE,
+                TimeUnit.HOUR,
+                TimeUnit.DAY,
+                TimeUnit.WEEK,
+            )),
+        'astronomical': (
+            (1e-09, 1e-06, 0.001, 1.0, 60.0, 3600.0, 86400.0, 604800.0),
+            (
+                TimeUnit.NANOSECOND,
+                TimeUnit.MICROSECOND,
+                TimeUnit.MILLISECOND,
+                TimeUnit.SECOND,
+                TimeUnit.MINUTE,
+                TimeUnit.HOUR,
+                TimeUnit.DAY,
+                TimeUnit.WEEK,
+            )),
+        'imperial': (
+            (1e-09, 1e-06, 0.001, 1.0, 60.0, 3600.0, 86400.0, 604800.0),
+            (
+                TimeUnit.NANOSECOND,
+                TimeUnit.MICROSECOND,
+                TimeUnit.MILLISECOND,
+                TimeUnit.SECOND,
+                TimeUnit.MINUTE,
+                TimeUnit.HOUR,
+                TimeUnit.DAY,
+                TimeUnit.WEEK,
+            )),
+        'metric': (
+            (1e-09, 1e-06, 0.001, 1.0, 60.0, 3600.0, 86400.0, 604800.0),
+            (
+                TimeUnit.NANOSECOND,
+                TimeUnit.MICROSECOND,
+                TimeUnit.MILLISECOND,
+                TimeUnit.SECOND,
+                TimeUnit.MINUTE,
+                TimeUnit.HOUR,
+                TimeUnit.DAY,
+                TimeUnit.WEEK,
+            )),
+    }
+
+    # Instances are read-only through the public interface, so there is no
+    # need for a per-instance __dict__.
+    __slots__ = ('_value', '_unit')
 
     def __init__(self, value: float, unit: 'TimeUnit') -> None:
+        if type(unit) is not TimeUnit:
+            raise TypeError('{0} is not a TimeUnit.'.format(unit))
+
         self._value = value
         self._unit = unit
 
     def __str__(self):
-        return "{value} {unit}".format(
-            value=str(self._value),
-            unit=Time.abbreviations[self._unit])
+        return '{0} {1}'.format(
+            self._value, Time.abbreviations_by_code[self._unit.code])
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # Pickles the unit as its value instead of a reference to the enum
+        # member.
+        return _from_unit_code, (self._value, self._unit.code)
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the quantity with a spec like ".3f~km".
+
+        The part before "~" formats the value, the optional part after it
+        selects the unit to convert to.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = Time._get_unit(symbol)
 
-    def __repr__(self):
-        return str(self)
+        return '{0} {1}'.format(
+            format(self.as_unit(unit), value_spec),
+            Time.abbreviations[unit])
 
     # Comparison operators
+    # All comparisons and the hash use the value in the base unit, so equal
+    # quantities given in different units hash equally.
     def __eq__(self, other):
-        return self._value == other.as_unit(self._unit)
+        if type(other) is not Time:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() == other._get_value_in_base_unit()
+
+    def __lt__(self, other):
+        if type(other) is not Time:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() < other._get_value_in_base_unit()
+
+    def __le__(self, other):
+        if type(other) is not Time:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() <= other._get_value_in_base_unit()
+
+    def __gt__(self, other):
+        if type(other) is not Time:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() > other._get_value_in_base_unit()
+
+    def __ge__(self, other):
+        if type(other) is not Time:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() >= other._get_value_in_base_unit()
+
+    def __hash__(self):
+        return hash(self._get_value_in_base_unit())
 
     # Unary operators
     def __neg__(self):
@@ -53,6 +276,13 @@ class Time:
 
         self._raise_type_error_for_undefined_operator(other, '+')
 
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
     def __sub__(self, other):
         if type(other) is Time:
             return Time(self._value - other.as_unit(self._unit), self._unit)
@@ -60,42 +290,19 @@ class Time:
         self._raise_type_error_for_undefined_operator(other, '-')
 
     def __mul__(self, other):
-
-        if type(other) in (float, int):
-            result = Time(self._value * other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '*')
-
-        return result
+        return dispatch(self, '*', other)
 
     def __rmul__(self, other):
-
-        if type(other) in (float, int, ):
-            return self * other
-
-        self._raise_type_error_for_undefined_operator(other, '*')
+        return dispatch(other, '*', self)
 
     def __truediv__(self, other):
+        return dispatch(self, '/', other)
 
-        if type(other) is Time:
-            result = (self._get_value_in_base_unit()
-                    / other.as_unit(other.base_unit))
-        elif type(other) in (float, int):
-            result = Time(self._value / other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '/')
-
-        return result
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
 
     def __pow__(self, other):
-        if type(other) in (float, int):
-            result = 1
-            for _ in range(other):
-              result *= self
-
-            return result
-        else:
-            self._raise_type_error_for_undefined_operator(other, '**')
+        return power(self, other)
 
     def _raise_type_error_for_undefined_operator(
             self, other, operator: str) -> None:
@@ -105,7 +312,70 @@ class Time:
 
     @staticmethod
     def zero() -> 'Time':
-        return Time(0, Time.base_unit)
+        return _ZERO
+
+    @staticmethod
+    def interned(value: float, unit: TimeUnit) -> 'Time':
+        """Returns a shared Time for values which are created often.
+
+        The quantities of the last 256 distinct values and units are kept.
+        """
+        # 0.0 and -0.0 are equal, so the sign is part of the key.
+        return _interned(math.copysign(1, value), value, unit)
+
+    @staticmethod
+    def interned_cache_info():
+        """Returns the hits and misses of interned like lru_cache."""
+        return _interned.cache_info()
+
+    # Reductions
+    @staticmethod
+    def sum(quantities) -> 'Time':
+        """Sums the quantities with math.fsum in the base unit."""
+        return Time(math.fsum(Time._get_base_values(quantities)), Time.base_unit)
+
+    @staticmethod
+    def mean(quantities) -> 'Time':
+        values = list(Time._get_base_values(quantities))
+        if not values:
+            raise ValueError('mean() arg is an empty iterable')
+
+        return Time(math.fsum(values) / len(values), Time.base_unit)
+
+    @staticmethod
+    def min(quantities) -> 'Time':
+        return Time(min(Time._get_base_values(quantities)), Time.base_unit)
+
+    @staticmethod
+    def max(quantities) -> 'Time':
+        return Time(max(Time._get_base_values(quantities)), Time.base_unit)
+
+    @staticmethod
+    def std(quantities, ddof: int = 0) -> 'Time':
+        """Standard deviation like numpy.std, in the base unit."""
+        values = list(Time._get_base_values(quantities))
+        if len(values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} quantities'.format(ddof))
+
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((value - mean) ** 2 for value in values) / (
+            len(values) - ddof)
+
+        return Time(math.sqrt(variance), Time.base_unit)
+
+    @staticmethod
+    def parse(text: str) -> 'Time':
+        value, symbol = split(text)
+
+        return Time(value, Time._get_unit(symbol))
+
+    @staticmethod
+    def from_bytes(data) -> 'Time':
+        unit, value = unpack_quantity(
+            data, Time.type_code, Time.units_by_code)
+
+        return Time(value, unit)
 
     @property
     def unit(self) -> TimeUnit:
@@ -116,7 +386,7 @@ class Time:
         return self._value
 
     def as_unit(self, unit: TimeUnit) -> float:
-        if unit == self._unit:
+        if unit is self._unit:
             return self._value
 
         return self._get_value_as(unit)
@@ -126,6 +396,67 @@ class Time:
 
         return Time(converted_value, unit)
 
+    @staticmethod
+    def converter(from_unit: TimeUnit, to_unit: TimeUnit):
+        """Returns a function converting values from from_unit to to_unit.
+
+        The function takes a float, a NumPy array or a sequence of floats,
+        which is converted to a list.
+        """
+        if type(from_unit) is not TimeUnit or type(to_unit) is not TimeUnit:
+            raise TypeError('Can only convert between Time units.')
+
+        factor = Time.conversion_factors[from_unit.code][to_unit.code]
+
+        def convert(values):
+            try:
+                return values * factor
+            except TypeError:
+                return [value * factor for value in values]
+
+        return convert
+
+    def to_bytes(self) -> bytes:
+        return QUANTITY_FORMAT.pack(
+            Time.type_code, self._unit.code, self._value)
+
+    def humanize(self, system: str = None) -> 'Time':
+        """Converts to the largest unit which is not larger than the value.
+
+        system restricts the candidates to the units of one unit system,
+        like "metric" or "imperial".
+        """
+        factors, units = Time._get_units_by_factor(system)
+        value = abs(self._get_value_in_base_unit())
+        if not units or value == 0 or not math.isfinite(value):
+            return self
+
+        index = max(bisect.bisect_right(factors, value) - 1, 0)
+
+        return self.to_unit(units[index])
+
+    def isclose(
+            self,
+            other: 'Time',
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        """Like math.isclose, but for quantities in arbitrary units.
+
+        abs_tol is either a Time or a float in the base unit.
+        """
+        if type(other) is not Time:
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Time:
+            abs_tol = abs_tol._get_value_in_base_unit()
+
+        return math.isclose(
+            self._get_value_in_base_unit(),
+            other._get_value_in_base_unit(),
+            rel_tol=rel_tol,
+            abs_tol=abs_tol)
+
     # Generation shorthands
     @staticmethod
     def from_weeks(value: float) -> 'Time':
@@ -192,21 +523,67 @@ class Time:
     def nanoseconds(self) -> float:
         return self.as_unit(TimeUnit.NANOSECOND)
 
+    @staticmethod
+    def _get_unit(symbol: str) -> TimeUnit:
+        unit = lookup_unit(
+            Time.units_by_symbol, Time.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Time unit "{0}".'.format(symbol))
+
+        return unit
+
+    @staticmethod
+    def _get_units_by_factor(system: str) -> tuple:
+        try:
+            return Time.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+    @staticmethod
+    def _get_base_values(quantities):
+        # Yields the values of the quantities in the base unit without
+        # creating intermediate quantities.
+        factors = Time.factors_by_code
+        for quantity in quantities:
+            if type(quantity) is not Time:
+                raise TypeError(
+                    'Can not aggregate {0} with Time.'.format(
+                        type(quantity).__name__))
+
+            yield quantity._value * factors[quantity._unit.code]
+
     def _to_base_unit(self) -> 'Time':
         return self.to_unit(self.base_unit)
 
     def _get_value_in_base_unit(self) -> float:
-        try:
-            return self._value * Time.factors[self._unit]
-        except KeyError:
-            raise NotImplementedError(
-                'Can not convert {0} to base units.'.format(self._unit.name))
+        return self._get_value_as(self.base_unit)
 
     def _get_value_as(self, unit: TimeUnit) -> float:
-        base_unit_value = self._get_value_in_base_unit()
-
-        try:
-            return base_unit_value / Time.factors[unit]
-        except KeyError:
+        # Units of other quantities have codes as well.
+        if type(unit) is not TimeUnit:
             raise NotImplementedError(
                 'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        factor = Time.conversion_factors[self._unit.code][unit.code]
+        try:
+            return self._value * factor
+        except TypeError:
+            # Decimal values do not multiply with float factors.
+            return float(self._value) * factor
+
+
+# Quantities are immutable, so all callers can share these instances.
+_ZERO = Time(0, Time.base_unit)
+
+
+# typed keeps 1 and 1.0 apart, so interned values keep the requested type.
+@functools.lru_cache(maxsize=256, typed=True)
+def _interned(
+        sign: float,
+        value: float,
+        unit: TimeUnit) -> Time:
+    return Time(value, unit)
+
+
+def _from_unit_code(value: float, unit_code: int) -> Time:
+    return Time(value, Time.units_by_code[unit_code])
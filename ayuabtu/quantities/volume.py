@@ -1,32 +1,149 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+import bisect
+import functools
+import math
+
+from ..dispatch import dispatch, power
+from ..parsing import lookup_unit, split, split_format_spec
+from ..serialization import QUANTITY_FORMAT, unpack_quantity
 from ..units import VolumeUnit
 
 
 class Volume:
+    # Identifies the quantity in the binary format
+    type_code = 6
     base_unit = VolumeUnit.CUBICMETER
+    # Exponents of ayuabtu.dimensions.BASE_DIMENSIONS
+    dimension = (0, 3, 0, 0)
     factors = {
         VolumeUnit.CUBICMETER: 1,
     }
     abbreviations = {
         VolumeUnit.CUBICMETER: 'm³',
     }
+    # The tables by unit.code, for the operations which would otherwise
+    # hash the unit.
+    units_by_code = tuple(VolumeUnit)
+    factors_by_code = (
+        1,  # CUBICMETER
+    )
+    abbreviations_by_code = (
+        'm³',  # CUBICMETER
+    )
+    # Maps abbreviations and unit names to units for parsing
+    units_by_symbol = {
+        'cubic meter': VolumeUnit.CUBICMETER,
+        'cubic meters': VolumeUnit.CUBICMETER,
+        'm³': VolumeUnit.CUBICMETER,
+    }
+    # Maps the lowercase unit names to units for case-insensitive parsing
+    units_by_name = {
+        'cubic meter': VolumeUnit.CUBICMETER,
+        'cubic meters': VolumeUnit.CUBICMETER,
+    }
+    # conversion_factors[from_unit.code][to_unit.code] is the factor that
+    # converts a value given in from_unit into to_unit.
+    conversion_factors = (
+        # CUBICMETER
+        (1.0,),
+    )
+    # Maps a unit system to the factors of its units in ascending order and
+    # the units themselves. The None entry holds all units.
+    units_by_factor = {
+        None: (
+            (1.0,),
+            (
+                VolumeUnit.CUBICMETER,
+            )),
+        'astronomical': (
+            (),
+            (
+            )),
+        'imperial': (
+            (),
+            (
+            )),
+        'metric': (
+            (1.0,),
+            (
+                VolumeUnit.CUBICMETER,
+            )),
+    }
+
+    # Instances are read-only through the public interface, so there is no
+    # need for a per-instance __dict__.
+    __slots__ = ('_value', '_unit')
 
     def __init__(self, value: float, unit: 'VolumeUnit') -> None:
+        if type(unit) is not VolumeUnit:
+            raise TypeError('{0} is not a VolumeUnit.'.format(unit))
+
         self._value = value
         self._unit = unit
 
     def __str__(self):
-        return "{value} {unit}".format(
-            value=str(self._value),
-            unit=Volume.abbreviations[self._unit])
+        return '{0} {1}'.format(
+            self._value, Volume.abbreviations_by_code[self._unit.code])
+
+    __repr__ = __str__
+
+    def __reduce__(self):
+        # Pickles the unit as its value instead of a reference to the enum
+        # member.
+        return _from_unit_code, (self._value, self._unit.code)
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the quantity with a spec like ".3f~km".
+
+        The part before "~" formats the value, the optional part after it
+        selects the unit to convert to.
+        """
+        value_spec, symbol = split_format_spec(format_spec)
+        if symbol is None:
+            unit = self._unit
+        else:
+            unit = Volume._get_unit(symbol)
 
-    def __repr__(self):
-        return str(self)
+        return '{0} {1}'.format(
+            format(self.as_unit(unit), value_spec),
+            Volume.abbreviations[unit])
 
     # Comparison operators
+    # All comparisons and the hash use the value in the base unit, so equal
+    # quantities given in different units hash equally.
     def __eq__(self, other):
-        return self._value == other.as_unit(self._unit)
+        if type(other) is not Volume:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() == other._get_value_in_base_unit()
+
+    def __lt__(self, other):
+        if type(other) is not Volume:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() < other._get_value_in_base_unit()
+
+    def __le__(self, other):
+        if type(other) is not Volume:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() <= other._get_value_in_base_unit()
+
+    def __gt__(self, other):
+        if type(other) is not Volume:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() > other._get_value_in_base_unit()
+
+    def __ge__(self, other):
+        if type(other) is not Volume:
+            return NotImplemented
+
+        return self._get_value_in_base_unit() >= other._get_value_in_base_unit()
+
+    def __hash__(self):
+        return hash(self._get_value_in_base_unit())
 
     # Unary operators
     def __neg__(self):
@@ -39,6 +156,13 @@ class Volume:
 
         self._raise_type_error_for_undefined_operator(other, '+')
 
+    def __radd__(self, other):
+        # Lets the builtin sum start with 0.
+        if type(other) is int and other == 0:
+            return self
+
+        self._raise_type_error_for_undefined_operator(other, '+')
+
     def __sub__(self, other):
         if type(other) is Volume:
             return Volume(self._value - other.as_unit(self._unit), self._unit)
@@ -46,52 +170,19 @@ class Volume:
         self._raise_type_error_for_undefined_operator(other, '-')
 
     def __mul__(self, other):
-
-        if type(other) in (float, int):
-            result = Volume(self._value * other, self._unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '*')
-
-        return result
+        return dispatch(self, '*', other)
 
     def __rmul__(self, other):
-
-        if type(other) in (float, int, ):
-            return self * other
-
-        self._raise_type_error_for_undefined_operator(other, '*')
+        return dispatch(other, '*', self)
 
     def __truediv__(self, other):
-        from .length import Length
-        from .area import Area
-
-        if type(other) is Volume:
-            result = (self._get_value_in_base_unit()
-                    / other.as_unit(other.base_unit))
-        elif type(other) in (float, int):
-            result = Volume(self._value / other, self._unit)
-        elif type(other) is Length:
-            result = Area(
-                self.as_unit(self.base_unit) / other.as_unit(other.base_unit),
-                Area.base_unit)
-        elif type(other) is Area:
-            result = Length(
-                self.as_unit(self.base_unit) / other.as_unit(other.base_unit),
-                Length.base_unit)
-        else:
-            self._raise_type_error_for_undefined_operator(other, '/')
+        return dispatch(self, '/', other)
 
-        return result
+    def __rtruediv__(self, other):
+        return dispatch(other, '/', self)
 
     def __pow__(self, other):
-        if type(other) in (float, int):
-            result = 1
-            for _ in range(other):
-              result *= self
-
-            return result
-        else:
-            self._raise_type_error_for_undefined_operator(other, '**')
+        return power(self, other)
 
     def _raise_type_error_for_undefined_operator(
             self, other, operator: str) -> None:
@@ -101,7 +192,70 @@ class Volume:
 
     @staticmethod
     def zero() -> 'Volume':
-        return Volume(0, Volume.base_unit)
+        return _ZERO
+
+    @staticmethod
+    def interned(value: float, unit: VolumeUnit) -> 'Volume':
+        """Returns a shared Volume for values which are created often.
+
+        The quantities of the last 256 distinct values and units are kept.
+        """
+        # 0.0 and -0.0 are equal, so the sign is part of the key.
+        return _interned(math.copysign(1, value), value, unit)
+
+    @staticmethod
+    def interned_cache_info():
+        """Returns the hits and misses of interned like lru_cache."""
+        return _interned.cache_info()
+
+    # Reductions
+    @staticmethod
+    def sum(quantities) -> 'Volume':
+        """Sums the quantities with math.fsum in the base unit."""
+        return Volume(math.fsum(Volume._get_base_values(quantities)), Volume.base_unit)
+
+    @staticmethod
+    def mean(quantities) -> 'Volume':
+        values = list(Volume._get_base_values(quantities))
+        if not values:
+            raise ValueError('mean() arg is an empty iterable')
+
+        return Volume(math.fsum(values) / len(values), Volume.base_unit)
+
+    @staticmethod
+    def min(quantities) -> 'Volume':
+        return Volume(min(Volume._get_base_values(quantities)), Volume.base_unit)
+
+    @staticmethod
+    def max(quantities) -> 'Volume':
+        return Volume(max(Volume._get_base_values(quantities)), Volume.base_unit)
+
+    @staticmethod
+    def std(quantities, ddof: int = 0) -> 'Volume':
+        """Standard deviation like numpy.std, in the base unit."""
+        values = list(Volume._get_base_values(quantities))
+        if len(values) <= ddof:
+            raise ValueError(
+                'std() needs more than {0} quantities'.format(ddof))
+
+        mean = math.fsum(values) / len(values)
+        variance = math.fsum((value - mean) ** 2 for value in values) / (
+            len(values) - ddof)
+
+        return Volume(math.sqrt(variance), Volume.base_unit)
+
+    @staticmethod
+    def parse(text: str) -> 'Volume':
+        value, symbol = split(text)
+
+        return Volume(value, Volume._get_unit(symbol))
+
+    @staticmethod
+    def from_bytes(data) -> 'Volume':
+        unit, value = unpack_quantity(
+            data, Volume.type_code, Volume.units_by_code)
+
+        return Volume(value, unit)
 
     @property
     def unit(self) -> VolumeUnit:
@@ -112,7 +266,7 @@ class Volume:
         return self._value
 
     def as_unit(self, unit: VolumeUnit) -> float:
-        if unit == self._unit:
+        if unit is self._unit:
             return self._value
 
         return self._get_value_as(unit)
@@ -122,6 +276,67 @@ class Volume:
 
         return Volume(converted_value, unit)
 
+    @staticmethod
+    def converter(from_unit: VolumeUnit, to_unit: VolumeUnit):
+        """Returns a function converting values from from_unit to to_unit.
+
+        The function takes a float, a NumPy array or a sequence of floats,
+        which is converted to a list.
+        """
+        if type(from_unit) is not VolumeUnit or type(to_unit) is not VolumeUnit:
+            raise TypeError('Can only convert between Volume units.')
+
+        factor = Volume.conversion_factors[from_unit.code][to_unit.code]
+
+        def convert(values):
+            try:
+                return values * factor
+            except TypeError:
+                return [value * factor for value in values]
+
+        return convert
+
+    def to_bytes(self) -> bytes:
+        return QUANTITY_FORMAT.pack(
+            Volume.type_code, self._unit.code, self._value)
+
+    def humanize(self, system: str = None) -> 'Volume':
+        """Converts to the largest unit which is not larger than the value.
+
+        system restricts the candidates to the units of one unit system,
+        like "metric" or "imperial".
+        """
+        factors, units = Volume._get_units_by_factor(system)
+        value = abs(self._get_value_in_base_unit())
+        if not units or value == 0 or not math.isfinite(value):
+            return self
+
+        index = max(bisect.bisect_right(factors, value) - 1, 0)
+
+        return self.to_unit(units[index])
+
+    def isclose(
+            self,
+            other: 'Volume',
+            rel_tol: float = 1e-09,
+            abs_tol=0.0) -> bool:
+        """Like math.isclose, but for quantities in arbitrary units.
+
+        abs_tol is either a Volume or a float in the base unit.
+        """
+        if type(other) is not Volume:
+            raise TypeError(
+                'Can not compare {0} with {1}.'.format(
+                    type(self).__name__, type(other).__name__))
+        if type(abs_tol) is Volume:
+            abs_tol = abs_tol._get_value_in_base_unit()
+
+        return math.isclose(
+            self._get_value_in_base_unit(),
+            other._get_value_in_base_unit(),
+            rel_tol=rel_tol,
+            abs_tol=abs_tol)
+
     # Generation shorthands
     @staticmethod
     def from_cubicMeters(value: float) -> 'Volume':
@@ -132,21 +347,67 @@ class Volume:
     def cubicMeters(self) -> float:
         return self.as_unit(VolumeUnit.CUBICMETER)
 
+    @staticmethod
+    def _get_unit(symbol: str) -> VolumeUnit:
+        unit = lookup_unit(
+            Volume.units_by_symbol, Volume.units_by_name, symbol)
+        if unit is None:
+            raise ValueError('Unknown Volume unit "{0}".'.format(symbol))
+
+        return unit
+
+    @staticmethod
+    def _get_units_by_factor(system: str) -> tuple:
+        try:
+            return Volume.units_by_factor[system]
+        except KeyError:
+            raise ValueError('Unknown unit system "{0}".'.format(system))
+
+    @staticmethod
+    def _get_base_values(quantities):
+        # Yields the values of the quantities in the base unit without
+        # creating intermediate quantities.
+        factors = Volume.factors_by_code
+        for quantity in quantities:
+            if type(quantity) is not Volume:
+                raise TypeError(
+                    'Can not aggregate {0} with Volume.'.format(
+                        type(quantity).__name__))
+
+            yield quantity._value * factors[quantity._unit.code]
+
     def _to_base_unit(self) -> 'Volume':
         return self.to_unit(self.base_unit)
 
     def _get_value_in_base_unit(self) -> float:
-        try:
-            return self._value * Volume.factors[self._unit]
-        except KeyError:
-            raise NotImplementedError(
-                'Can not convert {0} to base units.'.format(self._unit.name))
+        return self._get_value_as(self.base_unit)
 
     def _get_value_as(self, unit: VolumeUnit) -> float:
-        base_unit_value = self._get_value_in_base_unit()
-
-        try:
-            return base_unit_value / Volume.factors[unit]
-        except KeyError:
+        # Units of other quantities have codes as well.
+        if type(unit) is not VolumeUnit:
             raise NotImplementedError(
                 'Can not convert {0} to {1}.'.format(self._unit.name, unit))
+
+        factor = Volume.conversion_factors[self._unit.code][unit.code]
+        try:
+            return self._value * factor
+        except TypeError:
+            # Decimal values do not multiply with float factors.
+            return float(self._value) * factor
+
+
+# Quantities are immutable, so all callers can share these instances.
+_ZERO = Volume(0, Volume.base_unit)
+
+
+# typed keeps 1 and 1.0 apart, so interned values keep the requested type.
+@functools.lru_cache(maxsize=256, typed=True)
+def _interned(
+        sign: float,
+        value: float,
+        unit: VolumeUnit) -> Volume:
+    return Volume(value, unit)
+
+
+def _from_unit_code(value: float, unit_code: int) -> Volume:
+    return Volume(value, Volume.units_by_code[unit_code])
@@ -0,0 +1,118 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+import struct
+from typing import Tuple
+
+# A quantity is encoded as the code of its type, the code of its unit and
+# its value as little-endian float64.
+QUANTITY_FORMAT = struct.Struct('<BBd')
+# A quantity array is encoded as this header, holding the type code, the
+# unit code and the number of values, followed by the values as
+# little-endian float64. The header is padded to keep the values aligned.
+ARRAY_HEADER_FORMAT = struct.Struct('<BB6xQ')
+# Is set in the type code of arrays
+ARRAY_FLAG = 0x80
+
+# Maps the type codes to the quantity and quantity array types. The table
+# is populated on first use because the quantity modules import this one.
+_types_by_code = {}
+
+
+def from_bytes(data):
+    """Decodes a quantity or a quantity array of any type."""
+    if not _types_by_code:
+        _load_types_by_code()
+
+    if not len(data):
+        raise ValueError('Can not decode empty data.')
+
+    type_code = memoryview(data).cast('B')[0]
+    try:
+        decoded_type = _types_by_code[type_code]
+    except KeyError:
+        raise ValueError('Unknown type code {0}.'.format(type_code))
+
+    return decoded_type.from_bytes(data)
+
+
+def unpack_quantity(data, type_code: int, units: tuple) -> Tuple[object, float]:
+    try:
+        data_type_code, unit_code, value = QUANTITY_FORMAT.unpack(data)
+    except struct.error:
+        raise ValueError(
+            'Expected {0} bytes for a quantity.'.format(QUANTITY_FORMAT.size))
+
+    _raise_error_if_type_code_differs(data_type_code, type_code)
+
+    return _get_unit(units, unit_code), value
+
+
+def unpack_array_header(data, type_code: int, units: tuple) -> Tuple[object, int]:
+    try:
+        data_type_code, unit_code, size = ARRAY_HEADER_FORMAT.unpack_from(data)
+    except struct.error:
+        raise ValueError('The data is too short for a quantity array.')
+
+    _raise_error_if_type_code_differs(data_type_code, type_code | ARRAY_FLAG)
+    if memoryview(data).nbytes != ARRAY_HEADER_FORMAT.size + 8 * size:
+        raise ValueError(
+            'The data does not hold the {0} values of its header.'.format(size))
+
+    return _get_unit(units, unit_code), size
+
+
+def _raise_error_if_type_code_differs(data_type_code: int, type_code: int):
+    if data_type_code != type_code:
+        raise ValueError(
+            'Expected type code {0}, got {1}.'.format(type_code, data_type_code))
+
+
+def _get_unit(units: tuple, unit_code: int):
+    try:
+        return units[unit_code]
+    except IndexError:
+        raise ValueError('Unknown unit code {0}.'.format(unit_code))
+
+
+def _load_types_by_code() -> None:
+    from .quantities import (
+        Area,
+        ElectricCurrent,
+        Length,
+        Mass,
+        Time,
+        Volume,
+    )
+
+    for quantity_type in (
+            Area,
+            ElectricCurrent,
+            Length,
+            Mass,
+            Time,
+            Volume,
+    ):
+        _types_by_code[quantity_type.type_code] = quantity_type
+
+    # The arrays are only available if numpy is installed.
+    try:
+        from .arrays import (
+            AreaArray,
+            ElectricCurrentArray,
+            LengthArray,
+            MassArray,
+            TimeArray,
+            VolumeArray,
+        )
+    except ImportError:
+        return
+
+    for array_type in (
+            AreaArray,
+            ElectricCurrentArray,
+            LengthArray,
+            MassArray,
+            TimeArray,
+            VolumeArray,
+    ):
+        _types_by_code[array_type.type_code | ARRAY_FLAG] = array_type
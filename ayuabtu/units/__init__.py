@@ -1,6 +1,6 @@
-from .lengthUnit import LengthUnit
+from .areaUnit import AreaUnit
 from .electricCurrentUnit import ElectricCurrentUnit
-from .timeUnit import TimeUnit
+from .lengthUnit import LengthUnit
 from .massUnit import MassUnit
-from .areaUnit import AreaUnit
+from .timeUnit import TimeUnit
 from .volumeUnit import VolumeUnit
@@ -16,3 +16,9 @@ class AreaUnit(Enum):
     SQUAREYARD = 10
     SQUAREMILE = 11
     ACRE = 12
+
+    def __init__(self, value: int) -> None:
+        # The code is the position of the unit. It indexes the tables of the
+        # quantity, like conversion_factors[unit.code], without hashing the
+        # unit.
+        self.code = value - 1
@@ -12,3 +12,9 @@ class ElectricCurrentUnit(Enum):
     MICROAMPERE = 6
     NANOAMPERE = 7
     PICOAMPERE = 8
+
+    def __init__(self, value: int) -> None:
+        # The code is the position of the unit. It indexes the tables of the
+        # quantity, like conversion_factors[unit.code], without hashing the
+        # unit.
+        self.code = value - 1
@@ -17,3 +17,9 @@ class LengthUnit(Enum):
     FOOT = 11
     YARD = 12
     MILE = 13
+
+    def __init__(self, value: int) -> None:
+        # The code is the position of the unit. It indexes the tables of the
+        # quantity, like conversion_factors[unit.code], without hashing the
+        # unit.
+        self.code = value - 1
@@ -29,3 +29,9 @@ class MassUnit(Enum):
     LONGTON = 23
     EARTHMASS = 24
     SOLARMASS = 25
+
+    def __init__(self, value: int) -> None:
+        # The code is the position of the unit. It indexes the tables of the
+        # quantity, like conversion_factors[unit.code], without hashing the
+        # unit.
+        self.code = value - 1
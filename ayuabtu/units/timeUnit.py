@@ -12,3 +12,9 @@ class TimeUnit(Enum):
     MILLISECOND = 6
     MICROSECOND = 7
     NANOSECOND = 8
+
+    def __init__(self, value: int) -> None:
+        # The code is the position of the unit. It indexes the tables of the
+        # quantity, like conversion_factors[unit.code], without hashing the
+        # unit.
+        self.code = value - 1
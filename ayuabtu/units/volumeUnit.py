@@ -5,3 +5,9 @@ from enum import Enum
 
 class VolumeUnit(Enum):
     CUBICMETER = 1
+
+    def __init__(self, value: int) -> None:
+        # The code is the position of the unit. It indexes the tables of the
+        # quantity, like conversion_factors[unit.code], without hashing the
+        # unit.
+        self.code = value - 1
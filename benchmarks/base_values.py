@@ -0,0 +1,36 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Measures mixed unit workloads of scalar quantities.
+
+Run from the repository root with ``python -m benchmarks.base_values``.
+To compare with quantities which store their value in the base unit,
+generate the package with ``--base-values``.
+"""
+import functools
+import operator
+import timeit
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+SIZE = 200000
+
+
+def main():
+    units = (LengthUnit.METER, LengthUnit.FOOT, LengthUnit.KILOMETER)
+    lengths = [Length(float(i % 1000), units[i % 3]) for i in range(SIZE)]
+    values = [float(i) for i in range(SIZE)]
+
+    for name, function in (
+            ('construct', lambda: [Length(value, LengthUnit.FOOT)
+                                   for value in values]),
+            ('sort', lambda: sorted(lengths)),
+            ('set', lambda: set(lengths)),
+            ('accumulate', lambda: functools.reduce(operator.add, lengths)),
+            ('Length.sum', lambda: Length.sum(lengths)),
+            ('products', lambda: [length * length for length in lengths])):
+        seconds = min(timeit.repeat(function, repeat=3, number=1))
+        print('{name:<11} {seconds:8.4f} s'.format(name=name, seconds=seconds))
+
+
+if __name__ == '__main__':
+    main()
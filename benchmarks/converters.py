@@ -0,0 +1,38 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares converting speeds through quantities with a compiled converter.
+
+Run from the repository root with ``python -m benchmarks.converters``.
+"""
+import timeit
+import numpy
+import ayuabtu
+from ayuabtu.quantities import Length, Time
+from ayuabtu.units import LengthUnit
+
+SIZE = 1000000
+
+
+def main():
+    speeds = [float(i) for i in range(SIZE)]
+    array = numpy.array(speeds)
+    hour = Time.from_hours(1)
+    convert = ayuabtu.converter('mi/h', 'm/s')
+
+    def through_quantities():
+        return [(Length(speed, LengthUnit.MILE) / hour).value
+                for speed in speeds]
+
+    def with_converter():
+        return [convert(speed) for speed in speeds]
+
+    for name, function in (
+            ('quantities', through_quantities),
+            ('converter', with_converter),
+            ('converter (array)', lambda: convert(array))):
+        seconds = min(timeit.repeat(function, repeat=3, number=1))
+        print('{name:<18} {seconds:8.4f} s'.format(name=name, seconds=seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares generated operators with operators resolved by dimensions.
+
+Run from the repository root with ``python -m benchmarks.dimensions``.
+"""
+import timeit
+from ayuabtu.quantities import Length, Mass, Time
+
+NUMBER = 1000000
+
+
+def main():
+    length = Length.from_meters(3)
+    mass = Mass.from_kilograms(2)
+    time = Time.from_seconds(4)
+
+    for name, function in (
+            ('Length * Length', lambda: length * length),
+            ('Length / Time', lambda: length / time),
+            ('Mass * Length', lambda: mass * length),
+            ('Mass ** 2', lambda: mass ** 2)):
+        seconds = min(timeit.repeat(function, repeat=5, number=NUMBER))
+        print('{name:<16} {nanoseconds:6.0f} ns'.format(
+            name=name, nanoseconds=seconds / NUMBER * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares creating the same quantities with interning them.
+
+Run from the repository root with ``python -m benchmarks.interning``.
+"""
+import timeit
+import tracemalloc
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+SIZE = 1000000
+
+
+def construct() -> list:
+    return [Length(float(i % 10), LengthUnit.METER) for i in range(SIZE)]
+
+
+def intern() -> list:
+    return [Length.interned(float(i % 10), LengthUnit.METER)
+            for i in range(SIZE)]
+
+
+def main():
+    for name, function in (('constructed', construct), ('interned', intern)):
+        seconds = min(timeit.repeat(function, repeat=3, number=1))
+        tracemalloc.start()
+        lengths = function()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del lengths
+        print('{name:<12} {seconds:7.3f} s {size:14,d} bytes'.format(
+            name=name, seconds=seconds, size=size))
+
+    print(Length.interned_cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares counting and sampling mixed unit values with converting eagerly.
+
+Run from the repository root with ``python -m benchmarks.mixed_units``.
+"""
+import timeit
+import numpy
+from ayuabtu.arrays import LengthArray, MixedLengthArray
+from ayuabtu.units import LengthUnit
+
+SIZE = 10000000
+VALUES = numpy.random.random(SIZE)
+UNIT_CODES = numpy.random.choice(
+    [LengthUnit.FOOT.code, LengthUnit.METER.code], SIZE).astype(numpy.uint8)
+
+
+def _parse_eagerly() -> LengthArray:
+    # Converts all values to meters like LengthArray.parse_many
+    factors = MixedLengthArray.conversion_factors[
+        UNIT_CODES, LengthUnit.METER.code]
+
+    return LengthArray(VALUES * factors, LengthUnit.METER)
+
+
+def count_feet_eagerly() -> int:
+    _parse_eagerly()
+
+    return int(numpy.count_nonzero(UNIT_CODES == LengthUnit.FOOT.code))
+
+
+def count_feet_lazily() -> int:
+    return MixedLengthArray(VALUES, UNIT_CODES).count_units()[LengthUnit.FOOT]
+
+
+def sample_eagerly() -> LengthArray:
+    return _parse_eagerly()[:1000]
+
+
+def sample_lazily() -> LengthArray:
+    return MixedLengthArray(VALUES, UNIT_CODES)[:1000].to_unit(LengthUnit.METER)
+
+
+def main():
+    for name, function in (('count eagerly', count_feet_eagerly),
+                           ('count lazily', count_feet_lazily),
+                           ('sample eagerly', sample_eagerly),
+                           ('sample lazily', sample_lazily)):
+        seconds = min(timeit.repeat(function, repeat=5, number=1))
+        print('{name:<15} {seconds:8.4f} s'.format(name=name, seconds=seconds))
+
+
+if __name__ == '__main__':
+    main()
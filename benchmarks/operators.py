@@ -0,0 +1,36 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Measures the throughput of cross-quantity arithmetic operators.
+
+Run from the repository root with ``python -m benchmarks.operators``.
+"""
+import timeit
+from ayuabtu.quantities import Area, Length, Volume
+
+OPERATIONS = (
+    ('Length * Length', 'left * right',
+     Length.from_meters(2), Length.from_feet(3)),
+    ('Volume / Area', 'left / right',
+     Volume.from_cubicMeters(6), Area.from_squareMeters(2)),
+    ('Length * 2.0', 'left * right',
+     Length.from_meters(2), 2.0),
+)
+
+
+def measure_operations_per_second(statement: str, left, right) -> float:
+    timer = timeit.Timer(statement, globals={'left': left, 'right': right})
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+
+    return number / best
+
+
+def main():
+    for name, statement, left, right in OPERATIONS:
+        print('{name:<16} {rate:12,.0f} ops/s'.format(
+            name=name,
+            rate=measure_operations_per_second(statement, left, right)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares columns of quantity objects with the ayuabtu pandas dtypes.
+
+Run from the repository root with ``python -m benchmarks.pandas_columns``.
+"""
+import timeit
+import numpy
+import pandas
+import ayuabtu.pandas  # noqa: F401
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+SIZE = 100000
+VALUES = pandas.Series(numpy.random.random(SIZE))
+GROUPS = pandas.Series(numpy.random.randint(0, 100, SIZE))
+
+STATEMENTS = (
+    ('create', "VALUES.apply(Length.from_meters)",
+     "pandas.Series(VALUES, dtype='ayuabtu[Length:m]')"),
+    ('convert', "objects.apply(lambda length: length.to_unit(LengthUnit.FOOT))",
+     "typed.astype('ayuabtu[Length:ft]')"),
+    ('multiply', "objects * objects",
+     "typed * typed"),
+    ('groupby sum', "objects.groupby(GROUPS).sum()",
+     "typed.groupby(GROUPS).sum()"),
+)
+
+
+def measure_seconds(statement: str) -> float:
+    namespace = {
+        'pandas': pandas,
+        'Length': Length,
+        'LengthUnit': LengthUnit,
+        'VALUES': VALUES,
+        'GROUPS': GROUPS,
+        'objects': VALUES.apply(Length.from_meters),
+        'typed': pandas.Series(VALUES, dtype='ayuabtu[Length:m]'),
+    }
+
+    return min(timeit.repeat(
+        statement, globals=namespace, repeat=3, number=1))
+
+
+def main():
+    print('{0:<12} {1:>10} {2:>10}'.format('', 'objects', 'dtype'))
+    for name, object_statement, dtype_statement in STATEMENTS:
+        print('{name:<12} {objects:9.4f}s {dtype:9.4f}s'.format(
+            name=name,
+            objects=measure_seconds(object_statement),
+            dtype=measure_seconds(dtype_statement)))
+
+
+if __name__ == '__main__':
+    main()
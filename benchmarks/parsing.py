@@ -0,0 +1,46 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Measures how many quantity strings can be parsed per second.
+
+Run from the repository root with ``python -m benchmarks.parsing``.
+"""
+import timeit
+import ayuabtu
+from ayuabtu.arrays import LengthArray
+from ayuabtu.quantities import Length
+
+TEXTS = ['12.5 km', '3 ft', '0.25mi', '1e-3 mm', '7 meters', '-4.2 μm']
+
+
+def measure_strings_per_second(parse) -> float:
+    timer = timeit.Timer(
+        'for text in texts: parse(text)',
+        globals={'texts': TEXTS, 'parse': parse})
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+
+    return number * len(TEXTS) / best
+
+
+def measure_bulk_strings_per_second() -> float:
+    texts = TEXTS * 100000
+    timer = timeit.Timer(
+        'LengthArray.parse_many(texts)',
+        globals={'texts': texts, 'LengthArray': LengthArray})
+    best = min(timer.repeat(repeat=3, number=1))
+
+    return len(texts) / best
+
+
+def main():
+    for name, parse in (('Length.parse', Length.parse),
+                        ('ayuabtu.parse', ayuabtu.parse)):
+        print('{name:<24} {rate:12,.0f} strings/s'.format(
+            name=name, rate=measure_strings_per_second(parse)))
+
+    print('{name:<24} {rate:12,.0f} strings/s'.format(
+        name='LengthArray.parse_many', rate=measure_bulk_strings_per_second()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Measures pickling of many quantities and of a quantity array.
+
+Run from the repository root with ``python -m benchmarks.pickling``.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import time
+from ayuabtu.arrays import LengthArray
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+SIZE = 1000000
+WORKERS = 4
+
+
+def echo(value):
+    return value
+
+
+def measure_seconds(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+
+    return time.perf_counter() - start
+
+
+def send_to_workers(chunks: list) -> None:
+    with ProcessPoolExecutor(WORKERS) as executor:
+        list(executor.map(echo, chunks))
+
+
+def main():
+    lengths = [Length(float(i), LengthUnit.FOOT) for i in range(SIZE)]
+    array = LengthArray.from_quantities(lengths, LengthUnit.FOOT)
+
+    for name, value in (('list of Length', lengths), ('LengthArray', array)):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        print('{name:<15} {size:12,d} bytes  dumps {dumps:6.3f} s  '
+              'loads {loads:6.3f} s'.format(
+                  name=name,
+                  size=len(data),
+                  dumps=measure_seconds(
+                      pickle.dumps, value, pickle.HIGHEST_PROTOCOL),
+                  loads=measure_seconds(pickle.loads, data)))
+
+    chunk_size = SIZE // WORKERS
+    for name, chunks in (
+            ('list of Length', [
+                lengths[start:start + chunk_size]
+                for start in range(0, SIZE, chunk_size)]),
+            ('LengthArray', [
+                array[start:start + chunk_size]
+                for start in range(0, SIZE, chunk_size)])):
+        print('{name:<15} round trip to {workers} workers {seconds:6.3f} s'
+              .format(
+                  name=name,
+                  workers=WORKERS,
+                  seconds=measure_seconds(send_to_workers, chunks)))
+
+
+if __name__ == '__main__':
+    main()
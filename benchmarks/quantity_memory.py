@@ -0,0 +1,49 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Measures memory footprint and construction time of quantity instances.
+
+Run from the repository root with ``python -m benchmarks.quantity_memory``.
+"""
+import timeit
+import tracemalloc
+from ayuabtu.quantities import Mass, Time
+from ayuabtu.units import MassUnit, TimeUnit
+
+NUMBER_OF_INSTANCES = 100000
+
+
+def measure_bytes_per_instance(quantity_type, unit) -> float:
+    values = [float(i) for i in range(NUMBER_OF_INSTANCES)]
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = [quantity_type(value, unit) for value in values]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Do not count the list holding the instances.
+    list_size = instances.__sizeof__()
+    return (after - before - list_size) / NUMBER_OF_INSTANCES
+
+
+def measure_construction_time(quantity_type, unit) -> float:
+    timer = timeit.Timer(
+        'quantity_type(1.5, unit)',
+        globals={'quantity_type': quantity_type, 'unit': unit})
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+
+    return best / number * 1e9
+
+
+def main():
+    for quantity_type, unit in ((Time, TimeUnit.SECOND),
+                                (Mass, MassUnit.KILOGRAM)):
+        print('{name:<6} {size:8.1f} bytes/instance {time:8.1f} ns/construction'
+              .format(name=quantity_type.__name__,
+                      size=measure_bytes_per_instance(quantity_type, unit),
+                      time=measure_construction_time(quantity_type, unit)))
+
+
+if __name__ == '__main__':
+    main()
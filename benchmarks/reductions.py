@@ -0,0 +1,33 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares summing quantities step by step with the reduction methods.
+
+Run from the repository root with ``python -m benchmarks.reductions``.
+"""
+import functools
+import operator
+import timeit
+from ayuabtu.arrays import LengthArray
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+SIZE = 1000000
+
+
+def main():
+    units = (LengthUnit.METER, LengthUnit.FOOT, LengthUnit.KILOMETER)
+    lengths = [Length(float(i), units[i % 3]) for i in range(SIZE)]
+    array = LengthArray.from_quantities(lengths, LengthUnit.METER)
+
+    for name, function in (
+            ('reduce(add)', lambda: functools.reduce(operator.add, lengths)),
+            ('sum()', lambda: sum(lengths)),
+            ('Length.sum', lambda: Length.sum(lengths)),
+            ('Length.std', lambda: Length.std(lengths)),
+            ('LengthArray.sum', array.sum)):
+        seconds = min(timeit.repeat(function, repeat=3, number=1))
+        print('{name:<16} {seconds:8.4f} s'.format(name=name, seconds=seconds))
+
+
+if __name__ == '__main__':
+    main()
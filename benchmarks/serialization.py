@@ -0,0 +1,43 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares the binary format of quantities and quantity arrays with pickle.
+
+Run from the repository root with ``python -m benchmarks.serialization``.
+"""
+import pickle
+import timeit
+import numpy
+from ayuabtu.arrays import MassArray
+from ayuabtu.quantities import Mass
+
+MASS = Mass.from_kilograms(3.5)
+MASSES = MassArray.from_kilograms(numpy.random.random(1000000))
+
+
+def measure_round_trips_per_second(encode, decode, value) -> float:
+    timer = timeit.Timer(
+        'decode(encode(value))',
+        globals={'encode': encode, 'decode': decode, 'value': value})
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+
+    return number / best
+
+
+def main():
+    for value in (MASS, MASSES):
+        formats = (
+            ('pickle', pickle.dumps, pickle.loads),
+            ('to_bytes', lambda value: value.to_bytes(), type(value).from_bytes))
+        for name, encode, decode in formats:
+            print('{type:<9} {name:<8} {size:11,d} bytes {rate:12,.0f} '
+                  'round trips/s'.format(
+                      type=type(value).__name__,
+                      name=name,
+                      size=len(encode(value)),
+                      rate=measure_round_trips_per_second(
+                          encode, decode, value)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Measures the scalar operations which look up unit tables.
+
+Run from the repository root with ``python -m benchmarks.unit_codes``.
+"""
+import timeit
+from ayuabtu.arrays import MixedLengthArray
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+NUMBER = 1000000
+
+
+def main():
+    length = Length(3.0, LengthUnit.FOOT)
+    lengths = [length] * 1000
+
+    for name, function, number in (
+            ('construct', lambda: Length(3.0, LengthUnit.FOOT), NUMBER),
+            ('as_unit', lambda: length.as_unit(LengthUnit.METER), NUMBER),
+            ('str', lambda: str(length), NUMBER),
+            ('from_quantities (1000)',
+             lambda: MixedLengthArray.from_quantities(lengths), 1000)):
+        seconds = min(timeit.repeat(function, repeat=5, number=number))
+        print('{name:<22} {nanoseconds:9.0f} ns'.format(
+            name=name, nanoseconds=seconds / number * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+"""Compares converting feet to meters through quantities with a converter.
+
+Run from the repository root with ``python -m benchmarks.unit_converters``.
+"""
+import timeit
+import numpy
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit
+
+SIZE = 1000000
+
+
+def main():
+    values = [float(i) for i in range(SIZE)]
+    array = numpy.array(values)
+    convert = Length.converter(LengthUnit.FOOT, LengthUnit.METER)
+
+    for name, function in (
+            ('Length(v, FOOT).meters',
+             lambda: [Length(value, LengthUnit.FOOT).meters
+                      for value in values]),
+            ('converter per float', lambda: [convert(value) for value in values]),
+            ('converter on a list', lambda: convert(values)),
+            ('converter on an array', lambda: convert(array))):
+        seconds = min(timeit.repeat(function, repeat=3, number=1))
+        print('{name:<22} {seconds:8.4f} s'.format(name=name, seconds=seconds))
+
+
+if __name__ == '__main__':
+    main()
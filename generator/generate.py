@@ -41,13 +41,24 @@ def parse_arguments():
         action='store_true',
         help='Overwrite existing files and directories.')
 
+    parser.add_argument(
+        '--base-values',
+        action='store_true',
+        help='Store the value in the base unit in every quantity. '
+             'Comparisons and arithmetics do not convert the values, but '
+             'every quantity needs more memory.')
+
     return parser.parse_args()
 
 
 def main():
     args = parse_arguments()
 
-    generator = Generator(args.source, args.target, args.templates)
+    generator = Generator(
+        args.source,
+        args.target,
+        args.templates,
+        store_base_values=args.base_values)
     generator.run(args.force)
 
 if __name__ == '__main__':
@@ -1,11 +1,13 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
+from fractions import Fraction
 from jinja2 import Environment, FileSystemLoader, StrictUndefined
 import json
 import logging
 import os
+import re
 import shutil
-from typing import Set
+from typing import Dict, List, Set, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
@@ -15,10 +17,12 @@ class Generator:
             self,
             source_directory: str,
             target_directory: str,
-            template_directory: str) -> None:
+            template_directory: str,
+            store_base_values: bool = False) -> None:
         self._source_dir = source_directory
         self._target_dir = target_directory
         self._template_dir = template_directory
+        self._store_base_values = store_base_values
         self._template_env = Environment(
             loader=FileSystemLoader(searchpath=template_directory),
             trim_blocks=True,
@@ -48,6 +52,10 @@ class Generator:
         LOGGER.debug('Creating %s.', self._units_dir)
         os.mkdir(self._units_dir)
 
+        self._arrays_dir = os.path.join(self._target_dir, 'arrays')
+        LOGGER.debug('Creating %s.', self._arrays_dir)
+        os.mkdir(self._arrays_dir)
+
     def _raise_error_if_target_is_no_directory(self):
         if not os.path.isdir(self._target_dir):
             raise NotADirectoryError(
@@ -63,28 +71,159 @@ class Generator:
     def _generate_modules(self, ):
         self._load_source_files()
         self._generate_package_init()
+        self._generate_dispatch_module()
+        self._generate_dimensions_module()
+        self._generate_parsing_module()
+        self._generate_converters_module()
+        self._generate_serialization_module()
+        self._generate_json_module()
+        self._generate_arrow_module()
+        self._generate_pandas_module()
         self._generate_quantities_init()
         self._generate_quantities()
+        self._generate_quantities_operators()
         self._generate_units_init()
         self._generate_units()
+        self._generate_arrays_init()
+        self._generate_arrays()
+        self._generate_arrays_operators()
 
     def _load_source_files(self):
         LOGGER.info("Loading source files.")
         self._quantities = []
 
-        for filename in os.listdir(self._source_dir):
+        for filename in sorted(os.listdir(self._source_dir)):
             self._load_source_file(filename)
 
+        self._raise_error_if_codes_are_invalid()
+        self._raise_error_if_dimensions_are_invalid()
+        self._raise_error_if_base_factors_are_invalid()
+
     def _load_source_file(self, filename):
         filepath = os.path.join(self._source_dir + filename)
         LOGGER.debug("Loading \"%s\".", filepath)
         with open(filepath) as source:
             self._quantities.append(json.load(source))
 
+    def _raise_error_if_codes_are_invalid(self):
+        codes = [quantity['code'] for quantity in self._quantities]
+        if len(set(codes)) != len(codes):
+            raise ValueError('The quantity codes are not unique.')
+        # The highest bit of the code marks arrays in the binary format.
+        if not all(0 < code < 0x80 for code in codes):
+            raise ValueError('The quantity codes must be between 1 and 127.')
+        # Mixed unit arrays store the unit values as uint8.
+        if any(len(quantity['units']) > 256 for quantity in self._quantities):
+            raise ValueError('A quantity can not have more than 256 units.')
+
+    def _raise_error_if_dimensions_are_invalid(self):
+        base_dimensions = self._create_base_dimensions()
+        for quantity in self._quantities:
+            for name in quantity['dimensions']:
+                if name not in base_dimensions:
+                    raise ValueError(
+                        'No quantity has the base dimension "{0}".'
+                        .format(name))
+
+        dimensions = [
+            self._create_dimension(quantity) for quantity in self._quantities]
+        if len(set(dimensions)) != len(dimensions):
+            raise ValueError('The quantity dimensions are not unique.')
+
+        dimensions_by_name = {
+            quantity['name']: self._create_dimension(quantity)
+            for quantity in self._quantities}
+        for op in self._create_operators():
+            sign = 1 if op['symbol'] == '*' else -1
+            dimension = tuple(
+                left + sign * right for left, right in zip(
+                    dimensions_by_name[op['left']],
+                    dimensions_by_name[op['right']]))
+            if dimension != dimensions_by_name[op['result']]:
+                raise ValueError(
+                    'The dimension of {left} {symbol} {right} is not the one '
+                    'of {result}.'.format(**op))
+
+    def _raise_error_if_base_factors_are_invalid(self):
+        # The factors of the units are used to convert to the base unit.
+        for quantity in self._quantities:
+            if Fraction(self._get_base_unit(quantity)['factor']) != 1:
+                raise ValueError(
+                    'The factor of the base unit of {0} must be 1.'
+                    .format(quantity['name']))
+
     def _generate_package_init(self):
         init_path = os.path.join(self._target_dir, '__init__.py')
 
-        self._write_file(init_path, '')
+        content = self._render_template('package_init')
+
+        self._write_file(init_path, content)
+
+    def _generate_parsing_module(self):
+        parsing_path = os.path.join(self._target_dir, 'parsing.py')
+
+        content = self._render_template(
+            'parsing', quantities=self._quantities)
+
+        self._write_file(parsing_path, content)
+
+    def _generate_converters_module(self):
+        converters_path = os.path.join(self._target_dir, 'converters.py')
+
+        content = self._render_template(
+            'converters', quantities=self._quantities)
+
+        self._write_file(converters_path, content)
+
+    def _generate_serialization_module(self):
+        serialization_path = os.path.join(self._target_dir, 'serialization.py')
+
+        content = self._render_template(
+            'serialization', quantities=self._quantities)
+
+        self._write_file(serialization_path, content)
+
+    def _generate_json_module(self):
+        json_path = os.path.join(self._target_dir, 'json.py')
+
+        content = self._render_template('json', quantities=self._quantities)
+
+        self._write_file(json_path, content)
+
+    def _generate_arrow_module(self):
+        arrow_path = os.path.join(self._target_dir, 'arrow.py')
+
+        content = self._render_template('arrow', quantities=self._quantities)
+
+        self._write_file(arrow_path, content)
+
+    def _generate_pandas_module(self):
+        pandas_path = os.path.join(self._target_dir, 'pandas.py')
+
+        content = self._render_template('pandas', quantities=self._quantities)
+
+        self._write_file(pandas_path, content)
+
+    def _generate_dispatch_module(self):
+        dispatch_path = os.path.join(self._target_dir, 'dispatch.py')
+
+        content = self._render_template('dispatch')
+
+        self._write_file(dispatch_path, content)
+
+    def _generate_dimensions_module(self):
+        dimensions_path = os.path.join(self._target_dir, 'dimensions.py')
+
+        base_quantities = self._create_base_quantities()
+        content = self._render_template(
+            'dimensions',
+            quantities=self._quantities,
+            base_dimensions=self._create_base_dimensions(),
+            base_symbols=[
+                self._get_base_unit(quantity)['abbreviation']
+                for quantity in base_quantities])
+
+        self._write_file(dimensions_path, content)
 
     def _generate_quantities_init(self):
         quantities_init_path = os.path.join(self._quantities_dir, '__init__.py')
@@ -107,13 +246,26 @@ class Generator:
         content = self._render_template(
             'quantity_module',
             quantity=quantity,
-            mul_type_imports=self._create_quantity_imports(quantity, 'mul'),
-            div_type_imports=self._create_quantity_imports(quantity, 'div'),
-            mul_operators=quantity['operators'].get('mul', {}),
-            div_operators=quantity['operators'].get('div', {}))
+            dimension=repr(self._create_dimension(quantity)),
+            store_base_values=self._store_base_values,
+            conversion_factors=self._create_conversion_factors(quantity),
+            units_by_symbol=self._create_units_by_symbol(quantity),
+            units_by_name=self._create_units_by_name(quantity),
+            units_by_factor=self._create_units_by_factor(quantity))
 
         self._write_file(quantity_path, content)
 
+    def _generate_quantities_operators(self):
+        operators_path = os.path.join(self._quantities_dir, 'operators.py')
+
+        content = self._render_template(
+            'quantities_operators',
+            quantities=self._quantities,
+            operators=self._create_operators(),
+            powers=self._create_powers())
+
+        self._write_file(operators_path, content)
+
     def _generate_units_init(self):
         units_init_path = os.path.join(self._units_dir, '__init__.py')
 
@@ -139,6 +291,40 @@ class Generator:
 
         self._write_file(unit_path, content)
 
+    def _generate_arrays_init(self):
+        arrays_init_path = os.path.join(self._arrays_dir, '__init__.py')
+
+        content = self._render_template(
+            'arrays_init', quantities=self._quantities)
+
+        self._write_file(arrays_init_path, content)
+
+    def _generate_arrays(self):
+        LOGGER.info("Generating quantity array files.")
+        for quantity in self._quantities:
+            self._generate_array_module(quantity)
+
+    def _generate_array_module(self, quantity):
+        array_path = os.path.join(
+            self._arrays_dir,
+            self._decapitalize(quantity['name']) + 'Array.py')
+
+        content = self._render_template(
+            'quantity_array_module', quantity=quantity)
+
+        self._write_file(array_path, content)
+
+    def _generate_arrays_operators(self):
+        operators_path = os.path.join(self._arrays_dir, 'operators.py')
+
+        content = self._render_template(
+            'arrays_operators',
+            quantities=self._quantities,
+            operators=self._create_operators(),
+            powers=self._create_powers())
+
+        self._write_file(operators_path, content)
+
     def _render_template(self, template_name: str, **kwargs) -> str:
         LOGGER.debug('Rendering template %s with %s', template_name, kwargs)
         return (self._template_env
@@ -150,12 +336,158 @@ class Generator:
         with open(path, 'w') as f:
             f.write(content)
 
-    def _create_quantity_imports(self, quantity, op_type: str) -> Set[str]:
+    def _create_operators(self) -> List[Dict[str, str]]:
+        operators = []
+        for quantity in self._quantities:
+            for op_type, symbol in (('mul', '*'), ('div', '/')):
+                for op in quantity['operators'].get(op_type, {}):
+                    operators.append({
+                        'left': quantity['name'],
+                        'symbol': symbol,
+                        'right': op['other'],
+                        'result': op['result']})
+
+        # Multiplication is commutative, so every product can also be
+        # computed with swapped operands.
+        for op in [op for op in operators if op['symbol'] == '*']:
+            reflected = dict(op, left=op['right'], right=op['left'])
+            if reflected not in operators:
+                operators.append(reflected)
+
+        return operators
+
+    def _create_powers(self) -> List[Dict[str, str]]:
+        products = {
+            (op['left'], op['right']): op['result']
+            for op in self._create_operators() if op['symbol'] == '*'}
+
+        # powers_of[name][k - 1] is the quantity of name ** k.
+        powers_of = {}
+        for quantity in self._quantities:
+            name = quantity['name']
+            powers_of[name] = [name]
+            while ((powers_of[name][-1], name) in products
+                   and len(powers_of[name]) <= len(self._quantities)):
+                powers_of[name].append(products[(powers_of[name][-1], name)])
+
+        powers = {}
+        for name, results in powers_of.items():
+            # name ** k is results[k - 1], so results[k - 1] ** (j / k) is
+            # results[j - 1]. This yields the integer powers of name and the
+            # roots of its powers.
+            for k, base in enumerate(results, start=1):
+                for j, result in enumerate(results, start=1):
+                    exponent = Fraction(j, k)
+                    if exponent != 1:
+                        powers.setdefault((base, exponent), result)
+
+        return [
+            {'base': base, 'exponent': repr(float(exponent)), 'result': result}
+            for (base, exponent), result in sorted(powers.items())]
+
+    def _create_base_quantities(self) -> List[Dict]:
+        # A quantity of a single dimension with exponent 1, like Length,
+        # defines that base dimension.
+        return [
+            quantity for quantity in self._quantities
+            if list(quantity['dimensions'].values()) == [1]]
+
+    def _create_base_dimensions(self) -> List[str]:
+        return [
+            next(iter(quantity['dimensions']))
+            for quantity in self._create_base_quantities()]
+
+    def _create_dimension(self, quantity) -> Tuple[int, ...]:
+        return tuple(
+            quantity['dimensions'].get(name, 0)
+            for name in self._create_base_dimensions())
+
+    @staticmethod
+    def _get_base_unit(quantity) -> Dict:
+        return next(
+            unit for unit in quantity['units']
+            if unit['name'] == quantity['baseunit'])
+
+    @staticmethod
+    def _create_conversion_factors(quantity) -> List[List[str]]:
+        factors = [Fraction(unit['factor']) for unit in quantity['units']]
+
+        return [
+            [repr(float(from_factor / to_factor)) for to_factor in factors]
+            for from_factor in factors]
+
+    def _create_units_by_factor(
+            self, quantity) -> List[Tuple[str, List[str], List[str]]]:
+        # Units without a system, like seconds, belong to every system.
+        systems = sorted({
+            unit['system']
+            for other_quantity in self._quantities
+            for unit in other_quantity['units'] if 'system' in unit})
+
+        units_by_factor = []
+        for system in [None] + systems:
+            units = sorted(
+                (unit for unit in quantity['units']
+                 if system is None or unit.get('system', system) == system),
+                key=lambda unit: Fraction(unit['factor']))
+            units_by_factor.append((
+                repr(system),
+                [repr(float(Fraction(unit['factor']))) for unit in units],
+                [unit['name'] for unit in units]))
+
+        return units_by_factor
+
+    def _create_units_by_symbol(self, quantity) -> List[Tuple[str, str]]:
+        return self._create_unit_table(quantity, self._create_unit_symbols)
+
+    def _create_units_by_name(self, quantity) -> List[Tuple[str, str]]:
+        return self._create_unit_table(quantity, self._create_unit_names)
+
+    @staticmethod
+    def _create_unit_table(
+            quantity, create_symbols) -> List[Tuple[str, str]]:
+        units_by_symbol = {}
+        ambiguous_symbols = set()
+
+        for unit in quantity['units']:
+            for symbol in create_symbols(unit):
+                if units_by_symbol.get(symbol, unit['name']) != unit['name']:
+                    ambiguous_symbols.add(symbol)
+                units_by_symbol[symbol] = unit['name']
+
+        for symbol in sorted(ambiguous_symbols):
+            LOGGER.warning(
+                'The symbol "%s" is used by several %s units and can not be '
+                'parsed.', symbol, quantity['name'])
+            del units_by_symbol[symbol]
+
+        return sorted(
+            units_by_symbol.items(),
+            key=lambda item: (
+                [unit['name'] for unit in quantity['units']].index(item[1]),
+                item[0]))
+
+    @staticmethod
+    def _create_unit_symbols(unit) -> Set[str]:
+        abbreviation = unit['abbreviation']
+        symbols = {abbreviation, abbreviation.rstrip('.')}
+        # Accept the micro sign as well as the greek letter mu.
+        symbols |= {symbol.replace('μ', 'µ') for symbol in symbols}
+
+        # Further symbols like "h" for hours
+        symbols.update(unit.get('aliases', []))
+
+        return symbols | Generator._create_unit_names(unit)
+
+    @staticmethod
+    def _create_unit_names(unit) -> Set[str]:
+        # The lowercase names, like "square meters", are looked up
+        # case-insensitively. Abbreviations are not, "Mg" is not "mg".
+        plural = unit.get('plural', unit['name'] + 's')
+
         return {
-            "from .{} import {}".format(self._decapitalize(val_type), val_type)
-            for op in quantity['operators'].get(op_type, {})
-            for val_type in op.values()
-            if val_type != quantity['name']}
+            ' '.join(re.findall('[A-Z][a-z]*', name)).lower()
+            for name in (unit['name'], plural)}
 
     @staticmethod
     def _decapitalize(string: str):
@@ -13,7 +13,12 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type='text/markdown',
     url='https://github.com/MCHalbi/AllYourUnitAreBelongToUs',
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=('tests', 'benchmarks')),
+    extras_require={
+        'numpy': ['numpy'],
+        'arrow': ['numpy', 'pyarrow'],
+        'pandas': ['numpy', 'pandas'],
+    },
     classfiers=[
         'Development Status :: 2 - Pre-Alpha'
         'Programming Language :: Python :: 3.5',
@@ -0,0 +1,63 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import io
+import unittest
+import numpy
+import pyarrow
+import pyarrow.parquet
+from ayuabtu.arrays import LengthArray, MassArray
+from ayuabtu.arrow import LengthType, from_arrow, to_arrow
+from ayuabtu.units import LengthUnit, MassUnit
+
+
+class ArrowTests(unittest.TestCase):
+    def setUp(self):
+        self._feet = LengthArray([1, 2, 3], LengthUnit.FOOT)
+
+    def test_to_arrow_stores_unit_in_type(self):
+        result = to_arrow(self._feet)
+        self.assertEqual(LengthType(LengthUnit.FOOT), result.type)
+        self.assertEqual(LengthUnit.FOOT, result.type.unit)
+
+    def test_to_arrow_does_not_copy_values(self):
+        result = to_arrow(self._feet)
+        self.assertTrue(numpy.shares_memory(
+            self._feet.values, result.storage.to_numpy()))
+
+    def test_to_arrow_fails_for_other_types(self):
+        with self.assertRaises(TypeError):
+            to_arrow(numpy.zeros(3))
+
+    def test_from_arrow_does_not_copy_values(self):
+        result = from_arrow(to_arrow(self._feet))
+        self.assertIsInstance(result, LengthArray)
+        self.assertEqual(LengthUnit.FOOT, result.unit)
+        self.assertTrue(numpy.shares_memory(self._feet.values, result.values))
+
+    def test_from_arrow_combines_chunks(self):
+        chunks = pyarrow.chunked_array([to_arrow(self._feet)] * 2)
+        numpy.testing.assert_array_equal(
+            [1, 2, 3, 1, 2, 3], from_arrow(chunks).values)
+
+    def test_from_arrow_fails_for_plain_arrays(self):
+        with self.assertRaises(TypeError):
+            from_arrow(pyarrow.array([1.0, 2.0]))
+
+    def test_parquet_round_trip_preserves_units(self):
+        masses = MassArray([4, 5, 6], MassUnit.STONE)
+        table = pyarrow.table({
+            'distance': to_arrow(self._feet), 'mass': to_arrow(masses)})
+        file = io.BytesIO()
+        pyarrow.parquet.write_table(table, file)
+        file.seek(0)
+        result = pyarrow.parquet.read_table(file)
+
+        distances = from_arrow(result['distance'])
+        self.assertEqual(LengthUnit.FOOT, distances.unit)
+        numpy.testing.assert_array_equal([1, 2, 3], distances.values)
+        self.assertEqual(MassUnit.STONE, from_arrow(result['mass']).unit)
+
+
+if __name__ == '__main__':
+    unittest.main()
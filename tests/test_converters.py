@@ -0,0 +1,55 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import unittest
+import numpy
+import ayuabtu
+from ayuabtu.converters import parse_unit_expression
+from ayuabtu.quantities import Length
+
+
+class ConverterTests(unittest.TestCase):
+    def test_converts_speed(self):
+        convert = ayuabtu.converter('mi/h', 'm/s')
+        self.assertAlmostEqual(0.44704, convert(1.0), places=4)
+
+    def test_converts_arrays(self):
+        convert = ayuabtu.converter('km/h', 'm/s')
+        numpy.testing.assert_allclose(
+            [1, 2], convert(numpy.array([3.6, 7.2])))
+
+    def test_converter_is_cached(self):
+        self.assertIs(ayuabtu.converter('km/h', 'm/s'),
+                      ayuabtu.converter('km/h', 'm/s'))
+
+    def test_exponents(self):
+        self.assertEqual(1, ayuabtu.converter('kg/m³', 'g/cm^3')(1000))
+        self.assertEqual(
+            100000, ayuabtu.converter('kg*m/s^2', 'g·cm·s⁻²')(1))
+
+    def test_division_only_applies_to_following_factor(self):
+        self.assertEqual(
+            parse_unit_expression('kg*m/s/s'),
+            parse_unit_expression('kg·m·s⁻²'))
+
+    def test_reciprocal_unit(self):
+        self.assertEqual(60, ayuabtu.converter('1/s', '1/min')(1))
+
+    def test_single_unit_matches_quantity_conversion(self):
+        convert = ayuabtu.converter('ft', 'm')
+        self.assertEqual(Length.from_feet(3).as_unit(Length.base_unit), convert(3))
+
+    def test_factors_are_exact(self):
+        self.assertEqual(12, ayuabtu.converter('ft', 'in')(1))
+        self.assertEqual(1e12, ayuabtu.converter('km', 'nm')(1))
+
+    def test_aliases_are_symbols(self):
+        self.assertEqual(3600, ayuabtu.converter('h', 's')(1))
+
+    def test_different_dimensions_fail(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.converter('mi/h', 'm')
+
+    def test_unknown_unit_fails(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.converter('mi/x', 'm/s')
@@ -0,0 +1,97 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import pickle
+import unittest
+from ayuabtu import DerivedQuantity, dispatch, get_quantity_type
+from ayuabtu.dimensions import BASE_DIMENSIONS, DIMENSIONLESS
+from ayuabtu.dispatch import lookup
+from ayuabtu.quantities import Area, Length, Mass, Time, Volume
+
+
+class DimensionTests(unittest.TestCase):
+    def setUp(self):
+        self._speed = Length.from_kilometers(3) / Time.from_minutes(1)
+
+    def test_base_dimensions(self):
+        self.assertEqual(
+            ('electric_current', 'length', 'mass', 'time'), BASE_DIMENSIONS)
+        self.assertEqual((0, 2, 0, 0), Area.dimension)
+
+    def test_get_quantity_type_returns_generated_quantity(self):
+        self.assertIs(Area, get_quantity_type((0, 2, 0, 0)))
+        self.assertIs(float, get_quantity_type(DIMENSIONLESS))
+
+    def test_get_quantity_type_creates_derived_type_once(self):
+        derived_type = get_quantity_type((0, 1, 0, -1))
+        self.assertTrue(issubclass(derived_type, DerivedQuantity))
+        self.assertIs(derived_type, get_quantity_type((0, 1.0, 0, -1)))
+
+    def test_get_quantity_type_fails_for_wrong_length(self):
+        with self.assertRaises(ValueError):
+            get_quantity_type((1, 2))
+
+    def test_quotient_of_unrelated_quantities_is_derived(self):
+        self.assertEqual(50, self._speed.value)
+        self.assertEqual('50.0 m·s⁻¹', str(self._speed))
+
+    def test_resolved_operator_is_registered(self):
+        result_type, _ = lookup(Length, '/', Time)
+        self.assertIs(type(self._speed), result_type)
+
+    def test_product_returning_to_generated_quantity(self):
+        result = self._speed * Time.from_seconds(2)
+        self.assertEqual(Length.from_meters(100), result)
+
+    def test_quotient_of_same_dimension_is_float(self):
+        self.assertEqual(2.0, (self._speed * 2) / self._speed)
+
+    def test_products_with_numbers_keep_dimension(self):
+        self.assertEqual(type(self._speed), type(2 * self._speed))
+        self.assertEqual(25, (self._speed / 2).value)
+
+    def test_reflected_division_inverts_dimension(self):
+        frequency = 1 / Time.from_seconds(2)
+        self.assertEqual('0.5 s⁻¹', str(frequency))
+        self.assertEqual('0.02 m⁻¹·s', str(1 / self._speed))
+
+    def test_power_of_quantity_without_matching_quantity(self):
+        result = Mass.from_kilograms(3) ** 2
+        self.assertEqual('9.0 kg²', str(result))
+        self.assertEqual(Mass.from_kilograms(3), result ** 0.5)
+
+    def test_power_with_irrational_exponent_fails(self):
+        with self.assertRaises(TypeError):
+            Length.from_meters(2) ** 0.123456789
+
+    def test_power_with_non_finite_exponent_fails(self):
+        for exponent in (float('inf'), float('nan')):
+            with self.assertRaises(TypeError):
+                Length.from_meters(2) ** exponent
+
+    def test_power_with_tiny_exponent_fails(self):
+        with self.assertRaises(TypeError):
+            Length.from_meters(2) ** 1e-12
+
+    def test_fractional_power_of_negative_value_fails(self):
+        with self.assertRaises(ValueError):
+            Volume.from_cubicMeters(-8) ** (1 / 3)
+        with self.assertRaises(ValueError):
+            Mass.from_kilograms(-3) ** 0.5
+
+    def test_powers_are_not_registered(self):
+        powers = len(dispatch._powers)
+        for numerator in range(1, 200):
+            Mass.from_kilograms(2) ** (numerator / 7)
+        self.assertEqual(powers, len(dispatch._powers))
+
+    def test_addition_of_same_dimension(self):
+        self.assertEqual(100, (self._speed + self._speed).value)
+        self.assertEqual(50, sum([self._speed]).value)
+
+    def test_addition_of_other_dimension_fails(self):
+        with self.assertRaises(TypeError):
+            self._speed + self._speed * self._speed
+
+    def test_pickling_keeps_dimension(self):
+        self.assertEqual(self._speed, pickle.loads(pickle.dumps(self._speed)))
@@ -0,0 +1,76 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import io
+import json
+import unittest
+import numpy
+import ayuabtu.json
+from ayuabtu.arrays import LengthArray
+from ayuabtu.quantities import Length, Mass
+from ayuabtu.units import LengthUnit, MassUnit
+
+
+class JsonTests(unittest.TestCase):
+    def test_default_encodes_quantity_with_unit_name(self):
+        self.assertEqual(
+            '{"quantity": "Mass", "value": 2.5, "unit": "STONE"}',
+            json.dumps(Mass(2.5, MassUnit.STONE), default=ayuabtu.json.default))
+
+    def test_default_fails_for_other_types(self):
+        with self.assertRaises(TypeError):
+            json.dumps(object(), default=ayuabtu.json.default)
+
+    def test_quantity_encoder_round_trip(self):
+        document = {'distances': [Length.from_miles(2), Length.from_feet(3)]}
+        text = json.dumps(document, cls=ayuabtu.json.QuantityEncoder)
+        result = json.loads(text, object_hook=ayuabtu.json.object_hook)
+        self.assertEqual(document, result)
+        self.assertEqual(LengthUnit.FOOT, result['distances'][1].unit)
+
+    def test_array_round_trip(self):
+        text = json.dumps(
+            LengthArray([1, 2], LengthUnit.YARD), default=ayuabtu.json.default)
+        result = json.loads(text, object_hook=ayuabtu.json.object_hook)
+        self.assertIsInstance(result, LengthArray)
+        self.assertEqual(LengthUnit.YARD, result.unit)
+        numpy.testing.assert_array_equal([1, 2], result.values)
+
+    def test_object_hook_accepts_unit_symbol(self):
+        result = json.loads(
+            '{"quantity": "Length", "value": 3, "unit": "km"}',
+            object_hook=ayuabtu.json.object_hook)
+        self.assertEqual(Length.from_kilometers(3), result)
+
+    def test_object_hook_keeps_other_objects(self):
+        result = json.loads(
+            '{"quantity": 3, "unit": "boxes", "price": 2}',
+            object_hook=ayuabtu.json.object_hook)
+        self.assertEqual({'quantity': 3, 'unit': 'boxes', 'price': 2}, result)
+
+    def test_object_hook_fails_for_unknown_unit(self):
+        with self.assertRaises(ValueError):
+            json.loads(
+                '{"quantity": "Length", "value": 3, "unit": "kg"}',
+                object_hook=ayuabtu.json.object_hook)
+
+    def test_dump_writes_array_in_chunks(self):
+        array = LengthArray(numpy.arange(5), LengthUnit.METER)
+        file = io.StringIO()
+        ayuabtu.json.dump(array, file, chunk_size=2)
+        self.assertEqual(
+            json.dumps(array, default=ayuabtu.json.default), file.getvalue())
+
+    def test_dump_writes_iterator_as_list(self):
+        lengths = [Length.from_meters(value) for value in range(5)]
+        file = io.StringIO()
+        ayuabtu.json.dump(iter(lengths), file, chunk_size=2)
+        self.assertEqual(
+            json.dumps(lengths, default=ayuabtu.json.default), file.getvalue())
+
+    def test_iterencode_of_empty_iterator_is_empty_list(self):
+        self.assertEqual('[]', ''.join(ayuabtu.json.iterencode(iter([]))))
+
+
+if __name__ == '__main__':
+    unittest.main()
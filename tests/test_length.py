@@ -1,9 +1,15 @@
 # Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
 # Copyright 2020
 # pylint: disable=missing-docstring
+import math
+import pickle
 import unittest
-from ayuabtu.quantities import Length
-from ayuabtu.units import LengthUnit
+from decimal import Decimal
+from fractions import Fraction
+from ayuabtu import DerivedQuantity, get_quantity_type
+from ayuabtu.dispatch import lookup
+from ayuabtu.quantities import Area, Length, Volume
+from ayuabtu.units import AreaUnit, LengthUnit, MassUnit
 
 
 class LengthTests(unittest.TestCase):
@@ -28,10 +34,158 @@ class LengthTests(unittest.TestCase):
     def test_zero_object_has_base_unit(self):
         self.assertEqual(LengthUnit.METER, self._zero.unit)
 
+    def test_instances_have_no_attribute_dict(self):
+        self.assertFalse(hasattr(self._meters, '__dict__'))
+
+    def test_parse_reads_value_and_unit(self):
+        result = Length.parse('12.5 km')
+        self.assertEqual(12.5, result.value)
+        self.assertEqual(LengthUnit.KILOMETER, result.unit)
+
+    def test_parse_accepts_capitalized_unit_name(self):
+        self.assertEqual(LengthUnit.FOOT, Length.parse('3 Feet').unit)
+
+    def test_parse_fails_for_unit_of_other_quantity(self):
+        with self.assertRaises(ValueError):
+            Length.parse('3 kg')
+
+    def test_str_shows_value_and_abbreviation(self):
+        self.assertEqual('1.5 km', str(Length(1.5, LengthUnit.KILOMETER)))
+
+    def test_format_applies_spec_to_value(self):
+        self.assertEqual('1.50 km', format(Length(1.5, LengthUnit.KILOMETER), '.2f'))
+
+    def test_format_converts_to_selected_unit(self):
+        self.assertEqual(
+            '1500.0 m', '{:.1f~m}'.format(Length(1.5, LengthUnit.KILOMETER)))
+
+    def test_format_accepts_unit_name(self):
+        self.assertEqual('3 ft', format(Length.from_yards(1), '.0f~feet'))
+
+    def test_format_fails_for_unknown_unit(self):
+        with self.assertRaises(ValueError):
+            format(self._meters, '.1f~kg')
+
+    def test_conversion_factors_are_one_for_same_unit(self):
+        for unit in LengthUnit:
+            self.assertEqual(
+                1, Length.conversion_factors[unit.code][unit.code])
+
+    def test_as_unit_converts_between_non_base_units(self):
+        self.assertAlmostEqual(1, Length.from_inches(12).as_unit(LengthUnit.FOOT))
+
+    def test_to_unit_converts_value_and_sets_unit(self):
+        result = self._kilometers.to_unit(LengthUnit.NANOMETER)
+        self.assertEqual(LengthUnit.NANOMETER, result.unit)
+        self.assertEqual(1e12, result.value)
+
+    def test_to_unit_equals_quantity_with_same_value_and_unit(self):
+        for unit in LengthUnit:
+            result = Length.from_miles(3.7).to_unit(unit)
+            same = Length(result.value, unit)
+            self.assertEqual(same, result)
+            self.assertEqual(hash(same), hash(result))
+            self.assertEqual(result, pickle.loads(pickle.dumps(result)))
+
     def test_equality(self):
         self.assertTrue(
             Length(1000, LengthUnit.METER) == Length(1, LengthUnit.KILOMETER))
 
+    def test_equality_with_other_type_is_false(self):
+        self.assertFalse(self._meters == 1)
+
+    def test_equal_lengths_in_different_units_have_equal_hashes(self):
+        self.assertEqual(
+            hash(Length(1000, LengthUnit.METER)),
+            hash(Length(1, LengthUnit.KILOMETER)))
+
+    def test_lengths_can_be_used_as_dict_keys(self):
+        lengths = {Length(1, LengthUnit.KILOMETER): 'one kilometer'}
+        self.assertEqual('one kilometer', lengths[Length(1000, LengthUnit.METER)])
+
+    def test_less_than_compares_across_units(self):
+        self.assertTrue(self._hectometers < self._kilometers)
+        self.assertFalse(self._kilometers < self._hectometers)
+
+    def test_less_equal_compares_across_units(self):
+        self.assertTrue(Length(1000, LengthUnit.METER) <= self._kilometers)
+
+    def test_greater_than_compares_across_units(self):
+        self.assertTrue(self._meters > self._decimeters)
+
+    def test_greater_equal_compares_across_units(self):
+        self.assertTrue(self._kilometers >= Length(1000, LengthUnit.METER))
+
+    def test_sorting_orders_by_length(self):
+        lengths = [self._kilometers, self._nanometers, self._meters]
+        self.assertEqual(
+            [self._nanometers, self._meters, self._kilometers], sorted(lengths))
+
+    def test_ordering_fails_for_other_type(self):
+        with self.assertRaises(TypeError):
+            self._meters < 1
+
+    def test_isclose_ignores_rounding_errors_across_units(self):
+        self.assertTrue(Length.from_inches(12).isclose(Length.from_feet(1)))
+
+    def test_isclose_is_false_for_different_lengths(self):
+        self.assertFalse(self._meters.isclose(self._decimeters))
+
+    def test_isclose_accepts_absolute_tolerance_as_length(self):
+        self.assertTrue(self._meters.isclose(
+            Length.from_centimeters(99), abs_tol=Length.from_centimeters(2)))
+
+    def test_isclose_fails_for_other_type(self):
+        with self.assertRaises(TypeError):
+            self._meters.isclose(1)
+
+    def test_bytes_round_trip_preserves_value_and_unit(self):
+        length = Length.from_miles(2.5)
+        data = length.to_bytes()
+        self.assertEqual(10, len(data))
+        result = Length.from_bytes(data)
+        self.assertEqual(LengthUnit.MILE, result.unit)
+        self.assertEqual(2.5, result.value)
+
+    def test_from_bytes_fails_for_other_quantity(self):
+        with self.assertRaises(ValueError):
+            Length.from_bytes(Area.from_squareMeters(1).to_bytes())
+
+    def test_from_bytes_fails_for_unknown_unit(self):
+        with self.assertRaises(ValueError):
+            Length.from_bytes(b'\x03\xff' + bytes(8))
+
+    def test_pickle_round_trip_preserves_value_and_unit(self):
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            result = pickle.loads(pickle.dumps(Length.from_feet(3), protocol))
+            self.assertEqual(LengthUnit.FOOT, result.unit)
+            self.assertEqual(3, result.value)
+
+    def test_humanize_selects_largest_unit_below_value(self):
+        humanized = Length.from_meters(0.0004).humanize()
+        self.assertEqual(LengthUnit.MICROMETER, humanized.unit)
+        self.assertAlmostEqual(400, humanized.value)
+
+    def test_humanize_restricts_units_to_system(self):
+        self.assertEqual(
+            LengthUnit.KILOMETER,
+            Length.from_miles(3).humanize('metric').unit)
+        self.assertEqual(
+            LengthUnit.YARD, Length.from_meters(3).humanize('imperial').unit)
+
+    def test_humanize_uses_smallest_unit_for_tiny_values(self):
+        self.assertEqual(
+            LengthUnit.NANOMETER,
+            Length.from_meters(-1e-12).humanize('metric').unit)
+
+    def test_humanize_keeps_zero_unchanged(self):
+        self.assertEqual(
+            LengthUnit.KILOMETER, Length.from_kilometers(0).humanize().unit)
+
+    def test_humanize_fails_for_unknown_system(self):
+        with self.assertRaises(ValueError):
+            self._meters.humanize('nautical')
+
     # Unary operators
     def test_negation_negates_value(self):
         self.assertEqual(-1, (-self._meters).value)
@@ -48,6 +202,17 @@ class LengthTests(unittest.TestCase):
         result = self._decimeters + self._decameters
         self.assertAlmostEqual(LengthUnit.DECIMETER, result.unit)
 
+    def test_addition_of_mixed_units_converts_right_operand(self):
+        result = Length.from_feet(1) + Length.from_inches(6)
+        self.assertEqual(LengthUnit.FOOT, result.unit)
+        self.assertAlmostEqual(1.5, result.value)
+
+    def test_mixed_unit_arithmetics_equal_quantity_with_same_value(self):
+        result = Length.from_feet(1) + Length.from_inches(6)
+        self.assertEqual(Length(result.value, LengthUnit.FOOT), result)
+        result = Length.from_feet(1) - Length.from_inches(6)
+        self.assertEqual(Length(result.value, LengthUnit.FOOT), result)
+
     def test_addition_fails_for_non_length_operand(self):
         with self.assertRaises(TypeError):
             self._meters + 1
@@ -64,6 +229,11 @@ class LengthTests(unittest.TestCase):
         result = self._kilometers - self._meters
         self.assertEqual(LengthUnit.KILOMETER, result.unit)
 
+    def test_subtraction_of_mixed_units_converts_right_operand(self):
+        result = Length.from_feet(1) - Length.from_inches(6)
+        self.assertEqual(LengthUnit.FOOT, result.unit)
+        self.assertAlmostEqual(0.5, result.value)
+
     def test_subtraction_fails_for_non_length_operand(self):
         with self.assertRaises(TypeError):
             self._meters - 1
@@ -88,6 +258,54 @@ class LengthTests(unittest.TestCase):
         result = Length(2, LengthUnit.METER) * 3
         self.assertEqual(LengthUnit.METER, result.unit)
 
+    def test_multiplication_with_length_returns_area_in_base_unit(self):
+        result = Length(2, LengthUnit.METER) * Length(3, LengthUnit.DECIMETER)
+        self.assertEqual(Area, type(result))
+        self.assertAlmostEqual(0.6, result.as_unit(AreaUnit.SQUAREMETER))
+
+    def test_multiplication_with_area_returns_volume(self):
+        result = Length(2, LengthUnit.METER) * Area.from_squareMeters(3)
+        self.assertEqual(Volume, type(result))
+        self.assertAlmostEqual(6, result.value)
+
+    def test_reflected_multiplication_with_area_returns_volume(self):
+        result = Area.from_squareMeters(3) * Length(2, LengthUnit.METER)
+        self.assertEqual(Volume, type(result))
+
+    def test_division_of_volume_by_area_returns_length(self):
+        result = Volume.from_cubicMeters(6) / Area.from_squareMeters(3)
+        self.assertEqual(Length(2, LengthUnit.METER), result)
+
+    def test_multiplication_with_unrelated_quantity_is_derived(self):
+        result = self._meters * Volume.from_cubicMeters(2)
+        self.assertIsInstance(result, DerivedQuantity)
+        self.assertEqual(
+            get_quantity_type(tuple(4 * exponent for exponent in Length.dimension)),
+            type(result))
+        self.assertEqual(2, result.value)
+
+    def test_multiplication_with_fraction_multiplies_values(self):
+        result = Length(3, LengthUnit.METER) * Fraction(1, 2)
+        self.assertAlmostEqual(1.5, result.value)
+
+    def test_multiplication_with_decimal_multiplies_values(self):
+        result = Length(3, LengthUnit.METER) * Decimal('0.5')
+        self.assertAlmostEqual(1.5, result.value)
+
+    def test_construction_with_decimal_keeps_value(self):
+        result = Length(Decimal('1.5'), LengthUnit.KILOMETER)
+        self.assertEqual(Decimal('1.5'), result.value)
+        self.assertEqual(Length.from_meters(1500), result)
+        self.assertEqual(1500, result.as_unit(LengthUnit.METER))
+
+    def test_reflected_multiplication_with_decimal_multiplies_values(self):
+        result = Decimal('0.5') * Length(3, LengthUnit.METER)
+        self.assertAlmostEqual(1.5, result.value)
+
+    def test_lookup_returns_result_type_of_operator(self):
+        result_type, _ = lookup(Length, '*', Length)
+        self.assertIs(Area, result_type)
+
     def test_division_with_float_divides_values(self):
         result = Length(3, LengthUnit.METER) / 2
         self.assertAlmostEqual(1.5, result.value)
@@ -100,7 +318,144 @@ class LengthTests(unittest.TestCase):
         result = Length(30, LengthUnit.METER) / Length(2, LengthUnit.DECAMETER)
         self.assertAlmostEqual(1.5, result)
 
-    def test_reflected_division_fails(self):
+    def test_square_returns_area_in_base_unit(self):
+        result = Length(2, LengthUnit.DECIMETER) ** 2
+        self.assertEqual(Area, type(result))
+        self.assertAlmostEqual(0.04, result.as_unit(AreaUnit.SQUAREMETER))
+
+    def test_cube_with_float_exponent_returns_volume(self):
+        result = Length(2, LengthUnit.METER) ** 3.0
+        self.assertEqual(Volume, type(result))
+        self.assertAlmostEqual(8, result.value)
+
+    def test_square_root_of_area_returns_length(self):
+        result = Area.from_squareMeters(9) ** 0.5
+        self.assertEqual(Length(3, LengthUnit.METER), result)
+
+    def test_first_power_returns_same_quantity(self):
+        self.assertIs(self._kilometers, self._kilometers ** 1)
+
+    def test_zeroth_power_is_dimensionless_one(self):
+        self.assertEqual(1, self._kilometers ** 0)
+
+    def test_power_without_matching_quantity_is_derived(self):
+        result = self._meters ** 4
+        self.assertEqual('1.0 m⁴', str(result))
+
+    def test_reflected_division_by_number_inverts_dimension(self):
+        result = 1 / self._meters
+        self.assertEqual('1.0 m⁻¹', str(result))
+
+    def test_reflected_division_by_unrelated_operand_fails(self):
+        with self.assertRaises(TypeError):
+            'a' / self._meters
+
+    def test_reflected_addition_with_number_fails(self):
+        with self.assertRaises(TypeError):
+            1 + self._meters
+
+    def test_builtin_sum_starts_with_zero(self):
+        result = sum([self._meters, self._kilometers])
+        self.assertAlmostEqual(1001, result.as_unit(LengthUnit.METER))
+
+    def test_sum_returns_base_unit(self):
+        result = Length.sum(iter([self._kilometers, self._centimeters]))
+        self.assertEqual(LengthUnit.METER, result.unit)
+        self.assertAlmostEqual(1000.01, result.value)
+
+    def test_sum_is_compensated(self):
+        result = Length.sum([Length.from_meters(0.1)] * 10)
+        self.assertEqual(1.0, result.value)
+
+    def test_sum_of_nothing_is_zero(self):
+        self.assertEqual(self._zero, Length.sum([]))
+
+    def test_sum_with_other_quantity_fails(self):
         with self.assertRaises(TypeError):
-            1 / self._meters
+            Length.sum([self._meters, Area.from_squareMeters(1)])
+
+    def test_mean_min_and_max(self):
+        lengths = [self._kilometers, self._meters, self._decameters]
+        self.assertAlmostEqual(337, Length.mean(lengths).value)
+        self.assertEqual(self._meters, Length.min(lengths))
+        self.assertEqual(self._kilometers, Length.max(lengths))
+
+    def test_mean_of_nothing_fails(self):
+        with self.assertRaises(ValueError):
+            Length.mean([])
+
+    def test_std(self):
+        lengths = [Length.from_meters(2), Length(400, LengthUnit.CENTIMETER)]
+        self.assertAlmostEqual(1, Length.std(lengths).value)
+        self.assertAlmostEqual(2 ** 0.5, Length.std(lengths, ddof=1).value)
+
+    def test_std_without_enough_quantities_fails(self):
+        with self.assertRaises(ValueError):
+            Length.std([self._meters], ddof=1)
+
+    def test_zero_is_shared(self):
+        self.assertIs(Length.zero(), Length.zero())
+
+    def test_interned_returns_shared_quantity(self):
+        first = Length.interned(1.5, LengthUnit.METER)
+        self.assertIs(first, Length.interned(1.5, LengthUnit.METER))
+        self.assertEqual(Length(1.5, LengthUnit.METER), first)
+
+    def test_interned_keeps_units_and_value_types_apart(self):
+        self.assertIsNot(Length.interned(1, LengthUnit.METER),
+                         Length.interned(1, LengthUnit.FOOT))
+        self.assertIs(float, type(Length.interned(1.0, LengthUnit.METER).value))
+
+    def test_interned_keeps_sign_of_zero(self):
+        Length.interned(0.0, LengthUnit.METER)
+        value = Length.interned(-0.0, LengthUnit.METER).value
+        self.assertEqual(-1.0, math.copysign(1, value))
+
+    def test_interned_counts_hits(self):
+        Length.interned(2.5, LengthUnit.METER)
+        hits = Length.interned_cache_info().hits
+        Length.interned(2.5, LengthUnit.METER)
+        self.assertEqual(hits + 1, Length.interned_cache_info().hits)
+
+    def test_converter_converts_floats(self):
+        convert = Length.converter(LengthUnit.FOOT, LengthUnit.METER)
+        self.assertEqual(Length.from_feet(3).meters, convert(3.0))
+
+    def test_converter_converts_sequences(self):
+        convert = Length.converter(LengthUnit.KILOMETER, LengthUnit.METER)
+        self.assertEqual([1000, 2500], convert((1, 2.5)))
+
+    def test_converter_fails_for_other_units(self):
+        with self.assertRaises(TypeError):
+            Length.converter(AreaUnit.SQUAREMETER, LengthUnit.METER)
+
+    def test_unit_codes_index_the_unit_tables(self):
+        code = LengthUnit.FOOT.code
+        self.assertEqual('ft', Length.abbreviations_by_code[code])
+        self.assertEqual(0.3048, Length.factors_by_code[code])
+        self.assertIs(LengthUnit.FOOT, Length.units_by_code[code])
+
+    def test_unit_values_start_at_one(self):
+        self.assertIs(LengthUnit.METER, LengthUnit(4))
+        self.assertEqual(3, LengthUnit.METER.code)
+
+    def test_units_of_other_quantities_are_not_equal(self):
+        self.assertEqual(LengthUnit.KILOMETER.code, MassUnit.GIGATONNE.code)
+        self.assertNotEqual(LengthUnit.KILOMETER, MassUnit.GIGATONNE)
+        self.assertEqual(2, len({LengthUnit.KILOMETER, MassUnit.GIGATONNE}))
+
+    def test_construction_with_unit_of_other_quantity_fails(self):
+        with self.assertRaises(TypeError):
+            Length(1, MassUnit.GRAM)
+
+    def test_conversion_to_unit_of_other_type_fails(self):
+        with self.assertRaises(NotImplementedError):
+            self._meters.as_unit('km')
+        with self.assertRaises(NotImplementedError):
+            self._meters.to_unit(MassUnit.GRAM)
 
+    def test_conversion_to_unit_of_other_quantity_fails(self):
+        with self.assertRaises(NotImplementedError):
+            self._meters.as_unit(MassUnit.GRAM)
+        with self.assertRaises(NotImplementedError):
+            self._meters.to_unit(AreaUnit.SQUAREMETER)
@@ -0,0 +1,247 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import pickle
+import unittest
+import numpy
+from ayuabtu.arrays import AreaArray, LengthArray, MixedLengthArray, VolumeArray
+from ayuabtu.quantities import Area, Length
+from ayuabtu.units import AreaUnit, LengthUnit
+
+
+class LengthArrayTests(unittest.TestCase):
+    def setUp(self):
+        self._meters = LengthArray([1, 2, 3], LengthUnit.METER)
+        self._kilometers = LengthArray([1, 2, 3], LengthUnit.KILOMETER)
+
+    def test_base_unit_is_meter(self):
+        self.assertEqual(LengthUnit.METER, LengthArray.base_unit)
+
+    def test_values_are_stored_as_float_array(self):
+        self.assertEqual(numpy.float64, self._meters.values.dtype)
+
+    def test_indexing_returns_scalar_quantity(self):
+        self.assertEqual(Length(2, LengthUnit.METER), self._meters[1])
+
+    def test_slicing_returns_array(self):
+        self.assertIsInstance(self._meters[1:], LengthArray)
+
+    def test_as_unit_converts_all_values(self):
+        numpy.testing.assert_allclose(
+            [1000, 2000, 3000], self._kilometers.as_unit(LengthUnit.METER))
+
+    def test_to_unit_changes_unit(self):
+        result = self._kilometers.to_unit(LengthUnit.METER)
+        self.assertEqual(LengthUnit.METER, result.unit)
+
+    def test_conversion_to_unit_of_other_quantity_fails(self):
+        with self.assertRaises(NotImplementedError):
+            self._kilometers.as_unit(AreaUnit.SQUAREMETER)
+
+    def test_from_quantities_converts_to_given_unit(self):
+        result = LengthArray.from_quantities(
+            [Length.from_kilometers(1), Length.from_meters(5)],
+            LengthUnit.METER)
+        numpy.testing.assert_allclose([1000, 5], result.values)
+
+    def test_isclose_returns_elementwise_mask(self):
+        inches = LengthArray.from_inches([12, 24, 37])
+        feet = LengthArray.from_feet([1, 2, 3])
+        numpy.testing.assert_array_equal(
+            [True, True, False], inches.isclose(feet))
+
+    def test_isclose_compares_with_scalar_length(self):
+        numpy.testing.assert_array_equal(
+            [False, True, False], self._meters.isclose(Length.from_feet(2 / 0.3048)))
+
+    def test_isclose_treats_equal_infinities_as_close(self):
+        infinite = LengthArray([numpy.inf], LengthUnit.METER)
+        self.assertTrue(infinite.allclose(infinite))
+
+    def test_allclose_is_true_if_all_elements_are_close(self):
+        self.assertTrue(self._kilometers.allclose(
+            self._meters * 1000, abs_tol=Length.from_millimeters(1)))
+
+    def test_allclose_is_false_if_one_element_differs(self):
+        self.assertFalse(self._kilometers.allclose(self._meters))
+
+    def test_bytes_round_trip_preserves_values_and_unit(self):
+        result = LengthArray.from_bytes(self._kilometers.to_bytes())
+        self.assertEqual(LengthUnit.KILOMETER, result.unit)
+        numpy.testing.assert_array_equal([1, 2, 3], result.values)
+
+    def test_from_bytes_does_not_copy_values(self):
+        data = bytearray(self._meters.to_bytes())
+        result = LengthArray.from_bytes(data)
+        data[-8:] = numpy.float64(7).tobytes()
+        self.assertEqual(7, result.values[-1])
+
+    def test_from_bytes_fails_for_truncated_data(self):
+        with self.assertRaises(ValueError):
+            LengthArray.from_bytes(self._meters.to_bytes()[:-1])
+
+    def test_from_bytes_fails_for_scalar_length(self):
+        with self.assertRaises(ValueError):
+            LengthArray.from_bytes(Length.from_meters(1).to_bytes())
+
+    def test_pickle_round_trip_preserves_values_and_unit(self):
+        result = pickle.loads(pickle.dumps(self._kilometers))
+        self.assertEqual(LengthUnit.KILOMETER, result.unit)
+        numpy.testing.assert_array_equal([1, 2, 3], result.values)
+
+    def test_pickle_round_trip_keeps_values_writable(self):
+        result = pickle.loads(pickle.dumps(self._kilometers))
+        result.values[0] = 5
+        self.assertEqual(5, result.values[0])
+
+    def test_parse_many_converts_to_unit_of_first_text(self):
+        result = LengthArray.parse_many(['1 km', '500 m', '2 km'])
+        self.assertEqual(LengthUnit.KILOMETER, result.unit)
+        numpy.testing.assert_allclose([1, 0.5, 2], result.values)
+
+    def test_parse_many_converts_to_given_unit(self):
+        result = LengthArray.parse_many(
+            (text for text in ['1 km', '3 ft']), LengthUnit.METER)
+        numpy.testing.assert_allclose([1000, 0.9144], result.values)
+
+    def test_parse_many_handles_several_chunks(self):
+        result = LengthArray.parse_many(['1 m', '2 m', '3 m'], chunk_size=2)
+        numpy.testing.assert_allclose([1, 2, 3], result.values)
+
+    def test_parse_many_of_empty_input_returns_empty_array(self):
+        self.assertEqual(0, len(LengthArray.parse_many([])))
+
+    def test_parse_chunks_yields_arrays_of_chunk_size(self):
+        chunks = list(LengthArray.parse_chunks(['1 m'] * 5, chunk_size=2))
+        self.assertEqual([2, 2, 1], [len(chunk) for chunk in chunks])
+
+    def test_parse_column_accepts_ndarray(self):
+        result = LengthArray.parse_column(numpy.array(['1 m', '20 cm']))
+        numpy.testing.assert_allclose([1, 0.2], result.values)
+
+    def test_parse_many_fails_for_invalid_text(self):
+        with self.assertRaises(ValueError):
+            LengthArray.parse_many(['1 m', 'one meter'])
+
+    def test_parse_many_fails_for_text_with_line_break(self):
+        with self.assertRaises(ValueError):
+            LengthArray.parse_many(['1 m\n2 m', '3 m'])
+
+    def test_parse_many_fails_for_unit_of_other_quantity(self):
+        with self.assertRaises(ValueError):
+            LengthArray.parse_many(['1 m', '1 kg'])
+
+    def test_humanize_selects_unit_per_element(self):
+        lengths = LengthArray([0.0004, -2500, 0.5], LengthUnit.METER)
+        result = lengths.humanize('metric')
+        self.assertIsInstance(result, MixedLengthArray)
+        numpy.testing.assert_allclose([400, -2.5, 5], result.values)
+        self.assertEqual(
+            [LengthUnit.MICROMETER, LengthUnit.KILOMETER, LengthUnit.DECIMETER],
+            [length.unit for length in result])
+
+    def test_humanize_keeps_unit_of_zero_and_infinite_elements(self):
+        result = LengthArray([0, numpy.inf], LengthUnit.MILE).humanize()
+        self.assertEqual([LengthUnit.MILE.code] * 2, result.unit_codes.tolist())
+
+    def test_format_many_joins_formatted_elements(self):
+        self.assertEqual(
+            '1.0 km\n2.0 km\n3.0 km', self._kilometers.format_many('.1f'))
+
+    def test_format_many_converts_to_selected_unit(self):
+        self.assertEqual(
+            '100 cm, 200 cm, 300 cm',
+            self._meters.format_many('.0f~cm', separator=', '))
+
+    def test_format_many_of_empty_array_is_empty(self):
+        self.assertEqual('', LengthArray.zeros(0).format_many())
+
+    # Unary operators
+    def test_negation_negates_values(self):
+        numpy.testing.assert_allclose([-1, -2, -3], (-self._meters).values)
+
+    # Arithmetic operators
+    def test_addition_of_length_array_uses_unit_of_left_operand(self):
+        result = self._kilometers + self._meters
+        self.assertEqual(LengthUnit.KILOMETER, result.unit)
+        numpy.testing.assert_allclose([1.001, 2.002, 3.003], result.values)
+
+    def test_addition_of_scalar_length_broadcasts(self):
+        result = self._meters + Length.from_kilometers(1)
+        numpy.testing.assert_allclose([1001, 1002, 1003], result.values)
+
+    def test_addition_fails_for_non_length_operand(self):
+        with self.assertRaises(TypeError):
+            self._meters + 1
+
+    def test_subtraction_of_length_array_subtracts_values(self):
+        result = self._kilometers - self._meters
+        numpy.testing.assert_allclose([0.999, 1.998, 2.997], result.values)
+
+    def test_multiplication_with_float_multiplies_values(self):
+        result = self._meters * 2
+        numpy.testing.assert_allclose([2, 4, 6], result.values)
+
+    def test_reflected_multiplication_with_float_multiplies_values(self):
+        result = 2 * self._meters
+        numpy.testing.assert_allclose([2, 4, 6], result.values)
+
+    def test_multiplication_with_length_array_returns_area_array(self):
+        result = self._meters * self._kilometers
+        self.assertIsInstance(result, AreaArray)
+        numpy.testing.assert_allclose(
+            [1000, 4000, 9000], result.as_unit(AreaUnit.SQUAREMETER))
+
+    def test_multiplication_with_area_returns_volume_array(self):
+        result = self._meters * Area.from_squareMeters(2)
+        self.assertIsInstance(result, VolumeArray)
+        numpy.testing.assert_allclose([2, 4, 6], result.values)
+
+    def test_multiplication_with_numpy_scalar_multiplies_values(self):
+        result = self._meters * numpy.int64(2)
+        numpy.testing.assert_allclose([2, 4, 6], result.values)
+
+    def test_multiplication_with_ndarray_multiplies_elementwise(self):
+        result = numpy.array([1, 2, 3]) * self._meters
+        numpy.testing.assert_allclose([1, 4, 9], result.values)
+
+    def test_scalar_length_times_length_array_returns_area_array(self):
+        result = Length.from_meters(2) * self._meters
+        self.assertIsInstance(result, AreaArray)
+        numpy.testing.assert_allclose([2, 4, 6], result.values)
+
+    def test_division_with_float_divides_values(self):
+        result = self._meters / 2
+        numpy.testing.assert_allclose([0.5, 1, 1.5], result.values)
+
+    def test_division_with_length_array_removes_unit(self):
+        result = self._kilometers / self._meters
+        numpy.testing.assert_allclose([1000, 1000, 1000], result)
+
+    def test_square_returns_area_array(self):
+        result = self._kilometers ** 2
+        self.assertIsInstance(result, AreaArray)
+        numpy.testing.assert_allclose(
+            [1, 4, 9], result.as_unit(AreaUnit.SQUAREKILOMETER))
+
+    def test_division_of_area_array_by_length_returns_length_array(self):
+        areas = AreaArray([2, 4], AreaUnit.SQUAREMETER)
+        result = areas / Length.from_meters(2)
+        self.assertIsInstance(result, LengthArray)
+        numpy.testing.assert_allclose([1, 2], result.values)
+
+    def test_reductions_keep_unit(self):
+        self.assertEqual(Length(6, LengthUnit.KILOMETER), self._kilometers.sum())
+        self.assertEqual(Length(2, LengthUnit.KILOMETER), self._kilometers.mean())
+        self.assertEqual(Length(1, LengthUnit.KILOMETER), self._kilometers.min())
+        self.assertEqual(Length(3, LengthUnit.KILOMETER), self._kilometers.max())
+        self.assertAlmostEqual(1, self._meters.std(ddof=1).value)
+
+    def test_mean_of_empty_array_fails(self):
+        with self.assertRaises(ValueError):
+            LengthArray.zeros(0).mean()
+
+    def test_length_converter_converts_arrays(self):
+        convert = Length.converter(LengthUnit.KILOMETER, LengthUnit.METER)
+        numpy.testing.assert_allclose(
+            [1000, 2000, 3000], convert(self._kilometers.values))
@@ -0,0 +1,108 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import pickle
+import unittest
+import numpy
+from ayuabtu.arrays import AreaArray, LengthArray, MixedLengthArray
+from ayuabtu.quantities import Length
+from ayuabtu.units import LengthUnit, MassUnit
+
+
+class MixedLengthArrayTests(unittest.TestCase):
+    def setUp(self):
+        self._lengths = MixedLengthArray.from_quantities([
+            Length.from_feet(1), Length.from_meters(2), Length.from_feet(3)])
+
+    def test_values_keep_their_units(self):
+        numpy.testing.assert_array_equal([1, 2, 3], self._lengths.values)
+        self.assertEqual(
+            [LengthUnit.FOOT, LengthUnit.METER, LengthUnit.FOOT],
+            [length.unit for length in self._lengths])
+
+    def test_unit_codes_are_stored_as_uint8(self):
+        self.assertEqual(numpy.uint8, self._lengths.unit_codes.dtype)
+
+    def test_values_and_unit_codes_need_same_shape(self):
+        with self.assertRaises(ValueError):
+            MixedLengthArray([1, 2], [LengthUnit.METER.code])
+
+    def test_indexing_returns_quantity_in_its_unit(self):
+        self.assertEqual(Length(3, LengthUnit.FOOT), self._lengths[2])
+
+    def test_filtering_does_not_convert(self):
+        result = self._lengths[self._lengths.unit_codes == LengthUnit.FOOT.code]
+        self.assertIsInstance(result, MixedLengthArray)
+        numpy.testing.assert_array_equal([1, 3], result.values)
+
+    def test_conversion_to_unit_of_other_quantity_fails(self):
+        with self.assertRaises(NotImplementedError):
+            self._lengths.as_unit(MassUnit.GRAM)
+
+    def test_count_units_counts_values_per_unit(self):
+        self.assertEqual(
+            {LengthUnit.FOOT: 2, LengthUnit.METER: 1},
+            self._lengths.count_units())
+
+    def test_parse_many_keeps_unit_of_every_text(self):
+        result = MixedLengthArray.parse_many(['1 km', '2 ft'])
+        self.assertEqual(
+            [Length.from_kilometers(1), Length.from_feet(2)], list(result))
+
+    def test_as_unit_converts_every_value(self):
+        numpy.testing.assert_allclose(
+            [0.3048, 2, 0.9144], self._lengths.as_unit(LengthUnit.METER))
+
+    def test_to_unit_reuses_normalized_values(self):
+        result = self._lengths.to_unit(LengthUnit.METER)
+        self.assertIsInstance(result, LengthArray)
+        self.assertIs(result, self._lengths.to_unit(LengthUnit.METER))
+
+    def test_multiplication_with_float_keeps_units(self):
+        result = self._lengths * 2
+        self.assertIsInstance(result, MixedLengthArray)
+        self.assertEqual(Length(6, LengthUnit.FOOT), result[2])
+
+    def test_addition_returns_array_in_base_unit(self):
+        result = self._lengths + Length.from_meters(1)
+        self.assertEqual(LengthUnit.METER, result.unit)
+        numpy.testing.assert_allclose([1.3048, 3, 1.9144], result.values)
+
+    def test_multiplication_with_length_array_returns_area_array(self):
+        result = self._lengths * LengthArray.from_meters([1, 1, 1])
+        self.assertIsInstance(result, AreaArray)
+        numpy.testing.assert_allclose([0.3048, 2, 0.9144], result.values)
+
+    def test_str_shows_every_unit(self):
+        self.assertEqual('[1.0 ft, 2.0 m, 3.0 ft]', str(self._lengths))
+
+    def test_reductions_return_base_unit(self):
+        self.assertAlmostEqual(3.2192, self._lengths.sum().value)
+        self.assertEqual(LengthUnit.METER, self._lengths.sum().unit)
+        self.assertAlmostEqual(0.3048, self._lengths.min().value)
+        self.assertAlmostEqual(2, self._lengths.max().value)
+
+    def test_normalized_values_can_not_be_changed(self):
+        meters = self._lengths.to_unit(LengthUnit.METER)
+        with self.assertRaises(ValueError):
+            meters.values[0] = 99
+        self.assertAlmostEqual(3.2192, self._lengths.sum().value)
+
+    def test_values_and_unit_codes_can_not_be_changed(self):
+        self._lengths.sum()
+        with self.assertRaises(ValueError):
+            self._lengths.values[0] = 100
+        with self.assertRaises(ValueError):
+            self._lengths.unit_codes[0] = LengthUnit.METER.code
+        self.assertAlmostEqual(3.2192, self._lengths.sum().value)
+
+    def test_pickle_leaves_out_normalized_values(self):
+        self._lengths.sum()
+        result = pickle.loads(pickle.dumps(self._lengths))
+        self.assertIsNone(result._normalized)
+        numpy.testing.assert_array_equal([1, 2, 3], result.values)
+        self.assertEqual(list(self._lengths), list(result))
+
+
+if __name__ == '__main__':
+    unittest.main()
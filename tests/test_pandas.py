@@ -0,0 +1,121 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import unittest
+import numpy
+import pandas
+from ayuabtu.arrays import LengthArray
+from ayuabtu.pandas import LengthDtype, QuantityExtensionArray
+from ayuabtu.quantities import Length, Mass
+from ayuabtu.units import AreaUnit, LengthUnit, MassUnit
+
+
+class PandasTests(unittest.TestCase):
+    def setUp(self):
+        self._meters = pandas.Series([1.0, 2.0, 3.0], dtype='ayuabtu[Length:m]')
+
+    def test_dtype_is_created_from_string(self):
+        self.assertEqual(LengthDtype(LengthUnit.FOOT), pandas.api.types.pandas_dtype(
+            'ayuabtu[Length:ft]'))
+
+    def test_dtype_defaults_to_base_unit(self):
+        self.assertEqual(
+            LengthUnit.METER,
+            pandas.api.types.pandas_dtype('ayuabtu[Length]').unit)
+
+    def test_dtype_name_uses_unit_name_for_ambiguous_symbols(self):
+        dtype = pandas.api.types.pandas_dtype('ayuabtu[Mass:LONGHUNDREDWEIGHT]')
+        self.assertEqual(MassUnit.LONGHUNDREDWEIGHT, dtype.unit)
+        self.assertEqual('ayuabtu[Mass:LONGHUNDREDWEIGHT]', dtype.name)
+
+    def test_series_is_backed_by_quantity_array(self):
+        array = self._meters.array
+        self.assertIsInstance(array, QuantityExtensionArray)
+        self.assertIsInstance(array.quantity_array, LengthArray)
+
+    def test_series_accepts_quantities_and_missing_values(self):
+        series = pandas.Series(
+            [Length.from_kilometers(1), None], dtype='ayuabtu[Length:m]')
+        self.assertEqual(Length.from_meters(1000), series[0])
+        self.assertTrue(series.isna()[1])
+
+    def test_astype_converts_to_other_unit(self):
+        result = self._meters.astype('ayuabtu[Length:cm]')
+        numpy.testing.assert_allclose(
+            [100, 200, 300], result.array.quantity_array.values)
+
+    def test_astype_fails_for_other_quantity(self):
+        with self.assertRaises(TypeError):
+            self._meters.astype('ayuabtu[Mass:kg]')
+
+    def test_astype_float_returns_values(self):
+        result = self._meters.astype('ayuabtu[Length:cm]').astype(float)
+        self.assertEqual([100, 200, 300], result.tolist())
+
+    def test_sum_returns_quantity(self):
+        self.assertEqual(Length.from_meters(6), self._meters.sum())
+
+    def test_astype_nullable_float_returns_values(self):
+        series = pandas.Series([1, None], dtype='ayuabtu[Length:km]')
+        result = series.astype('Float64')
+        self.assertEqual('Float64', str(result.dtype))
+        self.assertEqual(1, result[0])
+        self.assertTrue(pandas.isna(result[1]))
+
+    def test_groupby_sum_keeps_unit(self):
+        frame = pandas.DataFrame({
+            'group': ['a', 'b', 'a'],
+            'mass': pandas.Series([1, 2, 3], dtype='ayuabtu[Mass:g]')})
+        result = frame.groupby('group')['mass'].sum()
+        self.assertEqual(Mass.from_grams(4), result['a'])
+        self.assertEqual(Mass.from_grams(2), result['b'])
+
+    def test_multiplication_follows_quantity_operators(self):
+        result = self._meters * self._meters
+        self.assertEqual(AreaUnit.SQUAREMETER, result.dtype.unit)
+        numpy.testing.assert_allclose(
+            [1, 4, 9], result.array.quantity_array.values)
+
+    def test_division_by_same_quantity_returns_floats(self):
+        result = self._meters / self._meters.astype('ayuabtu[Length:cm]')
+        self.assertEqual(numpy.float64, result.dtype)
+
+    def test_addition_converts_units(self):
+        result = self._meters + self._meters.astype('ayuabtu[Length:km]')
+        self.assertEqual(Length.from_meters(2), result[0])
+
+    def test_comparison_with_quantity(self):
+        result = self._meters > Length.from_centimeters(150)
+        self.assertEqual([False, True, True], result.tolist())
+
+    def test_concat_converts_to_unit_of_first_series(self):
+        result = pandas.concat(
+            [self._meters, self._meters.astype('ayuabtu[Length:km]')])
+        self.assertEqual(LengthDtype(LengthUnit.METER), result.dtype)
+        self.assertEqual(Length.from_meters(3), result.iloc[5])
+
+    def test_groupby_reductions_skip_missing_values(self):
+        frame = pandas.DataFrame({
+            'group': ['a', 'b', 'a', 'a', 'c'],
+            'mass': pandas.Series(
+                [1, 2, 5, None, None], dtype='ayuabtu[Mass:g]')})
+        groups = frame.groupby('group')['mass']
+        self.assertEqual(Mass.from_grams(1), groups.min()['a'])
+        self.assertEqual(Mass.from_grams(5), groups.max()['a'])
+        self.assertEqual(Mass.from_grams(3), groups.mean()['a'])
+        self.assertAlmostEqual(8 ** 0.5, groups.std()['a'].value)
+        self.assertTrue(pandas.isna(groups.mean()['c']))
+        self.assertEqual(Mass.from_grams(0), groups.sum()['c'])
+
+    def test_groupby_falls_back_to_pandas_for_other_operations(self):
+        frame = pandas.DataFrame({
+            'group': ['a', 'b', 'a', 'a'],
+            'mass': pandas.Series([1, 2, 5, 3], dtype='ayuabtu[Mass:g]')})
+        groups = frame.groupby('group')['mass']
+        self.assertEqual(Mass.from_grams(1), groups.first()['a'])
+        self.assertEqual(Mass.from_grams(3), groups.last()['a'])
+        self.assertEqual(Mass.from_grams(3), groups.median()['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import unittest
+import ayuabtu
+from ayuabtu.quantities import Area, Length, Mass, Time
+from ayuabtu.units import AreaUnit, LengthUnit, MassUnit, TimeUnit
+
+
+class ParseTests(unittest.TestCase):
+    def test_parse_detects_quantity_from_abbreviation(self):
+        result = ayuabtu.parse('12.5 km')
+        self.assertEqual(Length, type(result))
+        self.assertEqual(LengthUnit.KILOMETER, result.unit)
+        self.assertEqual(12.5, result.value)
+
+    def test_parse_detects_quantity_from_plural_name(self):
+        result = ayuabtu.parse('3 hours')
+        self.assertEqual(Time(3, TimeUnit.HOUR), result)
+
+    def test_parse_accepts_names_with_several_words(self):
+        result = ayuabtu.parse('2 square meters')
+        self.assertEqual(Area(2, AreaUnit.SQUAREMETER), result)
+
+    def test_parse_accepts_missing_whitespace_and_exponent(self):
+        result = ayuabtu.parse('-1.5e3mg')
+        self.assertEqual(Mass(-1500, MassUnit.MILLIGRAM), result)
+
+    def test_parse_accepts_micro_sign_for_mu(self):
+        result = ayuabtu.parse('4 µs')
+        self.assertEqual(TimeUnit.MICROSECOND, result.unit)
+
+    def test_parse_accepts_abbreviation_without_trailing_dot(self):
+        result = ayuabtu.parse('5 lb')
+        self.assertEqual(MassUnit.POUND, result.unit)
+
+    def test_parse_ignores_case_of_unit_names(self):
+        result = ayuabtu.parse('2 Square Meters')
+        self.assertEqual(Area(2, AreaUnit.SQUAREMETER), result)
+
+    def test_parse_keeps_case_of_abbreviations(self):
+        for text in ('3 Mg', '3 Ms', '1 Mm'):
+            with self.assertRaises(ValueError):
+                ayuabtu.parse(text)
+        with self.assertRaises(ValueError):
+            Length.parse('1 Mm')
+
+    def test_parse_fails_for_unknown_unit(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.parse('5 parsec')
+
+    def test_parse_fails_for_missing_value(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.parse('km')
+
+    def test_parse_fails_for_ambiguous_abbreviation(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.parse('1 cwt.')
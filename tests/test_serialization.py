@@ -0,0 +1,36 @@
+# Author: Lukas Halbritter <halbritl@informatik.uni-freiburg.de>
+# Copyright 2020
+# pylint: disable=missing-docstring
+import unittest
+import ayuabtu
+from ayuabtu.arrays import MassArray
+from ayuabtu.quantities import Mass, Time
+from ayuabtu.units import MassUnit
+
+
+class FromBytesTests(unittest.TestCase):
+    def test_from_bytes_detects_quantity_type(self):
+        result = ayuabtu.from_bytes(Time.from_hours(3).to_bytes())
+        self.assertEqual(Time.from_hours(3), result)
+
+    def test_from_bytes_detects_array_type(self):
+        masses = MassArray([1, 2], MassUnit.STONE)
+        result = ayuabtu.from_bytes(masses.to_bytes())
+        self.assertIsInstance(result, MassArray)
+        self.assertEqual(MassUnit.STONE, result.unit)
+
+    def test_from_bytes_accepts_memoryview(self):
+        data = memoryview(Mass.from_grams(5).to_bytes())
+        self.assertEqual(Mass.from_grams(5), ayuabtu.from_bytes(data))
+
+    def test_from_bytes_fails_for_unknown_type_code(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.from_bytes(b'\x7f' + bytes(9))
+
+    def test_from_bytes_fails_for_empty_data(self):
+        with self.assertRaises(ValueError):
+            ayuabtu.from_bytes(b'')
+
+
+if __name__ == '__main__':
+    unittest.main()